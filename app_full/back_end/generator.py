@@ -1,138 +1,351 @@
+import os
 import sys
+import io
 import json
 import random
+import socketserver
 import numpy as np
-from collections import defaultdict
 
 # DEAP: Distributed Evolutionary Algorithms in Python
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 
-def run_genetic_algorithm(data):
+# The shared engine lives in the top-level ``schedulify`` package of the repo.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from schedulify import Problem, FitnessEngine, register_types
+from schedulify.chromosome import init_population, cx_two_point, mutate_genes, ROOM_OR_SLOT
+from schedulify.delta import IncrementalEvaluator
+from schedulify.parallel import ParallelEvaluator
+from schedulify.islands import run_islands
+from schedulify.evolution import EarlyStopping, ProgressMonitor, ea_simple
+from schedulify.cache import DatasetCache, content_key
+from schedulify.warmstart import previous_genes, warm_genes
+from schedulify.profiling import GenerationProfiler
+from schedulify.construct import seeded_genes
+
+
+class TimetableSolver:
     """
-    This function encapsulates the entire GA process.
-    It takes the input data as an argument and returns the best timetable.
+    Reusable GA solver: call solve() / handle() any number of times from one process.
+
+    DEAP types are registered once, in __init__. Everything a run builds (toolbox,
+    operators closing over COURSES / ROOMS, population) is local to that call, so
+    the only state kept between runs is the bounded LRU of built Problems
+    (``problem_cache_size`` entries, 0 disables it).
     """
-    
-    # --- 1. Unpack data from the input JSON ---
-    COURSES = data['courses']
-    TEACHERS = data['teachers']
-    ROOMS = data['rooms']
-    TIMESLOTS = data['timeslots']
-    TEACHER_PREFERENCES = data.get('preferences', {}) # Use .get for optional keys
-
-    # A flat list of every single lecture hour that needs to be scheduled
-    LECTURE_LIST = [course_id for course_id, details in COURSES.items() for _ in range(details['hours'])]
-
-    # --- 2. The Fitness Function (Now with Soft Constraints) ---
-    def evaluate_timetable(individual):
-        hard_violations = 0
-        soft_violations = 0
-        teacher_schedule = defaultdict(list)
-        room_schedule = defaultdict(list)
-        student_group_schedule = defaultdict(list)
-
-        for course_id, teacher, room, timeslot in individual:
-            course_details = COURSES[course_id]
-            if course_details['students'] > ROOMS[room]['capacity']:
-                hard_violations += 1
-            if timeslot in teacher_schedule[teacher]:
-                hard_violations += 1
-            teacher_schedule[teacher].append(timeslot)
-            if timeslot in room_schedule[room]:
-                hard_violations += 1
-            room_schedule[room].append(timeslot)
-            student_group = (course_details['dept'], course_details['semester'])
-            if timeslot in student_group_schedule[student_group]:
-                hard_violations += 1
-            student_group_schedule[student_group].append(timeslot)
-
-            if teacher in TEACHER_PREFERENCES:
-                prefs = TEACHER_PREFERENCES[teacher]
-                if prefs.get('preferred_rooms') and room not in prefs['preferred_rooms']:
-                    soft_violations += 1
-                if prefs.get('preferred_slots') and timeslot not in prefs['preferred_slots']:
-                    soft_violations += 1
-        
-        total_penalty = (hard_violations * 1000) + soft_violations
-        return (total_penalty,)
-
-    # --- 3. Configure the Genetic Algorithm with DEAP ---
-    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-    creator.create("Individual", list, fitness=creator.FitnessMin)
-    toolbox = base.Toolbox()
-
-    def create_gene(course_id):
-        valid_teachers = [t for t, details in TEACHERS.items() if course_id in details['courses']]
-        if not valid_teachers:
+
+    def __init__(self, pop_size=500, ngen=500, problem_cache_size=8):
+        register_types()
+        self.pop_size = pop_size
+        self.ngen = ngen
+        self.problems = DatasetCache(maxsize=problem_cache_size) if problem_cache_size else None
+
+    def problem_for(self, data):
+        """The Problem for a request, reused from the cache when the same data was seen before."""
+        def build():
+            return Problem(data['courses'], data['teachers'], data['rooms'], data['timeslots'],
+                           preferences=data.get('preferences', {}))
+
+        if self.problems is None:
+            return build()
+        instance = {k: data.get(k) for k in ('courses', 'teachers', 'rooms', 'timeslots', 'preferences')}
+        key = content_key(json.dumps(instance, sort_keys=True).encode(), namespace="generator_problem")
+        return self.problems.get_or_build(key, build)
+
+    def solve(self, data):
+        """
+        This function encapsulates the entire GA process.
+        It takes the input data as an argument and returns the best timetable,
+        its fitness and why the run stopped.
+        """
+
+        # --- 1. Unpack data from the input JSON ---
+        COURSES = data['courses']
+        TEACHERS = data['teachers']
+        ROOMS = data['rooms']
+        TIMESLOTS = data['timeslots']
+        TEACHER_PREFERENCES = data.get('preferences', {}) # Use .get for optional keys
+        REPRESENTATION = data.get('representation', 'tuple') # 'tuple' or 'array' (compact int genes)
+        INCREMENTAL = data.get('incremental', False) # delta evaluation: array only, no pool (see schedulify/delta.py)
+        WORKERS = data.get('workers', 0) # >1: evaluate in a process pool of that size
+        ISLANDS = data.get('islands', 0) # >1: island model, POP_SIZE split over that many processes
+        # Early stopping (null disables each): best penalty reached, generations without improvement, seconds.
+        # Unset, a run only stops early at penalty 0 (nothing left to improve), like the full NGEN run
+        TARGET_PENALTY = data.get('target_penalty', 0)
+        PATIENCE = data.get('patience')
+        TIME_BUDGET = data.get('time_budget')
+        ENGINE = data.get('engine', 'ga') # 'ga' or 'cpsat' (exact OR-Tools solve; workers = solver threads)
+        PROGRESS = data.get('progress', False) # one JSON line per generation (or CP-SAT solution) on stderr
+        # Warm start: a previous "timetable" (e.g. a Timetable document's timetableData) and the
+        # {"courses" / "teachers" / "rooms": [names]} changed since, whose lectures are re-drawn
+        PREVIOUS_TIMETABLE = data.get('previous_timetable')
+        CHANGED = data.get('changed')
+        # Share of the initial population built by the greedy construction heuristic
+        # (most-constrained lecture first into free teacher / room / group slots); the rest is random.
+        # Off unless requested (schedulify.construct.HEURISTIC_FRACTION = 0.2 is a good start)
+        HEURISTIC_FRACTION = data.get('heuristic_fraction', 0)
+        # Per-operator timing of the GA loop, reported as "profile"; profile_generation
+        # also runs that generation under cProfile / tracemalloc
+        PROFILE = data.get('profile', False)
+        PROFILE_GENERATION = data.get('profile_generation')
+        # Best individuals copied into every generation; by default 1 when the population is
+        # seeded (warm start / heuristic) so those starting points cannot be bred out
+        ELITISM = data.get('elitism')
+
+        # The pool only evaluates whole populations with the engine, so it would run incremental serially
+        if INCREMENTAL and (REPRESENTATION != 'array' or (WORKERS > 1 and ISLANDS <= 1)):
+            raise ValueError("incremental evaluation needs representation='array' and workers <= 1.")
+
+        # A flat list of every single lecture hour that needs to be scheduled
+        LECTURE_LIST = [course_id for course_id, details in COURSES.items() for _ in range(details['hours'])]
+
+        # --- 2. The Fitness Function (Now with Soft Constraints) ---
+        # Hard: teacher / room / student-group clashes and room capacity (x1000).
+        # Soft: teacher room and slot preferences. Scored by the integer-encoded
+        # engine, which evaluates a whole population per call with NumPy.
+        problem = self.problem_for(data)
+        engine = FitnessEngine(problem)
+        evaluate_timetable = engine.evaluate
+
+        for course_id in problem.unstaffed_courses:
             # Print errors to stderr so they don't corrupt the JSON output
             print(f"Error: No teacher found for course: {course_id}", file=sys.stderr)
-            return None
-        teacher = random.choice(valid_teachers)
-        room = random.choice(list(ROOMS.keys()))
-        timeslot = random.choice(TIMESLOTS)
-        return (course_id, teacher, room, timeslot)
-
-    gene_creators = [lambda c=c: create_gene(c) for c in LECTURE_LIST]
-    toolbox.register("individual", tools.initCycle, creator.Individual, gene_creators, n=1)
-    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-    toolbox.register("evaluate", evaluate_timetable)
-    toolbox.register("mate", tools.cxTwoPoint)
-    toolbox.register("select", tools.selTournament, tournsize=3)
-
-    def mutate_timetable(individual, indpb):
-        for i in range(len(individual)):
-            if random.random() < indpb:
-                course_id, teacher, room, timeslot = individual[i]
-                if random.random() < 0.5:
-                    individual[i] = (course_id, teacher, random.choice(list(ROOMS.keys())), timeslot)
-                else:
-                    individual[i] = (course_id, teacher, room, random.choice(TIMESLOTS))
-        return individual,
-
-    toolbox.register("mutate", mutate_timetable, indpb=0.1)
-
-    # --- 4. Run the GA ---
-    POP_SIZE = 500  # Adjust as needed
-    NGEN = 500      # Adjust as needed
+        if problem.unstaffed_courses:
+            return None, -1, {"stop_reason": "unstaffed_courses", "generations": 0}
+
+        previous = previous_genes(problem, PREVIOUS_TIMETABLE, CHANGED) if PREVIOUS_TIMETABLE else None
+
+        # Progress goes to stderr as JSON lines (stdout carries the result); the
+        # request's "id", when given, tags each line for NDJSON / socket clients.
+        def emit(event):
+            if 'id' in data:
+                event = dict(event, id=data['id'])
+            print(json.dumps(event), file=sys.stderr, flush=True)
+
+        if ENGINE == 'cpsat':
+            # ortools is only needed by this engine
+            from schedulify.cpsat import solve_cpsat
+            report = (lambda n, objective, _: emit({"solution": n, "objective": objective})) if PROGRESS else None
+            genes, info = solve_cpsat(problem, time_limit=TIME_BUDGET or 60.0, workers=WORKERS or 8, progress=report,
+                                      hint=previous)
+            run_info = {"stop_reason": info["stop_reason"], "generations": info["solutions"]}
+            if genes is None:
+                return None, -1, run_info
+            return problem.decode(genes), float(engine.penalties(genes[None])[0]), run_info
+
+        # --- 3. Configure the Genetic Algorithm with DEAP ---
+        # Types are registered once per process (register_types); the toolbox and the
+        # operators below are local to this run, so nothing outlives it.
+        toolbox = base.Toolbox()
+
+        # Eligible teachers and capacity-feasible rooms per course come from the index
+        # built once in Problem, instead of rescanning TEACHERS / ROOMS for every gene.
+        # Rooms are drawn from those that fit the course (any room if none does).
+        def create_gene(course_id):
+            teacher = random.choice(problem.teachers_by_course[course_id])
+            room = random.choice(problem.rooms_by_course[course_id])
+            timeslot = random.choice(TIMESLOTS)
+            return (course_id, teacher, room, timeslot)
+
+        def mutate_timetable(individual, indpb):
+            for i in range(len(individual)):
+                if random.random() < indpb:
+                    course_id, teacher, room, timeslot = individual[i]
+                    if random.random() < 0.5:
+                        individual[i] = (course_id, teacher, random.choice(problem.rooms_by_course[course_id]), timeslot)
+                    else:
+                        individual[i] = (course_id, teacher, room, random.choice(TIMESLOTS))
+            return individual,
+
+        toolbox.register("evaluate", evaluate_timetable)
+        evaluator = "engine" # reported as "evaluator": engine, incremental or parallel
+        toolbox.register("map", engine.map)
+        toolbox.register("select", tools.selTournament, tournsize=3)
+
+        if REPRESENTATION == 'array':
+            # Compact chromosome: (n_lectures, 3) int array of teacher/room/slot ids,
+            # decoded back to (course_id, teacher, room, timeslot) tuples at the end.
+            toolbox.register("population", init_population, creator.ArrayIndividual, problem, rooms="fitting")
+            toolbox.register("mate", cx_two_point)
+            toolbox.register("mutate", mutate_genes, problem=problem, indpb=0.1, weights=ROOM_OR_SLOT,
+                             rooms="fitting")
+            if INCREMENTAL:
+                # Re-score only the genes changed since an individual's last evaluation
+                toolbox.register("evaluate", IncrementalEvaluator(problem).evaluate)
+                evaluator = "incremental"
+        else:
+            gene_creators = [lambda c=c: create_gene(c) for c in LECTURE_LIST]
+            toolbox.register("individual", tools.initCycle, creator.Individual, gene_creators, n=1)
+            toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+            toolbox.register("mate", tools.cxTwoPoint)
+            toolbox.register("mutate", mutate_timetable, indpb=0.1)
+
+        if previous is not None:
+            # The previous timetable (stale genes re-drawn) and perturbed variants of it
+            if REPRESENTATION == 'array':
+                def warm_population(n):
+                    return [creator.ArrayIndividual(genes)
+                            for genes in warm_genes(problem, previous, n, rooms="fitting")]
+            else:
+                def warm_population(n):
+                    return [creator.Individual(problem.decode(genes))
+                            for genes in warm_genes(problem, previous, n, rooms="fitting")]
+            toolbox.register("population", warm_population)
+        elif HEURISTIC_FRACTION:
+            # Constructed (near clash-free) individuals plus random ones
+            if REPRESENTATION == 'array':
+                def seeded_population(n):
+                    return [creator.ArrayIndividual(genes)
+                            for genes in seeded_genes(problem, n, HEURISTIC_FRACTION, rooms="fitting")]
+            else:
+                def seeded_population(n):
+                    return [creator.Individual(problem.decode(genes))
+                            for genes in seeded_genes(problem, n, HEURISTIC_FRACTION, rooms="fitting")]
+            toolbox.register("population", seeded_population)
+        if ELITISM is None:
+            ELITISM = 1 if previous is not None or HEURISTIC_FRACTION else 0
+
+        # --- 4. Run the GA ---
+        POP_SIZE = self.pop_size
+        NGEN = self.ngen
     
-    pop = toolbox.population(n=POP_SIZE)
-    hof = tools.HallOfFame(1)
+        # '==' on array individuals is element-wise, so compare them with array_equal
+        hof = tools.HallOfFame(max(1, ELITISM), similar=np.array_equal) if REPRESENTATION == 'array' \
+            else tools.HallOfFame(max(1, ELITISM))
     
-    # We send progress to stderr
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("avg", np.mean)
-    stats.register("min", np.min)
+        # We send progress to stderr
+        stats = tools.Statistics(lambda ind: ind.fitness.values)
+        stats.register("avg", np.mean)
+        stats.register("min", np.min)
     
-    # The verbose parameter in eaSimple prints to stdout, which we don't want.
-    # We can create a custom loop to print to stderr if needed, but for simplicity we omit it here.
-    algorithms.eaSimple(pop, toolbox, cxpb=0.8, mutpb=0.2, ngen=NGEN,
-                        stats=stats, halloffame=hof, verbose=False) # verbose=False is key
+        # ea_simple (or every island) stays silent (stdout carries the result JSON) and stops at the
+        # first of: target penalty, stagnation, time budget, NGEN generations.
+        # Each generation is reported through emit: best / avg penalty, hard / soft
+        # split of the best, evaluations per second.
+        stopping = EarlyStopping(target=TARGET_PENALTY, patience=PATIENCE, time_budget=TIME_BUDGET)
+        monitor = ProgressMonitor(emit, breakdown=engine.breakdown) if PROGRESS else None
+        # Islands run their loops in other processes and are not profiled
+        profiler = GenerationProfiler(capture_generation=PROFILE_GENERATION) if PROFILE and ISLANDS <= 1 else None
+        if profiler:
+            profiler.instrument(toolbox)
+        # Optional process pool: the engine (with the problem data) is sent to each
+        # worker once, then only chromosomes are shipped per generation.
+        # Islands already run one process each, so the pool is only used without them.
+        parallel = ParallelEvaluator(engine, processes=WORKERS) if WORKERS > 1 and ISLANDS <= 1 else None
+        if parallel:
+            toolbox.register("map", parallel.map)
+            evaluator = "parallel"
+        try:
+            if ISLANDS > 1:
+                best, reports = run_islands(toolbox, ISLANDS, POP_SIZE // ISLANDS, NGEN, cxpb=0.8, mutpb=0.2,
+                                            migration_interval=data.get('migration_interval', 20),
+                                            migration_size=data.get('migration_size', 5),
+                                            similar=hof.similar, early_stopping=stopping,
+                                            elitism=ELITISM)
+                for report in reports:
+                    print(f"Island {report['island']}: best {report['best_penalty']}, "
+                          f"min by generation {report['min'][::max(1, NGEN // 10)]}", file=sys.stderr)
+                hof.insert(best)
+            else:
+                # Only the single-population path needs the full population here
+                pop = toolbox.population(n=POP_SIZE)
+                ea_simple(pop, toolbox, cxpb=0.8, mutpb=0.2, ngen=NGEN,
+                          stats=stats, halloffame=hof, on_generation=monitor, early_stopping=stopping,
+                          profiler=profiler, elitism=ELITISM)
+        finally:
+            if parallel:
+                parallel.close()
+
+        run_info = dict(stopping.summary(), evaluator=evaluator)
+        if profiler:
+            run_info["profile"] = profiler.summary()
+        if hof:
+            return problem.decode(engine.genes(hof[0])), hof[0].fitness.values[0], run_info
+        else:
+            return None, -1, run_info
+
+    def handle(self, data):
+        """Runs one request and returns the result object printed / sent back as JSON."""
+        best_timetable, fitness, run_info = self.solve(data)
+
+        if best_timetable:
+            result = {
+                "status": "success",
+                "fitness": fitness,
+                "stop_reason": run_info["stop_reason"],
+                "generations": run_info["generations"],
+                "timetable": best_timetable
+            }
+            if "evaluator" in run_info:
+                result["evaluator"] = run_info["evaluator"]
+            if "profile" in run_info:
+                result["profile"] = run_info["profile"]
+        else:
+            result = {
+                "status": "error",
+                "message": "No solution found."
+            }
+        return result
+
+
+def run_genetic_algorithm(data):
+    """
+    One-off run (no problem cache); returns (best timetable, fitness) as it always
+    has. TimetableSolver().solve(data) also returns the run info (stop reason,
+    generations, evaluator, profile).
+    """
+    best_timetable, fitness, _ = TimetableSolver(problem_cache_size=0).solve(data)
+    return best_timetable, fitness
+
+
+def serve(infile, outfile, solver):
+    """
+    Worker mode: one JSON request per line in, one JSON response per line out.
+    A request's optional "id" is echoed in its response. Imports, DEAP types and
+    built problems stay warm in ``solver`` between requests.
+    """
+    for line in infile:
+        if not line.strip():
+            continue
+        data = None
+        try:
+            data = json.loads(line)
+            result = solver.handle(data)
+        except Exception as e:
+            result = {"status": "error", "message": f"{type(e).__name__}: {e}"}
+        # Echo the request id on success and error alike, so clients can match replies
+        if isinstance(data, dict) and 'id' in data:
+            result["id"] = data['id']
+        outfile.write(json.dumps(result) + "\n")
+        outfile.flush()
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        serve(io.TextIOWrapper(self.rfile, encoding='utf-8'),
+              io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True), self.server.solver)
+
+
+def serve_socket(path, solver):
+    """Worker mode on a local Unix socket; each connection speaks the same NDJSON protocol."""
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.UnixStreamServer(path, _SocketHandler) as server:
+        server.solver = solver
+        print(f"Listening on {path}", file=sys.stderr)
+        server.serve_forever()
 
-    if hof:
-        return hof[0], hof[0].fitness.values[0]
-    else:
-        return None, -1
 
 if __name__ == "__main__":
-    # 1. Read data from standard input
-    input_data = json.load(sys.stdin)
-    
-    # 2. Run the algorithm
-    best_timetable, fitness = run_genetic_algorithm(input_data)
-    
-    # 3. Create a result object and print it to standard output as a JSON string
-    if best_timetable:
-        result = {
-            "status": "success",
-            "fitness": fitness,
-            "timetable": best_timetable
-        }
+    # python generator.py                 one request: JSON on stdin -> JSON on stdout
+    # python generator.py --serve         persistent worker: NDJSON on stdin -> NDJSON on stdout
+    # python generator.py --socket PATH   persistent worker on a Unix socket
+    if '--socket' in sys.argv:
+        serve_socket(sys.argv[sys.argv.index('--socket') + 1], TimetableSolver())
+    elif '--serve' in sys.argv:
+        serve(sys.stdin, sys.stdout, TimetableSolver())
     else:
-        result = {
-            "status": "error",
-            "message": "No solution found."
-        }
-        
-    print(json.dumps(result))
-
+        # 1. Read data from standard input
+        input_data = json.load(sys.stdin)
 
+        # 2. Run the algorithm and print the result object to standard output as a JSON string
+        print(json.dumps(TimetableSolver(problem_cache_size=0).handle(input_data)))
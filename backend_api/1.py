@@ -127,24 +127,55 @@ from pyngrok import ngrok
 # keep your token (replace if different)
 ngrok.set_auth_token("33su88tN16YcXYDQ4afJcEESgAj_3itLTjehwDzJebaoPnGae")
 
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-import nest_asyncio, uvicorn, pandas as pd, io, os, tempfile
+import nest_asyncio, uvicorn, pandas as pd, os, tempfile
 from typing import Optional, List, Dict, Any
-import numpy as np
-import random
 from collections import defaultdict
-from deap import base, creator, tools, algorithms
-import traceback
 from fastapi.responses import FileResponse
 import os
 import tempfile
 import pandas as pd
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response
+import sys
+import json
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from pydantic import BaseModel
+
+# Shared GA engine (top-level ``schedulify`` package of the repo) and the
+# service's own modules next to this file
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+from timetable_ga import run_timetable_ga, build_problem, timetable_rows
+from jobs import JobManager
+from metrics import Registry, CONTENT_TYPE, process_metrics
+from ingest import ingest_csv, build_dicts
+from schedulify.cache import DatasetCache, content_key, stream_digest
+from schedulify.warmstart import changed_entities, previous_genes
+from schedulify.repair import repair
+from schedulify.profiling import merge_summaries
+from schedulify.construct import HEURISTIC_FRACTION
 ##########
 
+# --- Background GA jobs (process pool; size via GA_WORKERS env var) ---
+JOBS = JobManager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    JOBS.shutdown()
+
+# --- Parsed datasets by content hash: uploads (typed tables) and built problems.
+# DATASET_CACHE_DIR also keeps them on disk across restarts, as pickles: it must be a
+# directory only this service's user can write (see schedulify/cache.py).
+DATASETS = DatasetCache(maxsize=int(os.environ.get("DATASET_CACHE_SIZE", 8)),
+                        directory=os.environ.get("DATASET_CACHE_DIR"))
+
 # FastAPI app setup
-app = FastAPI(title="GA Timetable Generator")
+app = FastAPI(title="GA Timetable Generator", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -153,13 +184,102 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Prometheus metrics (GET /metrics, see metrics.py) ---
+# Best penalty buckets: 0 is a perfect timetable, each hard violation adds 1000
+PENALTY_BUCKETS = (0, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000, 100000)
+ACTIVE_STATUSES = ("queued", "running", "cancelling")
+
+METRICS = Registry()
+REQUEST_SECONDS = METRICS.histogram(
+    "timetable_http_request_duration_seconds",
+    "Time until the response starts, by route template (SSE: until the stream opens).",
+    ["method", "route", "status"])
+REQUESTS_IN_FLIGHT = METRICS.gauge("timetable_http_requests_in_flight", "Requests being handled.")
+GA_JOBS = METRICS.gauge("timetable_ga_jobs", "Generation jobs not finished yet, by status.", ["status"])
+GA_JOBS_FINISHED = METRICS.counter("timetable_ga_jobs_finished_total", "Generation jobs finished, by final status.",
+                                   ["status"])
+GA_IN_FLIGHT = METRICS.gauge("timetable_ga_runs_in_flight", "Generation jobs running in the worker pool.")
+GA_WORKERS = METRICS.gauge("timetable_ga_workers", "Size of the generation worker pool.")
+GA_GENERATIONS = METRICS.counter("timetable_ga_generations_total", "Generations run by all jobs.")
+GA_EVALUATIONS = METRICS.counter("timetable_ga_evaluations_total", "Fitness evaluations done by all jobs.")
+GA_GENERATIONS_RATE = METRICS.gauge("timetable_ga_generations_per_second",
+                                    "Generations per second of the running jobs (each averaged over its run), summed.")
+GA_EVALUATIONS_RATE = METRICS.gauge("timetable_ga_evaluations_per_second",
+                                    "Evaluations per second of the running jobs (last generation), summed.")
+BEST_PENALTY = METRICS.histogram("timetable_ga_best_penalty",
+                                 "Best penalty of completed jobs (hard violations x 1000 + soft).",
+                                 ["engine"], buckets=PENALTY_BUCKETS)
+DATASET_SIZE = METRICS.gauge("timetable_dataset_size", "Size of the dataset of the latest /generate.", ["kind"])
+process_metrics(METRICS)
+
+# Generations / evaluations already added to the counters, per unfinished job. Running
+# jobs are counted at each scrape, the rest of a job's work when it finishes.
+_COUNTED: Dict[str, tuple] = {}
+_COUNTED_LOCK = threading.Lock()
+
+def count_progress(job_id: str, job: Dict[str, Any], finished: bool = False):
+    generations, evaluations = job.get("generation") or 0, job.get("evaluations_total") or 0
+    with _COUNTED_LOCK:
+        if not finished and job_id not in JOBS.active():
+            return  # finished since the snapshot was taken: count_finished has it
+        seen_generations, seen_evaluations = _COUNTED.pop(job_id, (0, 0))
+        GA_GENERATIONS.inc(max(generations - seen_generations, 0))
+        GA_EVALUATIONS.inc(max(evaluations - seen_evaluations, 0))
+        if not finished:
+            _COUNTED[job_id] = (max(generations, seen_generations), max(evaluations, seen_evaluations))
+
+def count_finished(job_id: str, job: Dict[str, Any]):
+    count_progress(job_id, job, finished=True)
+    GA_JOBS_FINISHED.inc(status=job["status"])
+
+JOBS.finish_listeners.append(count_finished)
+
+@METRICS.collector
+def collect_jobs():
+    statuses = defaultdict(int)
+    generation_rate = evaluation_rate = 0.0
+    for job_id in JOBS.active():
+        job = JOBS.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            continue  # finished meanwhile: counted by count_finished
+        statuses[job["status"]] += 1
+        count_progress(job_id, job)
+        if job["status"] == "running" and job.get("elapsed_seconds"):
+            generation_rate += job["generation"] / job["elapsed_seconds"]
+            evaluation_rate += job.get("evals_per_second") or 0
+    for status in ACTIVE_STATUSES:
+        GA_JOBS.set(statuses[status], status=status)
+    GA_IN_FLIGHT.set(statuses["running"] + statuses["cancelling"])
+    GA_WORKERS.set(JOBS.max_workers)
+    GA_GENERATIONS_RATE.set(generation_rate)
+    GA_EVALUATIONS_RATE.set(evaluation_rate)
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.inc(-1)
+        # Route templates ("/jobs/{job_id}") keep the label set small
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                                route=route.path if route is not None else "unmatched", status=status)
+
 # --- Global Data ---
 DATA = {
     "departments": None,
     "courses": None,
     "rooms": None,
     "teachers": None,
-    "timetable": None
+    "timetable": None,
+    # Dataset (COURSES / ROOMS / TEACHERS, Problem) the current timetable was
+    # generated from, for warm starts and /repair
+    "timetable_input": None
 }
 
 @app.get("/status")
@@ -188,37 +308,19 @@ async def upload_files(
       - teachers: either:
             * rows with Teacher Name and Course Code (one mapping per row), or
             * rows with Teacher Name and Courses (comma-separated course codes)
+    Each file is streamed in chunks into typed columns (see ingest.py); the
+    raw CSV is not kept. A file already seen (same content hash) is not parsed again.
     """
-    def read_csv_file(upfile: UploadFile) -> pd.DataFrame:
-        raw = upfile.file.read()
-        upfile.file.seek(0)
-        try:
-            return pd.read_csv(io.BytesIO(raw))
-        except Exception:
-            # try with pandas default engine fallback
-            return pd.read_csv(io.StringIO(raw.decode('utf-8', errors='ignore')))
-
-    if departments:
-        DATA["departments"] = read_csv_file(departments)
-    if courses:
-        DATA["courses"] = read_csv_file(courses)
-    if rooms:
-        DATA["rooms"] = read_csv_file(rooms)
-    if teachers:
-        DATA["teachers"] = read_csv_file(teachers)
+    uploads = {"departments": departments, "courses": courses, "rooms": rooms, "teachers": teachers}
+    for kind, upfile in uploads.items():
+        if upfile:
+            key = content_key(stream_digest(upfile.file), namespace=f"upload:{kind}")
+            table = DATASETS.get_or_build(key, lambda: ingest_csv(kind, upfile.file))
+            table.key = key
+            DATA[kind] = table
 
     return {"message": "Files uploaded successfully."}
 
-# --- Helper: normalize column names ---
-def _col_lookup(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
-    if df is None:
-        return None
-    cols = {c.lower(): c for c in df.columns}
-    for cand in candidates:
-        if cand.lower() in cols:
-            return cols[cand.lower()]
-    return None
-
 # --- Generate Timetable (upgraded GA using uploaded CSVs + constraints) ---
 @app.post("/generate")
 async def generate_timetable(
@@ -226,314 +328,176 @@ async def generate_timetable(
     cxpb: float = 0.8,
     mutpb: float = 0.2,
     ngen: int = 200,
-    randseed: Optional[int] = None
+    randseed: Optional[int] = None,
+    representation: str = "tuple",
+    incremental: bool = False,
+    workers: int = 0,
+    target_penalty: Optional[float] = 0.0,
+    patience: Optional[int] = 50,
+    time_budget: Optional[float] = None,
+    engine: str = "ga",
+    warm_start: bool = False,
+    profile_generation: Optional[int] = None,
+    heuristic_fraction: float = HEURISTIC_FRACTION
 ):
     """
-    Generates a timetable using a GA (DEAP).
-    You can pass GA parameters as query params. This runs synchronously and returns
-    the generated timetable as JSON along with a penalty/fintess score.
+    Starts timetable generation with a GA (DEAP) as a background job.
+    You can pass GA parameters as query params. Returns a job id immediately;
+    poll GET /jobs/{job_id} for progress and the result (or follow
+    GET /jobs/{job_id}/events), DELETE it to cancel.
+    representation="array" evolves compact int-array individuals instead of
+    lists of (course, teacher, room, timeslot) string tuples; with incremental=true
+    each individual keeps its occupancy counters and only changed genes are re-scored
+    (array only, not with workers > 1; the job reports the "evaluator" used).
+    workers > 1 evaluates each generation in a process pool of that size.
+    The run stops before ngen once the best penalty reaches target_penalty, after
+    patience generations without improvement, or after time_budget seconds.
+    engine="cpsat" solves the same problem exactly with OR-Tools CP-SAT
+    (workers = solver threads, time_budget = time limit); rows come back in the
+    same format, with stop_reason "optimal" / "infeasible" as proofs.
+    warm_start=true starts from the current timetable instead of random
+    individuals: only lectures of courses / teachers / rooms that changed since
+    it was generated (or that are no longer valid) are re-drawn.
+    GA jobs are profiled per operator (see GET /metrics); profile_generation
+    also captures that generation's top functions and allocations.
+    heuristic_fraction (0-1) of the initial population is built greedily,
+    most-constrained lecture first into free teacher / room / group slots, so
+    the run starts near clash-free; the rest is random (0 = all random).
     """
-    if randseed is not None:
-        random.seed(randseed)
-        np.random.seed(randseed)
+    if engine not in ("ga", "cpsat"):
+        return {"error": "engine must be 'ga' or 'cpsat'."}
+    if incremental and (representation != "array" or workers > 1):
+        return {"error": "incremental=true needs representation='array' and workers <= 1."}
+    if not 0 <= heuristic_fraction <= 1:
+        return {"error": "heuristic_fraction must be between 0 and 1."}
 
     # Basic validation of uploads
     if not all(df is not None for df in [DATA["courses"], DATA["rooms"], DATA["teachers"]]):
         return {"error": "Please upload courses, rooms and teachers CSVs first."}
 
-    try:
-        courses_df: pd.DataFrame = DATA["courses"].copy()
-        rooms_df: pd.DataFrame = DATA["rooms"].copy()
-        teachers_df: pd.DataFrame = DATA["teachers"].copy()
-    except Exception as e:
-        return {"error": "Failed to read uploaded CSVs.", "detail": str(e)}
-
-    # --- Normalize required column names (flexible) ---
-    # Courses columns
-    col_course_code = _col_lookup(courses_df, ["Course Code", "course_code", "courseid", "course id", "code"])
-    col_course_name = _col_lookup(courses_df, ["Course Name", "course_name", "name", "title"])
-    col_dept = _col_lookup(courses_df, ["Department", "department", "dept"])
-    col_sem = _col_lookup(courses_df, ["Semester", "semester", "sem"])
-    col_students = _col_lookup(courses_df, ["Students", "students", "enrollment", "capacity"])
-    col_hours = _col_lookup(courses_df, ["Hours", "hours", "lecture_hours", "hrs"])
-
-    required_course_cols = [col_course_code, col_course_name, col_dept, col_sem, col_students, col_hours]
-    if any(c is None for c in required_course_cols):
-        return {"error": "Courses CSV missing required columns. Required: Course Code, Course Name, Department, Semester, Students, Hours."}
+    courses_t, rooms_t, teachers_t = DATA["courses"], DATA["rooms"], DATA["teachers"]
 
-    # Rooms columns
-    col_room_code = _col_lookup(rooms_df, ["Room Code", "room_code", "room", "code"])
-    col_room_capacity = _col_lookup(rooms_df, ["Capacity", "capacity", "cap", "seats"])
-    if col_room_code is None or col_room_capacity is None:
+    # --- Required columns (detected once at upload) ---
+    if courses_t.missing():
+        return {"error": "Courses CSV missing required columns. Required: Course Code, Course Name, Department, Semester, Students, Hours."}
+    if rooms_t.missing():
         return {"error": "Rooms CSV missing required columns. Required: Room Code, Capacity."}
-
-    # Teachers columns - be flexible
-    col_teacher_name = _col_lookup(teachers_df, ["Teacher Name", "teacher_name", "name", "teacher"])
-    col_teacher_courses = _col_lookup(teachers_df, ["Courses", "courses", "course_codes", "course code", "course_code", "Course Code", "Course_Code"])
-    col_teacher_course_single = _col_lookup(teachers_df, ["Course Code", "course_code", "course", "course_code_mapping"])
-
-    if col_teacher_name is None:
+    if teachers_t.missing():
         return {"error": "Teachers CSV must include a Teacher Name column."}
 
-    # --- Build dictionaries used by the GA ---
-    # COURSES dict
-    COURSES: Dict[str, Dict[str, Any]] = {}
-    for _, r in courses_df.iterrows():
-        cid = str(r[col_course_code]).strip()
-        try:
-            students = int(r[col_students])
-        except Exception:
-            students = int(float(r[col_students])) if pd.notna(r[col_students]) else 0
-        try:
-            hours = int(r[col_hours])
-        except Exception:
-            hours = int(float(r[col_hours])) if pd.notna(r[col_hours]) else 1
-        COURSES[cid] = {
-            "name": str(r[col_course_name]) if pd.notna(r[col_course_name]) else cid,
-            "dept": str(r[col_dept]) if pd.notna(r[col_dept]) else "",
-            "semester": int(r[col_sem]) if pd.notna(r[col_sem]) else 1,
-            "students": max(1, students),
-            "hours": max(1, hours)
-        }
-
-    # ROOMS dict
-    ROOMS: Dict[str, Dict[str, Any]] = {}
-    for _, r in rooms_df.iterrows():
-        rid = str(r[col_room_code]).strip()
+    # --- Build dictionaries used by the GA (vectorised, see ingest.build_dicts) ---
+    # and the Problem (eligibility indexes, lecture list) once per distinct upload
+    def build_dataset():
+        COURSES, ROOMS, TEACHERS = build_dicts(courses_t, rooms_t, teachers_t)
+        problem = build_problem(COURSES, ROOMS, TEACHERS) if COURSES else None
+        return {"courses": COURSES, "rooms": ROOMS, "teachers": TEACHERS, "problem": problem}
+
+    key = content_key(*(t.key.encode() for t in (courses_t, rooms_t, teachers_t)), namespace="dataset")
+    dataset = DATASETS.get_or_build(key, build_dataset)
+    COURSES, ROOMS, TEACHERS = dataset["courses"], dataset["rooms"], dataset["teachers"]
+    for kind, size in (("courses", len(COURSES)), ("lectures", sum(d["hours"] for d in COURSES.values())),
+                       ("rooms", len(ROOMS)), ("teachers", len(TEACHERS))):
+        DATASET_SIZE.set(size, kind=kind)
+
+    if sum(details['hours'] for details in COURSES.values()) == 0:
+        return {"error": "No lectures to schedule (check 'Hours' column in courses CSV)."}
+
+    # --- Warm start from the stored timetable, re-drawing what changed since ---
+    previous_rows, changed = None, None
+    if warm_start and DATA["timetable"] is not None:
+        previous_rows = DATA["timetable"].to_dict(orient="records")
+        current = {"courses": COURSES, "rooms": ROOMS, "teachers": TEACHERS}
+        if DATA["timetable_input"] is not None:
+            changed = changed_entities(DATA["timetable_input"], current)
+
+    # --- Run the GA in the worker pool; the response only carries the job id ---
+    def on_done(result: Dict[str, Any]):
+        # Runs without a timetable (infeasible / timed-out CP-SAT) keep the last good one
+        if result is None or not result["timetable"] or result["fitness_penalty_score"] is None:
+            return
+        BEST_PENALTY.observe(result["fitness_penalty_score"], engine=engine)
+        # Save into DATA for /timetable endpoint
         try:
-            cap = int(r[col_room_capacity])
+            DATA["timetable"] = pd.DataFrame(result["timetable"])
+            DATA["timetable_input"] = dataset
         except Exception:
-            cap = int(float(r[col_room_capacity])) if pd.notna(r[col_room_capacity]) else 0
-        ROOMS[rid] = {"capacity": max(0, cap)}
-
-    # TEACHERS dict (map teacher -> list of courses they can teach)
-    TEACHERS: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"courses": []})
-    # Case 1: teachers_df has a column with multiple courses comma-separated
-    if col_teacher_courses is not None:
-        for _, r in teachers_df.iterrows():
-            tname = str(r[col_teacher_name]).strip()
-            raw = r[col_teacher_courses]
-            if pd.isna(raw):
-                continue
-            if isinstance(raw, str):
-                codes = [c.strip() for c in raw.split(",") if c.strip()]
-            elif isinstance(raw, (list, tuple)):
-                codes = [str(x).strip() for x in raw]
-            else:
-                codes = [str(raw).strip()]
-            for c in codes:
-                if c:
-                    TEACHERS[tname]["courses"].append(c)
-    # Case 2: teachers_df has one mapping per row (Teacher Name + Course Code)
-    elif col_teacher_course_single is not None:
-        for _, r in teachers_df.iterrows():
-            tname = str(r[col_teacher_name]).strip()
-            raw = r[col_teacher_course_single]
-            if pd.isna(raw):
-                continue
-            TEACHERS[tname]["courses"].append(str(raw).strip())
-    else:
-        # If no course mapping found, assume teacher CSV contains only names.
-        # We'll allow any teacher to be assigned to any course (fallback).
-        for _, r in teachers_df.iterrows():
-            tname = str(r[col_teacher_name]).strip()
-            TEACHERS[tname]["courses"] = list(COURSES.keys())
-
-    # If TEACHERS is empty, generate placeholder teachers from teacher names column
-    if not TEACHERS:
-        for _, r in teachers_df.iterrows():
-            tname = str(r[col_teacher_name]).strip()
-            TEACHERS[tname]["courses"] = list(COURSES.keys())
-
-    # --- TIMESLOTS and LECTURE LIST ---
-    # Standard weekly slots (Mon-Fri) 9-13, 14-18 (skip 13-14). Generate flexible labels.
-    DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
-    HOURS = [9,10,11,12,14,15,16,17]  # 8 slots per day -> 40 total
-    TIMESLOTS = [f"{d}_{h:02d}-{h+1:02d}" for d in DAYS for h in HOURS]
-
-    # Flatten lectures: each course appears 'hours' times (each hour is a separate lecture entity)
-    LECTURE_LIST: List[str] = []
-    for cid, details in COURSES.items():
-        for _ in range(details['hours']):
-            LECTURE_LIST.append(cid)
-
-    if len(LECTURE_LIST) == 0:
-        return {"error": "No lectures to schedule (check 'Hours' column in courses CSV)."}
+            DATA["timetable"] = None
+            DATA["timetable_input"] = None
+
+    job_id = JOBS.submit(
+        run_timetable_ga, COURSES, ROOMS, TEACHERS,
+        pop_size=pop_size, cxpb=cxpb, mutpb=mutpb, ngen=ngen, randseed=randseed,
+        representation=representation, incremental=incremental, workers=workers,
+        target_penalty=target_penalty, patience=patience, time_budget=time_budget, engine=engine,
+        problem=dataset["problem"], warm_start=previous_rows, changed=changed,
+        profile_generation=profile_generation, heuristic_fraction=heuristic_fraction, on_done=on_done,
+    )
+    return {"message": "Timetable generation started.", "job_id": job_id, "status": "queued", "ngen": ngen,
+            "warm_start": previous_rows is not None}
 
-    # --- Fitness function with hard/soft constraints ---
-    def evaluate_timetable(individual):
-        """
-        Individual: list of tuples (course_id, teacher, room, timeslot)
-        Returns: (penalty,)
-        Hard violations multiply by large factor.
-        """
-        hard_violations = 0
-        soft_violations = 0
-
-        teacher_schedule = defaultdict(set)
-        room_schedule = defaultdict(set)
-        student_group_schedule = defaultdict(set)
-
-        for gene in individual:
-            course_id, teacher, room, timeslot = gene
-            if course_id not in COURSES:
-                # heavy penalty for completely invalid course assignment
-                hard_violations += 10
-                continue
-            c = COURSES[course_id]
-
-            # H1: teacher conflict (same teacher two lectures same timeslot)
-            if timeslot in teacher_schedule[teacher]:
-                hard_violations += 1
-            teacher_schedule[teacher].add(timeslot)
-
-            # H2: room conflict
-            if timeslot in room_schedule[room]:
-                hard_violations += 1
-            room_schedule[room].add(timeslot)
-
-            # H3: student group conflict (dept+sem)
-            student_group = (c['dept'], c['semester'])
-            if timeslot in student_group_schedule[student_group]:
-                hard_violations += 1
-            student_group_schedule[student_group].add(timeslot)
-
-            # H4: room capacity
-            if room not in ROOMS or c['students'] > ROOMS[room]['capacity']:
-                hard_violations += 1
-
-            # Soft: prefer teacher assigned to courses they can teach (if teacher-course mapping exists)
-            if teacher in TEACHERS and c['name'] is not None:
-                if c['name'] and course_id not in TEACHERS[teacher]['courses']:
-                    # If teacher cannot teach this course, small penalty (but allow)
-                    soft_violations += 1
-
-        total_penalty = hard_violations * 1000 + soft_violations
-        return (total_penalty,)
-
-    # --- DEAP setup (guard against re-creation of creator names) ---
-    try:
-        # if these were already created in the interpreter, this will raise; ignore then
-        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-    except Exception:
-        pass
-    try:
-        creator.create("Individual", list, fitness=creator.FitnessMin)
-    except Exception:
-        pass
-
-    toolbox = base.Toolbox()
-
-    # gene creator for a specific lecture (course_id)
-    def create_gene(course_id: str):
-        # valid teachers for this course (from TEACHERS mapping)
-        valid_teachers = [t for t, d in TEACHERS.items() if course_id in d['courses']]
-        if not valid_teachers:
-            # fallback: any teacher
-            valid_teachers = list(TEACHERS.keys()) or ["TBD"]
-        teacher = random.choice(valid_teachers)
-
-        # choose a room that can potentially fit (prefer rooms with capacity >= students, but allow any)
-        suitable_rooms = [r for r, info in ROOMS.items() if info['capacity'] >= COURSES[course_id]['students']]
-        if not suitable_rooms:
-            suitable_rooms = list(ROOMS.keys()) or ["UNKWN"]
-        room = random.choice(suitable_rooms)
-
-        timeslot = random.choice(TIMESLOTS)
-        return (course_id, teacher, room, timeslot)
-
-    # Build gene creators list: a function per lecture in LECTURE_LIST
-    gene_creators = [ (lambda c=c: create_gene(c)) for c in LECTURE_LIST ]
-
-    toolbox.register("individual", tools.initCycle, creator.Individual, gene_creators, n=1)
-    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-
-    toolbox.register("evaluate", evaluate_timetable)
-    toolbox.register("mate", tools.cxTwoPoint)
-    toolbox.register("select", tools.selTournament, tournsize=3)
-
-    # custom mutate: change teacher/room/timeslot for some genes
-    def mutate_timetable(individual, indpb):
-        for i in range(len(individual)):
-            if random.random() < indpb:
-                cid, teacher, room, slot = individual[i]
-                choice = random.random()
-                if choice < 0.33:
-                    # change room (prefer suitable rooms)
-                    suitable_rooms = [r for r, info in ROOMS.items() if info['capacity'] >= COURSES[cid]['students']]
-                    if suitable_rooms:
-                        room = random.choice(suitable_rooms)
-                    else:
-                        room = random.choice(list(ROOMS.keys()))
-                elif choice < 0.66:
-                    # change timeslot
-                    slot = random.choice(TIMESLOTS)
-                else:
-                    # change teacher (if alternatives exist)
-                    valid_teachers = [t for t, d in TEACHERS.items() if cid in d['courses']]
-                    if len(valid_teachers) > 1:
-                        teacher = random.choice([t for t in valid_teachers if t != teacher])
-                    else:
-                        # pick any teacher occasionally
-                        teacher = random.choice(list(TEACHERS.keys()))
-                individual[i] = (cid, teacher, room, slot)
-        return (individual,)
-
-    toolbox.register("mutate", mutate_timetable, indpb=0.1)
-
-    # --- Run the GA ---
-    try:
-        pop = toolbox.population(n=pop_size)
-        hof = tools.HallOfFame(1)
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("avg", np.mean)
-        stats.register("min", np.min)
-        stats.register("max", np.max)
-
-        # Run evolution (silent)
-        algorithms.eaSimple(pop, toolbox, cxpb=cxpb, mutpb=mutpb, ngen=ngen, stats=stats, halloffame=hof, verbose=False)
-
-        if len(hof) == 0:
-            # fallback: pick best from population
-            best = tools.selBest(pop, 1)[0]
-        else:
-            best = hof[0]
-
-        fitness = best.fitness.values[0]
-    except Exception as e:
-        traceback_str = traceback.format_exc()
-        return {"error": "GA failed", "detail": str(e), "trace": traceback_str}
-
-    # --- Convert best individual into structured timetable (list of dicts) ---
-    timetable_list = []
-    for gene in best:
-        cid, teacher, room, timeslot = gene
-        if cid not in COURSES:
-            continue
-        c = COURSES[cid]
-        timetable_list.append({
-            "course_code": cid,
-            "course_name": c["name"],
-            "department": c["dept"],
-            "semester": c["semester"],
-            "students": c["students"],
-            "teacher": teacher,
-            "room": room,
-            "timeslot": timeslot
-        })
-
-    # Save into DATA for /timetable endpoint
-    try:
-        DATA["timetable"] = pd.DataFrame(timetable_list)
-    except Exception:
-        DATA["timetable"] = None
+# --- Repair the current timetable after a single change ---
+class RepairRequest(BaseModel):
+    """
+    teacher_unavailable: teacher -> timeslots they cannot teach in (null = all).
+    room_unavailable: room -> timeslots it cannot be used in (null = room removed).
+    """
+    teacher_unavailable: Dict[str, Optional[List[str]]] = {}
+    room_unavailable: Dict[str, Optional[List[str]]] = {}
+    max_moves: Optional[int] = None
+
+@app.post("/repair")
+async def repair_timetable(change: RepairRequest):
+    """
+    Fixes the current timetable for a change (a teacher calling in sick, a room
+    closed) without a GA run: only lectures that now break a hard rule are
+    reassigned, each to its cheapest teacher / room / slot, preferring moves
+    that change the fewest fields (see schedulify/repair.py). The repaired
+    timetable replaces the current one; the response lists every changed lecture.
+    The unavailability itself is not remembered by later /generate runs.
+    """
+    source = DATA["timetable_input"]
+    if DATA["timetable"] is None or source is None:
+        return {"error": "Timetable not generated yet."}
+    problem = source["problem"]
+
+    def ids(names, index, what):
+        unknown = [n for n in names if n not in index]
+        if unknown:
+            raise ValueError(f"Unknown {what}: {', '.join(map(str, unknown))}.")
+        return [index[n] for n in names]
 
-    # Return compact response
+    def blocked(unavailable, index, what):
+        return {ids([name], index, what)[0]: None if slots is None else ids(slots, problem.slot_index, "timeslot")
+                for name, slots in unavailable.items()}
+
+    try:
+        blocked_teachers = blocked(change.teacher_unavailable, problem.teacher_index, "teacher")
+        blocked_rooms = blocked(change.room_unavailable, problem.room_index, "room")
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # The stored timetable as-is: lectures of unqualified teachers (soft) stay where they are
+    before = previous_genes(problem, DATA["timetable"].to_dict(orient="records"), qualified_only=False)
+    genes, info = repair(problem, before, blocked_teachers=blocked_teachers, blocked_rooms=blocked_rooms,
+                         max_moves=change.max_moves)
+    DATA["timetable"] = pd.DataFrame(timetable_rows(source["courses"], problem.decode(genes)))
+
+    def assignment(gene):
+        t, r, s = (int(v) for v in gene)
+        if s < 0:
+            return None
+        return {"teacher": problem.teacher_ids[t], "room": problem.room_ids[r], "timeslot": problem.timeslots[s]}
+
+    changes = [{"course_code": problem.lecture_list[i], "before": assignment(before[i]), "after": assignment(genes[i])}
+               for i in info["moved"]]
     return {
-        "message": "Timetable generated.",
-        "fitness_penalty_score": float(fitness),
-        "num_lectures_scheduled": len(timetable_list),
-        "example_timetable_rows": timetable_list[:200],  # limit size for response
+        "message": "Timetable repaired.",
+        "fitness_penalty_score": info["penalty_after"],
+        "hard_violations_before": info["hard_before"],
+        "hard_violations_after": info["hard_after"],
+        "num_lectures_moved": len(changes),
+        "changes": changes,
+        "elapsed_ms": info["elapsed_ms"],
     }
 
 @app.get("/timetable")
@@ -542,6 +506,88 @@ async def get_timetable():
         return {"error": "Timetable not generated yet."}
     return DATA["timetable"].to_dict(orient="records")
 
+# --- Generation jobs ---
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        return {"error": "Job not found."}
+    result = JOBS.result(job_id)
+    if job["status"] == "completed" and result is not None:
+        job.update(
+            fitness_penalty_score=result["fitness_penalty_score"],
+            num_lectures_scheduled=len(result["timetable"]),
+            stop_reason=result["stop_reason"],
+            generations=result["generations"],
+            example_timetable_rows=result["timetable"][:200],  # limit size for response
+        )
+        if "warm_start" in result:
+            job["warm_start"] = result["warm_start"]
+        if "evaluator" in result:
+            job["evaluator"] = result["evaluator"]
+        if "profile" in result:
+            job["profile"] = result["profile"]
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, poll: float = 0.5, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of a job's progress: one "progress" event per
+    generation (generation, best / avg penalty, hard / soft split of the best,
+    evaluations, evals_per_second, elapsed_seconds), then an "end" event with
+    the final status. Past generations are replayed first; a reconnecting
+    client's Last-Event-ID resumes after that event. A job evicted while
+    streaming ends the stream with status "gone".
+    """
+    if JOBS.get(job_id) is None:
+        return {"error": "Job not found."}
+    sent = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    async def stream():
+        nonlocal sent
+        while True:
+            # Status first: once it is final, the events read next are complete
+            job = JOBS.get(job_id)
+            if job is None:
+                yield f"event: end\ndata: {json.dumps({'status': 'gone'})}\n\n"
+                return
+            status = job["status"]
+            for event in JOBS.events(job_id, sent) or []:
+                yield f"id: {sent}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+                sent += 1
+            if status not in ("queued", "running", "cancelling"):
+                yield f"event: end\ndata: {json.dumps({'status': status})}\n\n"
+                return
+            await asyncio.sleep(poll)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/metrics")
+async def metrics(request: Request, format: str = "prometheus"):
+    """
+    Prometheus text format by default: request latencies per route, jobs by
+    status and in flight, generations / evaluations (totals and per second),
+    best penalty histogram, dataset sizes and process memory / CPU.
+    format=json (or Accept: application/json) returns the GA profile instead:
+    seconds, calls, share of the loop and ms per generation for each operator
+    (select, clone, mate, mutate, evaluate, halloffame, stats, other), summed
+    over completed GA jobs, plus each job's own profile.
+    """
+    if format != "json" and "application/json" not in request.headers.get("accept", ""):
+        return Response(METRICS.render(), media_type=CONTENT_TYPE)
+    profiles = []
+    for job_id in list(JOBS.jobs):
+        result = JOBS.result(job_id)
+        if result is not None and "profile" in result:
+            profiles.append({"job_id": job_id, **result["profile"]})
+    return {"operators": merge_summaries(profiles), "jobs": profiles}
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not JOBS.cancel(job_id):
+        return {"error": "Job not found."}
+    return JOBS.get(job_id)
+
 @app.get("/download")
 async def download_timetable():
     if DATA["timetable"] is None:
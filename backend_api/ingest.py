@@ -0,0 +1,189 @@
+"""
+Streaming CSV ingestion for /upload.
+
+Uploads are parsed CHUNK_ROWS rows at a time straight from the request's
+spooled file. The header is matched once against the column names /generate
+has always accepted, and every chunk is converted into typed NumPy columns
+(ids as str, hours / students / capacities as int64). Only those columns are
+kept: neither the raw bytes nor a full DataFrame stays in memory.
+
+build_dicts turns the three tables into the COURSES / ROOMS / TEACHERS dicts
+the GA takes, with groupby / factorize / a stable sort instead of per-row loops.
+"""
+
+import io
+import numpy as np
+import pandas as pd
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+CHUNK_ROWS = 50_000
+
+# kind -> field -> accepted header names (case-insensitive, first match wins)
+SCHEMAS: Dict[str, Dict[str, List[str]]] = {
+    "courses": {
+        "code": ["Course Code", "course_code", "courseid", "course id", "code"],
+        "name": ["Course Name", "course_name", "name", "title"],
+        "dept": ["Department", "department", "dept"],
+        "semester": ["Semester", "semester", "sem"],
+        "students": ["Students", "students", "enrollment", "capacity"],
+        "hours": ["Hours", "hours", "lecture_hours", "hrs"],
+    },
+    "rooms": {
+        "code": ["Room Code", "room_code", "room", "code"],
+        "capacity": ["Capacity", "capacity", "cap", "seats"],
+    },
+    "teachers": {
+        "name": ["Teacher Name", "teacher_name", "name", "teacher"],
+        # comma-separated list, or one course per row
+        "courses": ["Courses", "courses", "course_codes", "course code", "course_code", "Course Code", "Course_Code"],
+        "course": ["Course Code", "course_code", "course", "course_code_mapping"],
+    },
+}
+
+REQUIRED: Dict[str, List[str]] = {
+    "courses": ["code", "name", "dept", "semester", "students", "hours"],
+    "rooms": ["code", "capacity"],
+    "teachers": ["name"],
+}
+
+# Integer fields: value used when the cell is empty or not a number
+INT_DEFAULTS = {"semester": 1, "students": 0, "hours": 1, "capacity": 0}
+
+
+def _col_lookup(columns: List[str], candidates: List[str]) -> Optional[str]:
+    cols = {c.lower(): c for c in columns}
+    for cand in candidates:
+        if cand.lower() in cols:
+            return cols[cand.lower()]
+    return None
+
+
+def _text(series: pd.Series) -> np.ndarray:
+    return series.astype(str).str.strip().to_numpy(dtype=object)
+
+
+def _int(series: pd.Series, default: int) -> np.ndarray:
+    # "70", "70.0" and 70 all parse; anything else falls back to the default
+    return pd.to_numeric(series, errors="coerce").fillna(default).astype(np.int64).to_numpy()
+
+
+class Table:
+    """
+    Typed columns of one uploaded CSV.
+
+    columns[field]: NumPy array per detected field (see SCHEMAS); teachers
+    additionally get the exploded (pair_teacher, pair_course) mapping.
+    headers[field]: the CSV header the field was read from.
+    key: content hash of the uploaded file (set by the caller), for the dataset cache.
+    """
+
+    def __init__(self, kind: str, columns: Dict[str, np.ndarray], headers: Dict[str, str], n_rows: int,
+                 key: Optional[str] = None):
+        self.kind = kind
+        self.columns = columns
+        self.headers = headers
+        self.n_rows = n_rows
+        self.key = key
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.columns
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def missing(self) -> List[str]:
+        """Required fields whose column was not found in the header."""
+        return [f for f in REQUIRED.get(self.kind, []) if f not in self.headers]
+
+
+def _convert(kind: str, chunk: pd.DataFrame, headers: Dict[str, str]) -> Dict[str, np.ndarray]:
+    if kind not in SCHEMAS:
+        return {h: _text(chunk[h]) for h in headers.values()}
+
+    out = {}
+    for field, header in headers.items():
+        if field in INT_DEFAULTS:
+            out[field] = _int(chunk[header], INT_DEFAULTS[field])
+        elif kind == "courses" and field in ("name", "dept"):
+            # Missing name -> the course code, missing department -> ""
+            fallback = chunk[headers["code"]].astype(str).str.strip() if field == "name" else ""
+            out[field] = chunk[header].fillna(fallback).astype(str).to_numpy(dtype=object)
+        elif field not in ("courses", "course"):
+            out[field] = _text(chunk[header])
+
+    if kind == "teachers" and "name" in headers:
+        # Teacher -> course pairs, one per listed course (the list column wins, as before)
+        mapping = headers.get("courses") or headers.get("course")
+        if mapping is not None:
+            rows = chunk[[headers["name"], mapping]].dropna(subset=[mapping])
+            codes = rows[mapping].astype(str)
+            if mapping == headers.get("courses"):
+                codes = codes.str.split(",").explode()
+            codes = codes.str.strip()
+            keep = codes != ""
+            out["pair_teacher"] = _text(rows[headers["name"]].loc[codes.index[keep]])
+            out["pair_course"] = codes[keep].to_numpy(dtype=object)
+    return out
+
+
+def ingest_csv(kind: str, stream: BinaryIO, chunk_rows: int = CHUNK_ROWS) -> Table:
+    """
+    Parses ``stream`` (binary, e.g. ``UploadFile.file``) into a Table of typed
+    columns for ``kind`` ("courses", "rooms", "teachers"; any other kind keeps
+    every column as text). Undecodable bytes are dropped rather than failing.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore", newline="")
+    headers: Optional[Dict[str, str]] = None
+    parts: Dict[str, List[np.ndarray]] = {}
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(text, dtype=str, chunksize=chunk_rows):
+            if headers is None:
+                columns = list(chunk.columns)
+                if kind in SCHEMAS:
+                    headers = {f: _col_lookup(columns, cands) for f, cands in SCHEMAS[kind].items()}
+                    headers = {f: h for f, h in headers.items() if h is not None}
+                else:
+                    headers = {c: c for c in columns}
+            for field, values in _convert(kind, chunk, headers).items():
+                parts.setdefault(field, []).append(values)
+            n_rows += len(chunk)
+    finally:
+        # Leave the upload's file open for the caller
+        text.detach()
+
+    columns = {field: np.concatenate(values) for field, values in parts.items()}
+    return Table(kind, columns, headers or {}, n_rows)
+
+
+def build_dicts(courses: Table, rooms: Table, teachers: Table) -> Tuple[Dict, Dict, Dict]:
+    """
+    Returns (COURSES, ROOMS, TEACHERS).
+
+    A repeated course / room code keeps its first position and its last row's
+    values; teachers get every listed course, in file order. A teacher file
+    without any course mapping lets every teacher teach every course.
+    """
+    frame = pd.DataFrame({f: courses[f] for f in ("code", "name", "dept", "semester", "students", "hours")})
+    frame["students"] = frame["students"].clip(lower=1)
+    frame["hours"] = frame["hours"].clip(lower=1)
+    frame = frame.groupby("code", sort=False).last()
+    COURSES = frame.to_dict("index")
+
+    room_frame = pd.DataFrame({"code": rooms["code"], "capacity": rooms["capacity"].clip(min=0)})
+    ROOMS = room_frame.groupby("code", sort=False).last().to_dict("index")
+
+    if "pair_teacher" in teachers and len(teachers["pair_teacher"]):
+        # Group the pairs by teacher (first-appearance order) with one stable sort
+        pair_teacher, teacher_ids = pd.factorize(teachers["pair_teacher"])
+        order = np.argsort(pair_teacher, kind="stable")
+        bounds = np.cumsum(np.bincount(pair_teacher))[:-1]
+        by_teacher = np.split(teachers["pair_course"][order], bounds)
+        TEACHERS = {t: {"courses": codes.tolist()} for t, codes in zip(teacher_ids, by_teacher)}
+    else:
+        all_courses = list(COURSES)
+        TEACHERS = {t: {"courses": list(all_courses)} for t in pd.unique(teachers["name"])}
+    return COURSES, ROOMS, TEACHERS
@@ -0,0 +1,188 @@
+"""
+Background generation jobs for the FastAPI service.
+
+A job runs the GA in a worker process (ProcessPoolExecutor), so the event loop
+stays free for /status, /upload, ... while it evolves. Progress (generation,
+best / avg penalty) and cancellation flags live in a multiprocessing Manager so
+the worker can publish them and the API can read them at any time. Every
+progress call is also appended to the job's event log, which GET
+/jobs/{job_id}/events streams to clients. Once a job finishes its state and
+events are copied out of the Manager, and finished jobs are evicted after a
+while (see JobManager).
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside the worker when the job's cancel flag is set."""
+
+
+def _run_job(fn: Callable, state, cancel, events, args, kwargs):
+    """Worker-side wrapper: publishes progress and honours cancellation."""
+    # The pool hands out a few jobs ahead of its workers, so a job cancelled while
+    # queued can still arrive here
+    if cancel.is_set():
+        return None
+    state.update(status="running", started_at=time.time())
+
+    evaluations_total = 0
+
+    def progress(generation: int, best_penalty: float, avg_penalty: float, **details):
+        # details: hard / soft split, evaluations, evals_per_second, ... (see ProgressMonitor)
+        nonlocal evaluations_total
+        event = dict(generation=generation, best_penalty=best_penalty, avg_penalty=avg_penalty, **details)
+        evaluations_total += details.get("evaluations") or 0
+        state.update(event, evaluations_total=evaluations_total)
+        events.append(event)
+        if cancel.is_set():
+            raise JobCancelled()
+
+    try:
+        return fn(*args, progress=progress, **kwargs)
+    except JobCancelled:
+        return None
+
+
+class JobManager:
+    """
+    Submits GA runs to a process pool and tracks them by job id.
+
+    Finished jobs swap their Manager proxies for plain copies and are kept for
+    ``ttl`` seconds (GA_JOB_TTL), at most ``keep_finished`` of them
+    (GA_JOB_HISTORY); older ones are dropped with their results.
+    ``finish_listeners`` are called as ``fn(job_id, snapshot)`` once per
+    finished job, whatever its final status.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, keep_finished: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.max_workers = max_workers or int(os.environ.get("GA_WORKERS", 0)) or os.cpu_count()
+        self.keep_finished = keep_finished if keep_finished is not None else int(os.environ.get("GA_JOB_HISTORY", 100))
+        self.ttl = ttl if ttl is not None else float(os.environ.get("GA_JOB_TTL", 3600))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._lock = threading.Lock()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.finish_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+
+    def _start(self):
+        # Pool and manager are created on first use, not at import time
+        if self._executor is None:
+            self._manager = multiprocessing.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def submit(self, fn: Callable, *args, on_done: Optional[Callable[[Any], None]] = None, **kwargs) -> str:
+        """
+        Runs ``fn(*args, progress=..., **kwargs)`` in the pool and returns the job id.
+        ``on_done(result)`` is called in the parent once the job completes successfully.
+        """
+        self._evict()
+        with self._lock:
+            self._start()
+            job_id = uuid.uuid4().hex
+            state = self._manager.dict(status="queued", generation=0, evaluations_total=0, best_penalty=None,
+                                       avg_penalty=None, submitted_at=time.time(), started_at=None)
+            cancel = self._manager.Event()
+            events = self._manager.list()
+            # Only the scalar settings are reported back (kwargs may carry a prebuilt Problem)
+            params = {k: v for k, v in kwargs.items() if v is None or isinstance(v, (bool, int, float, str))}
+            job = {"id": job_id, "state": state, "cancel": cancel, "events": events, "result": None,
+                   "error": None, "finished_at": None, "params": params}
+            self.jobs[job_id] = job
+            future = self._executor.submit(_run_job, fn, state, cancel, events, args, kwargs)
+            job["future"] = future
+        future.add_done_callback(lambda f: self._finish(job, f, on_done))
+        return job_id
+
+    def _finish(self, job: Dict[str, Any], future: Future, on_done: Optional[Callable[[Any], None]]):
+        if future.cancelled() or job["cancel"].is_set():
+            status = "cancelled"
+        elif future.exception() is not None:
+            error = future.exception()
+            job["error"] = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+            status = "failed"
+        else:
+            job["result"] = future.result()
+            status = "completed"
+        job["state"]["status"] = status
+        self._release(job)
+        job["finished_at"] = time.time()
+        snapshot = dict(job["state"], job_id=job["id"], finished_at=job["finished_at"])
+        for listener in self.finish_listeners:
+            listener(job["id"], snapshot)
+        if status == "completed" and on_done is not None:
+            on_done(job["result"])
+        self._evict()
+
+    @staticmethod
+    def _release(job: Dict[str, Any]):
+        """Replaces a finished job's Manager proxies with plain copies, freeing the manager-side objects."""
+        cancel = threading.Event()
+        if job["cancel"].is_set():
+            cancel.set()
+        job.update(state=dict(job["state"]), events=list(job["events"]), cancel=cancel)
+
+    def _evict(self):
+        """Drops finished jobs older than ``ttl`` and all but the ``keep_finished`` most recent."""
+        now = time.time()
+        with self._lock:
+            finished = sorted((j for j in self.jobs.values() if j["finished_at"] is not None),
+                              key=lambda j: j["finished_at"])
+            excess = max(0, len(finished) - self.keep_finished)
+            for job in finished:
+                if excess > 0 or now - job["finished_at"] > self.ttl:
+                    del self.jobs[job["id"]]
+                    excess -= 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job: status, progress and (when done) result or error."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = dict(job["state"])
+        snapshot.update(job_id=job_id, finished_at=job["finished_at"], params=job["params"])
+        if job["error"] is not None:
+            snapshot["error"] = job["error"]
+        return snapshot
+
+    def active(self) -> List[str]:
+        """Ids of the jobs not finished yet (queued, running or cancelling)."""
+        return [job_id for job_id, job in list(self.jobs.items()) if job["finished_at"] is None]
+
+    def events(self, job_id: str, start: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Progress events of a job from index ``start`` on (one per generation)."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        return job["events"][start:]
+
+    def result(self, job_id: str) -> Any:
+        job = self.jobs.get(job_id)
+        return job["result"] if job else None
+
+    def cancel(self, job_id: str) -> bool:
+        """Requests cancellation; a queued job never starts, a running one stops at its next generation."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job["cancel"].set()
+        if job["future"].cancel():
+            job["state"]["status"] = "cancelled"
+        elif job["state"]["status"] in ("queued", "running"):
+            job["state"]["status"] = "cancelling"
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
+            self._manager = None
@@ -0,0 +1,164 @@
+"""
+Prometheus metrics for the FastAPI service, rendered in the text exposition
+format (0.0.4) without a client library.
+
+Metrics are declared once at import, updated where things happen (request
+middleware, job completion, /generate) and rendered by GET /metrics.
+Collectors registered with ``Registry.collector`` run at render time to
+refresh values that are cheaper to read than to track (job states, process
+memory).
+
+    REQUESTS = REGISTRY.histogram("http_request_duration_seconds", "...", ["route"])
+    REQUESTS.observe(0.012, route="/generate")
+    REGISTRY.render()
+"""
+
+import math
+import os
+import resource
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_STARTED = time.time()
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    return repr(int(value)) if float(value).is_integer() and abs(value) < 1e15 else repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """One metric family: a counter, gauge or histogram with a fixed label set."""
+
+    def __init__(self, name: str, kind: str, help: str, labels: Sequence[str] = (),
+                 buckets: Optional[Sequence[float]] = None):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,) if buckets is not None else None
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple:
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def inc(self, amount: float = 1.0, **labels):
+        with self._lock:
+            key = self._key(labels)
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def observe(self, value: float, **labels):
+        """Histograms: per-bucket counts, sum and count."""
+        with self._lock:
+            key = self._key(labels)
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {_number(value)}")
+                continue
+            counts, total = value
+            for bound, count in zip(self.buckets, counts):
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {counts[-1]}")
+        return lines
+
+
+class Registry:
+    """The service's metric families, in declaration order."""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], None]] = []
+
+    def _add(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Metric:
+        return self._add(Metric(name, "counter", help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Metric:
+        return self._add(Metric(name, "gauge", help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Metric:
+        return self._add(Metric(name, "histogram", help, labels, buckets=list(buckets)))
+
+    def collector(self, fn: Callable[[], None]) -> Callable[[], None]:
+        """Registers ``fn`` to refresh metrics before each render (usable as a decorator)."""
+        self.collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        for collect in self.collectors:
+            collect()
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+def process_metrics(registry: Registry):
+    """Standard process_* metrics of the current (API) process, read at render time."""
+    rss = registry.gauge("process_resident_memory_bytes", "Resident memory size in bytes.")
+    vms = registry.gauge("process_virtual_memory_bytes", "Virtual memory size in bytes.")
+    peak = registry.gauge("process_max_resident_memory_bytes", "Peak resident memory size in bytes.")
+    cpu = registry.counter("process_cpu_seconds_total", "User and system CPU time spent in seconds.")
+    start = registry.gauge("process_start_time_seconds", "Start time of the process since unix epoch in seconds.")
+    start.set(_STARTED)
+
+    @registry.collector
+    def collect():
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu.set(usage.ru_utime + usage.ru_stime)
+        peak.set(usage.ru_maxrss * 1024)  # KiB on Linux
+        try:
+            with open("/proc/self/statm") as f:
+                size, resident = (int(v) for v in f.read().split()[:2])
+        except OSError:
+            return  # no procfs (e.g. macOS): only the peak is reported
+        vms.set(size * _PAGE_SIZE)
+        rss.set(resident * _PAGE_SIZE)
@@ -0,0 +1,352 @@
+"""
+The /generate GA (hard/soft rules, DEAP operators) as a plain function, so it
+can run in a worker process of the job pool instead of inside the event loop.
+"""
+
+import random
+import numpy as np
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from deap import base, creator, tools
+
+from schedulify import Problem, FitnessEngine, register_types
+from schedulify.chromosome import init_population, cx_two_point, mutate_genes
+from schedulify.delta import IncrementalEvaluator
+from schedulify.evolution import EarlyStopping, ProgressMonitor, ea_simple
+from schedulify.parallel import ParallelEvaluator
+from schedulify.profiling import GenerationProfiler
+from schedulify.construct import HEURISTIC_FRACTION, seeded_genes
+from schedulify.warmstart import previous_genes, warm_genes
+
+# Standard weekly slots (Mon-Fri) 9-13, 14-18 (skip 13-14). Generate flexible labels.
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
+HOURS = [9,10,11,12,14,15,16,17]  # 8 slots per day -> 40 total
+TIMESLOTS = [f"{d}_{h:02d}-{h+1:02d}" for d in DAYS for h in HOURS]
+
+# CP-SAT defaults when time_budget / workers are not given
+CPSAT_TIME_LIMIT = 60.0
+CPSAT_WORKERS = 8
+
+
+def build_problem(COURSES: Dict[str, Dict[str, Any]], ROOMS: Dict[str, Dict[str, Any]],
+                  TEACHERS: Dict[str, Dict[str, Any]]) -> Problem:
+    """The Problem /generate solves: standard TIMESLOTS, unqualified teachers as a soft violation."""
+    return Problem(COURSES, TEACHERS, ROOMS, TIMESLOTS, penalize_unqualified=True)
+
+
+def timetable_rows(COURSES: Dict[str, Dict[str, Any]], genes) -> List[Dict[str, Any]]:
+    """(course_id, teacher, room, timeslot) tuples -> the row dicts returned by /generate."""
+    timetable_list = []
+    for gene in genes:
+        cid, teacher, room, timeslot = gene
+        if cid not in COURSES:
+            continue
+        c = COURSES[cid]
+        timetable_list.append({
+            "course_code": cid,
+            "course_name": c["name"],
+            "department": c["dept"],
+            "semester": c["semester"],
+            "students": c["students"],
+            "teacher": teacher,
+            "room": room,
+            "timeslot": timeslot
+        })
+    return timetable_list
+
+
+def run_timetable_cpsat(COURSES: Dict[str, Dict[str, Any]], problem: Problem, time_budget: Optional[float] = None,
+                        workers: int = 0, progress: Optional[Callable[[int, float, float], None]] = None,
+                        hint=None) -> Dict[str, Any]:
+    """
+    Exact CP-SAT solve of the same problem; result in the run_timetable_ga format.
+    stop_reason is "optimal" / "infeasible" (proofs), "time_budget" or "unknown";
+    ``generations`` counts the improving solutions found. ``hint``: genes of a
+    previous timetable (warmstart.previous_genes) to start the search from.
+    """
+    # ortools is only needed by this engine
+    from schedulify.cpsat import solve_cpsat
+
+    genes, info = solve_cpsat(problem, time_limit=time_budget or CPSAT_TIME_LIMIT,
+                              workers=workers or CPSAT_WORKERS, progress=progress, hint=hint)
+    result = {"fitness_penalty_score": None, "timetable": [], "stop_reason": info["stop_reason"],
+              "generations": info["solutions"], "best_bound": info["best_bound"]}
+    if genes is not None:
+        result["fitness_penalty_score"] = float(FitnessEngine(problem).penalties(genes[None])[0])
+        result["timetable"] = timetable_rows(COURSES, problem.decode(genes))
+    return result
+
+
+def run_timetable_ga(
+    COURSES: Dict[str, Dict[str, Any]],
+    ROOMS: Dict[str, Dict[str, Any]],
+    TEACHERS: Dict[str, Dict[str, Any]],
+    pop_size: int = 300,
+    cxpb: float = 0.8,
+    mutpb: float = 0.2,
+    ngen: int = 200,
+    randseed: Optional[int] = None,
+    representation: str = "tuple",
+    incremental: bool = False,
+    workers: int = 0,
+    target_penalty: Optional[float] = 0.0,
+    patience: Optional[int] = 50,
+    time_budget: Optional[float] = None,
+    engine: str = "ga",
+    problem: Optional[Problem] = None,
+    warm_start: Optional[List[Any]] = None,
+    changed: Optional[Dict[str, Iterable[str]]] = None,
+    progress: Optional[Callable[[int, float, float], None]] = None,
+    profile_generation: Optional[int] = None,
+    heuristic_fraction: float = HEURISTIC_FRACTION,
+    elitism: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    GA behind /generate, runnable in a worker process.
+    Takes the COURSES / ROOMS / TEACHERS dicts built from the uploaded CSVs and
+    returns {"fitness_penalty_score", "timetable", "stop_reason", "generations"}
+    (timetable = list of row dicts). The run ends early once the best penalty
+    reaches ``target_penalty``, after ``patience`` generations without improvement
+    or after ``time_budget`` seconds (None disables a criterion).
+    engine="cpsat" solves the same problem exactly with OR-Tools instead
+    (run_timetable_cpsat; ``workers`` / ``time_budget`` go to the solver).
+    ``progress(generation, best_penalty, avg_penalty, **details)`` is called every
+    generation, details being the rest of the ProgressMonitor event (hard / soft
+    split of the best, evaluations, evals_per_second, elapsed_seconds); an
+    exception raised from it aborts the run.
+    ``problem``: the Problem for these dicts when the caller already has it
+    (e.g. from the dataset cache), instead of building it here.
+    ``warm_start``: rows of a previous timetable (the row dicts returned here).
+    The initial population is that timetable plus perturbed variants, with the
+    lectures of entities in ``changed`` ({"courses" / "teachers" / "rooms": names})
+    and anything no longer valid re-drawn; CP-SAT gets it as a solution hint.
+    GA results carry "profile": time and calls per operator (GenerationProfiler);
+    ``profile_generation`` also runs that generation under cProfile / tracemalloc.
+    ``heuristic_fraction``: share of the initial population built by the greedy
+    construction heuristic (schedulify/construct.py: most-constrained lecture
+    first, into free teacher / room / group slots); the rest is random.
+    ``elitism``: best individuals copied into every generation (default: 1 when
+    the population is seeded by ``warm_start`` or the heuristic, else 0).
+    GA results also name the "evaluator" that scored the run ("python", "engine",
+    "incremental" or "parallel"). ``incremental`` needs the array representation
+    and cannot be combined with ``workers`` > 1 (ValueError).
+    """
+    if incremental and (representation != "array" or workers > 1):
+        raise ValueError("incremental evaluation needs representation='array' and workers <= 1.")
+    if randseed is not None:
+        random.seed(randseed)
+        np.random.seed(randseed)
+
+    # --- Integer-encoded problem + per-course eligibility index (built once) ---
+    # course -> qualified teachers, course -> capacity-feasible rooms (smallest first)
+    if problem is None:
+        problem = build_problem(COURSES, ROOMS, TEACHERS)
+
+    # Flattened lectures: each course appears 'hours' times (each hour is a separate lecture entity)
+    LECTURE_LIST: List[str] = problem.lecture_list
+    previous = previous_genes(problem, warm_start, changed) if warm_start is not None else None
+    if engine == "cpsat":
+        return run_timetable_cpsat(COURSES, problem, time_budget=time_budget, workers=workers, progress=progress,
+                                   hint=previous)
+
+    # --- Fitness function with hard/soft constraints ---
+    def evaluate_timetable(individual):
+        """
+        Individual: list of tuples (course_id, teacher, room, timeslot)
+        Returns: (penalty,)
+        Hard violations multiply by large factor.
+        """
+        hard_violations = 0
+        soft_violations = 0
+
+        teacher_schedule = defaultdict(set)
+        room_schedule = defaultdict(set)
+        student_group_schedule = defaultdict(set)
+
+        for gene in individual:
+            course_id, teacher, room, timeslot = gene
+            if course_id not in COURSES:
+                # heavy penalty for completely invalid course assignment
+                hard_violations += 10
+                continue
+            c = COURSES[course_id]
+
+            # H1: teacher conflict (same teacher two lectures same timeslot)
+            if timeslot in teacher_schedule[teacher]:
+                hard_violations += 1
+            teacher_schedule[teacher].add(timeslot)
+
+            # H2: room conflict
+            if timeslot in room_schedule[room]:
+                hard_violations += 1
+            room_schedule[room].add(timeslot)
+
+            # H3: student group conflict (dept+sem)
+            student_group = (c['dept'], c['semester'])
+            if timeslot in student_group_schedule[student_group]:
+                hard_violations += 1
+            student_group_schedule[student_group].add(timeslot)
+
+            # H4: room capacity
+            if room not in ROOMS or c['students'] > ROOMS[room]['capacity']:
+                hard_violations += 1
+
+            # Soft: prefer teacher assigned to courses they can teach (if teacher-course mapping exists)
+            if teacher in TEACHERS and c['name'] is not None:
+                if c['name'] and course_id not in TEACHERS[teacher]['courses']:
+                    # If teacher cannot teach this course, small penalty (but allow)
+                    soft_violations += 1
+
+        total_penalty = hard_violations * 1000 + soft_violations
+        return (total_penalty,)
+
+    # --- DEAP setup (guard against re-creation of creator names) ---
+    register_types()
+
+    toolbox = base.Toolbox()
+
+    # gene creator for a specific lecture (course_id)
+    def create_gene(course_id: str):
+        # valid teachers for this course (from the eligibility index; falls back to any teacher)
+        valid_teachers = problem.teachers_by_course[course_id] or ["TBD"]
+        teacher = random.choice(valid_teachers)
+
+        # choose a room that can potentially fit (prefer rooms with capacity >= students, but allow any)
+        suitable_rooms = problem.rooms_by_course[course_id] or ["UNKWN"]
+        room = random.choice(suitable_rooms)
+
+        timeslot = random.choice(TIMESLOTS)
+        return (course_id, teacher, room, timeslot)
+
+    # Build gene creators list: a function per lecture in LECTURE_LIST
+    gene_creators = [ (lambda c=c: create_gene(c)) for c in LECTURE_LIST ]
+
+    toolbox.register("individual", tools.initCycle, creator.Individual, gene_creators, n=1)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+
+    toolbox.register("evaluate", evaluate_timetable)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+
+    # custom mutate: change teacher/room/timeslot for some genes
+    def mutate_timetable(individual, indpb):
+        for i in range(len(individual)):
+            if random.random() < indpb:
+                cid, teacher, room, slot = individual[i]
+                choice = random.random()
+                if choice < 0.33:
+                    # change room (suitable rooms, or any room if none fits)
+                    room = random.choice(problem.rooms_by_course[cid])
+                elif choice < 0.66:
+                    # change timeslot
+                    slot = random.choice(TIMESLOTS)
+                else:
+                    # change teacher (if alternatives exist)
+                    valid_teachers = problem.teachers_by_course[cid]
+                    if len(valid_teachers) > 1:
+                        teacher = random.choice([t for t in valid_teachers if t != teacher])
+                    else:
+                        # pick any teacher occasionally
+                        teacher = random.choice(problem.teacher_ids)
+                individual[i] = (cid, teacher, room, slot)
+        return (individual,)
+
+    toolbox.register("mutate", mutate_timetable, indpb=0.1)
+
+    # Which evaluator scores the run, reported in the result as "evaluator"
+    evaluator = "python"
+
+    # --- Compact array representation (same rules, scored by the NumPy engine) ---
+    if representation == "array":
+        evaluator = "engine"
+        engine = FitnessEngine(problem)
+        toolbox.register("population", init_population, creator.ArrayIndividual, problem, rooms="fitting")
+        toolbox.register("evaluate", engine.evaluate)
+        toolbox.register("map", engine.map)
+        toolbox.register("mate", cx_two_point)
+        toolbox.register("mutate", mutate_genes, problem=problem, indpb=0.1, rooms="fitting")
+        if incremental:
+            toolbox.register("evaluate", IncrementalEvaluator(problem).evaluate)
+            evaluator = "incremental"
+
+    # --- Warm start: previous timetable + perturbed variants instead of random individuals ---
+    if previous is not None:
+        if representation == "array":
+            def warm_population(n):
+                return [creator.ArrayIndividual(genes) for genes in warm_genes(problem, previous, n, rooms="fitting")]
+        else:
+            def warm_population(n):
+                return [creator.Individual(problem.decode(genes))
+                        for genes in warm_genes(problem, previous, n, rooms="fitting")]
+        toolbox.register("population", warm_population)
+    elif heuristic_fraction:
+        # --- Constructed (near clash-free) individuals plus random ones ---
+        if representation == "array":
+            def seeded_population(n):
+                return [creator.ArrayIndividual(genes)
+                        for genes in seeded_genes(problem, n, heuristic_fraction, rooms="fitting")]
+        else:
+            def seeded_population(n):
+                return [creator.Individual(problem.decode(genes))
+                        for genes in seeded_genes(problem, n, heuristic_fraction, rooms="fitting")]
+        toolbox.register("population", seeded_population)
+    if elitism is None:
+        elitism = 1 if previous is not None or heuristic_fraction else 0
+
+    # --- Run the GA ---
+    pop = toolbox.population(n=pop_size)
+    # '==' on array individuals is element-wise, so compare them with array_equal
+    hof = tools.HallOfFame(max(1, elitism), similar=np.array_equal) if representation == "array" \
+        else tools.HallOfFame(max(1, elitism))
+    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats.register("avg", np.mean)
+    stats.register("min", np.min)
+    stats.register("max", np.max)
+
+    # Optional process pool (workers > 1): the NumPy engine, which applies the same
+    # rules as evaluate_timetable, is sent to each worker once; only chromosomes
+    # travel per generation.
+    parallel = None
+    if workers > 1:
+        engine = FitnessEngine(problem)
+        parallel = ParallelEvaluator(engine, processes=workers)
+        toolbox.register("evaluate", engine.evaluate)
+        toolbox.register("map", parallel.map)
+        evaluator = "parallel"
+
+    # Run evolution (silent), reporting each generation to ``progress``; the
+    # hard / soft split comes from the NumPy engine (same rules as evaluate_timetable)
+    on_generation = None
+    if progress is not None:
+        on_generation = ProgressMonitor(lambda event: progress(**event), breakdown=FitnessEngine(problem).breakdown)
+    stopping = EarlyStopping(target=target_penalty, patience=patience, time_budget=time_budget)
+    profiler = GenerationProfiler(capture_generation=profile_generation)
+    profiler.instrument(toolbox)
+    try:
+        ea_simple(pop, toolbox, cxpb=cxpb, mutpb=mutpb, ngen=ngen, stats=stats, halloffame=hof,
+                  on_generation=on_generation, early_stopping=stopping, profiler=profiler,
+                  elitism=elitism)
+    finally:
+        if parallel:
+            parallel.close()
+
+    if len(hof) == 0:
+        # fallback: pick best from population
+        best = tools.selBest(pop, 1)[0]
+    else:
+        best = hof[0]
+
+    fitness = best.fitness.values[0]
+
+    # --- Convert best individual into structured timetable (list of dicts) ---
+    genes = problem.decode(best) if representation == "array" else best
+    timetable_list = timetable_rows(COURSES, genes)
+
+    result = {"fitness_penalty_score": float(fitness), "timetable": timetable_list,
+              "stop_reason": stopping.reason, "generations": stopping.generation,
+              "evaluator": evaluator, "profile": profiler.summary()}
+    if previous is not None:
+        kept = int((previous >= 0).all(axis=1).sum())
+        result["warm_start"] = {"kept_lectures": kept, "redrawn_lectures": len(previous) - kept}
+    return result
@@ -0,0 +1,9 @@
+"""
+Benchmarks (run from the repository root):
+
+    bench_suite.py         every GA entry point and CP-SAT on synthetic instances, JSON results
+    instances.py           seeded synthetic instance generator (small / medium / large / xl)
+    bench_preprocess.py    /upload + /generate pre-processing, iterrows vs vectorised
+    bench_parallel_eval.py process-pool fitness evaluation speedup
+    bench_delta.py         incremental (delta) evaluation versus the batch engine
+"""
@@ -0,0 +1,92 @@
+"""
+When incremental (delta) evaluation pays off against the batch NumPy engine.
+
+For each instance size and mutation rate, a population of array individuals is
+evaluated once, then every round clones it, mutates each clone with
+``mutate_genes(indpb=...)`` and re-scores all of them: either through
+``FitnessEngine.map`` (whole population, full recompute) or through
+``IncrementalEvaluator.evaluate`` (one individual at a time, only changed genes).
+Cost of the engine grows with the timetable size, cost of the incremental
+evaluator with the number of changed genes and the per-call overhead.
+
+    python benchmarks/bench_delta.py --sizes medium large xl --indpb 0.001 0.01 0.1 --pop 300
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from deap import base, creator
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from benchmarks.instances import SIZES, generate, to_generator_input
+from schedulify import Problem, FitnessEngine, ArrayIndividual
+from schedulify.chromosome import init_population, mutate_genes
+from schedulify.delta import IncrementalEvaluator
+
+
+def evals_per_second(problem, evaluate_all, pop, indpb, rounds):
+    population = init_population(creator.ArrayIndividual, problem, pop)
+    evaluate_all(population)
+    elapsed = 0.0
+    for _ in range(rounds):
+        offspring = [ind.__deepcopy__({}) for ind in population]
+        for ind in offspring:
+            mutate_genes(ind, problem, indpb)
+        start = time.perf_counter()
+        evaluate_all(offspring)
+        elapsed += time.perf_counter() - start
+        population = offspring
+    return pop * rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["medium", "large"])
+    parser.add_argument("--indpb", type=float, nargs="+", default=[0.001, 0.01, 0.1])
+    parser.add_argument("--pop", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if not hasattr(creator, "FitnessMin"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+    if not hasattr(creator, "ArrayIndividual"):
+        creator.create("ArrayIndividual", ArrayIndividual, fitness=creator.FitnessMin)
+
+    results = []
+    for size in args.sizes:
+        data = to_generator_input(generate(size, 0))
+        problem = Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"], data["preferences"])
+        engine = FitnessEngine(problem)
+        incremental = IncrementalEvaluator(problem)
+
+        def batch(population):
+            for ind, fit in zip(population, engine.map(engine.evaluate, population)):
+                ind.fitness.values = fit
+
+        def delta(population):
+            for ind in population:
+                ind.fitness.values = incremental.evaluate(ind)
+
+        for indpb in args.indpb:
+            np.random.seed(0)
+            engine_rate = evals_per_second(problem, batch, args.pop, indpb, args.rounds)
+            np.random.seed(0)
+            delta_rate = evals_per_second(problem, delta, args.pop, indpb, args.rounds)
+            results.append({"size": size, "lectures": problem.n_lectures, "indpb": indpb,
+                            "engine_evals_per_sec": engine_rate, "incremental_evals_per_sec": delta_rate,
+                            "speedup": delta_rate / engine_rate})
+
+    print(f"{'size':<8}{'lectures':>9}{'indpb':>8}{'engine/s':>12}{'incr/s':>12}{'speedup':>9}", file=sys.stderr)
+    for r in results:
+        print(f"{r['size']:<8}{r['lectures']:>9}{r['indpb']:>8}{r['engine_evals_per_sec']:>12.0f}"
+              f"{r['incremental_evals_per_sec']:>12.0f}{r['speedup']:>9.2f}", file=sys.stderr)
+    print(json.dumps({"benchmark": "delta_eval", "pop": args.pop, "results": results}))
+
+
+if __name__ == "__main__":
+    main()
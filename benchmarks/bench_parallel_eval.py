@@ -0,0 +1,77 @@
+"""
+Speedup of process-pool fitness evaluation versus worker count.
+
+Uses the centralized_with_soft_constraints.py dataset (its COURSES / TEACHERS /
+ROOMS / preferences and its own random individuals) and times one generation's
+worth of evaluations (POP_SIZE individuals) through ``ParallelEvaluator.map``,
+for both that script's pure-Python evaluate_timetable and the NumPy FitnessEngine.
+
+    python benchmarks/bench_parallel_eval.py --workers 1 2 4 8 16 32 --pop 600 --rounds 5
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from schedulify import Problem, FitnessEngine
+from schedulify.parallel import ParallelEvaluator
+
+DATASET = os.path.join(ROOT, "logics", "python", "Two step approach", "centralized_with_soft_constraints.py")
+
+
+def load_dataset():
+    spec = importlib.util.spec_from_file_location("centralized_with_soft_constraints", DATASET)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # lets workers resolve evaluate_timetable by name
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_map(evaluate, map_fn, population, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        map_fn(evaluate, population)
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--pop", type=int, default=600)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    ds = load_dataset()
+    population = ds.toolbox.population(n=args.pop)
+    problem = Problem(ds.COURSES, ds.TEACHERS, ds.ROOMS, ds.TIMESLOTS, preferences=ds.TEACHER_PREFERENCES)
+    engine = FitnessEngine(problem)
+
+    results = []
+    for name, evaluator, evaluate, serial_map in (
+        ("python", ds.evaluate_timetable, ds.evaluate_timetable, lambda f, pop: list(map(f, pop))),
+        ("numpy", engine, engine.evaluate, engine.map),
+    ):
+        serial = time_map(evaluate, serial_map, population, args.rounds)
+        results.append({"evaluator": name, "workers": 0, "seconds": serial, "speedup": 1.0,
+                        "evals_per_sec": args.pop / serial})
+        for workers in args.workers:
+            with ParallelEvaluator(evaluator, processes=workers) as parallel:
+                elapsed = time_map(evaluate, parallel.map, population, args.rounds)
+            results.append({"evaluator": name, "workers": workers, "seconds": elapsed,
+                            "speedup": serial / elapsed, "evals_per_sec": args.pop / elapsed})
+
+    print(f"{'evaluator':<10}{'workers':>8}{'sec/gen':>12}{'evals/s':>12}{'speedup':>9}", file=sys.stderr)
+    for r in results:
+        print(f"{r['evaluator']:<10}{r['workers'] or 'serial':>8}{r['seconds']:>12.4f}"
+              f"{r['evals_per_sec']:>12.0f}{r['speedup']:>9.2f}", file=sys.stderr)
+    print(json.dumps({"benchmark": "parallel_eval", "pop": args.pop, "lectures": len(ds.LECTURE_LIST),
+                      "cpu_count": os.cpu_count(), "results": results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+/upload + /generate pre-processing: the original DataFrame + iterrows loops
+versus streaming ingestion (backend_api/ingest.py) and vectorised build_dicts.
+
+Generates a synthetic export (--courses rows, --teachers teacher-course rows,
+comma-separated lists) and times both paths from CSV bytes to the
+COURSES / ROOMS / TEACHERS dicts, checking that they build the same dicts.
+
+    python benchmarks/bench_preprocess.py --courses 10000 --teachers 100000 --rounds 3
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "backend_api"))
+from ingest import SCHEMAS, _col_lookup, build_dicts, ingest_csv
+
+
+def synthetic_csvs(n_courses, n_teacher_rows, n_rooms, seed=0):
+    rng = random.Random(seed)
+    courses = ["Course Code,Course Name,Department,Semester,Students,Hours"]
+    courses += [f"C{i},Course {i},D{i % 20},{i % 8 + 1},{rng.randint(20, 200)},{rng.randint(1, 4)}"
+                for i in range(n_courses)]
+    rooms = ["Room Code,Capacity"] + [f"R{i},{rng.randint(30, 250)}" for i in range(n_rooms)]
+    teachers = ["Teacher Name,Courses"]
+    teachers += [f'T{i % max(1, n_teacher_rows // 20)},"C{rng.randrange(n_courses)}, C{rng.randrange(n_courses)}"'
+                 for i in range(n_teacher_rows)]
+    return {name: ("\n".join(lines) + "\n").encode() for name, lines in
+            (("courses", courses), ("rooms", rooms), ("teachers", teachers))}
+
+
+def legacy_build(raw):
+    """The pre-ingestion path: read_csv of the whole buffer, then iterrows per table."""
+    courses_df, rooms_df, teachers_df = (pd.read_csv(io.BytesIO(raw[k])).copy() for k in ("courses", "rooms", "teachers"))
+    col = {f: _col_lookup(list(courses_df.columns), c) for f, c in SCHEMAS["courses"].items()}
+    COURSES = {}
+    for _, r in courses_df.iterrows():
+        cid = str(r[col["code"]]).strip()
+        try:
+            students = int(r[col["students"]])
+        except Exception:
+            students = int(float(r[col["students"]])) if pd.notna(r[col["students"]]) else 0
+        try:
+            hours = int(r[col["hours"]])
+        except Exception:
+            hours = int(float(r[col["hours"]])) if pd.notna(r[col["hours"]]) else 1
+        COURSES[cid] = {
+            "name": str(r[col["name"]]) if pd.notna(r[col["name"]]) else cid,
+            "dept": str(r[col["dept"]]) if pd.notna(r[col["dept"]]) else "",
+            "semester": int(r[col["semester"]]) if pd.notna(r[col["semester"]]) else 1,
+            "students": max(1, students),
+            "hours": max(1, hours)
+        }
+    col = {f: _col_lookup(list(rooms_df.columns), c) for f, c in SCHEMAS["rooms"].items()}
+    ROOMS = {}
+    for _, r in rooms_df.iterrows():
+        try:
+            cap = int(r[col["capacity"]])
+        except Exception:
+            cap = int(float(r[col["capacity"]])) if pd.notna(r[col["capacity"]]) else 0
+        ROOMS[str(r[col["code"]]).strip()] = {"capacity": max(0, cap)}
+    col = {f: _col_lookup(list(teachers_df.columns), c) for f, c in SCHEMAS["teachers"].items()}
+    TEACHERS = defaultdict(lambda: {"courses": []})
+    for _, r in teachers_df.iterrows():
+        raw_codes = r[col["courses"]]
+        if pd.isna(raw_codes):
+            continue
+        for c in (c.strip() for c in str(raw_codes).split(",")):
+            if c:
+                TEACHERS[str(r[col["name"]]).strip()]["courses"].append(c)
+    return COURSES, ROOMS, dict(TEACHERS)
+
+
+def vectorised_build(raw):
+    tables = {k: ingest_csv(k, io.BytesIO(raw[k])) for k in ("courses", "rooms", "teachers")}
+    return build_dicts(tables["courses"], tables["rooms"], tables["teachers"])
+
+
+def best_of(fn, raw, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        out = fn(raw)
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--teachers", type=int, default=100_000)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    raw = synthetic_csvs(args.courses, args.teachers, args.rooms)
+    legacy, legacy_out = best_of(legacy_build, raw, args.rounds)
+    vectorised, vectorised_out = best_of(vectorised_build, raw, args.rounds)
+    same = legacy_out == vectorised_out
+
+    print(f"{'path':<12}{'seconds':>10}", file=sys.stderr)
+    print(f"{'iterrows':<12}{legacy:>10.3f}", file=sys.stderr)
+    print(f"{'vectorised':<12}{vectorised:>10.3f}  ({legacy / vectorised:.1f}x, same dicts: {same})", file=sys.stderr)
+    print(json.dumps({"benchmark": "preprocess", "courses": args.courses, "teacher_rows": args.teachers,
+                      "rooms": args.rooms, "iterrows_seconds": legacy, "vectorised_seconds": vectorised,
+                      "speedup": legacy / vectorised, "same_output": same}))
+
+
+if __name__ == "__main__":
+    main()
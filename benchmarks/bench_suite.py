@@ -0,0 +1,348 @@
+"""
+Benchmark suite: every GA entry point (and the CP-SAT model) on the seeded
+synthetic instances of benchmarks/instances.py.
+
+Targets:
+    generator  app_full/back_end/generator.py (TimetableSolver)
+    backend    backend_api GA: /upload ingestion + build_dicts + run_timetable_ga
+    main       logics/csv_input_approach/main.py
+    cpsat      schedulify.cpsat on the generator.py problem
+
+Each (target, size) runs in its own process, so peak RSS (ru_maxrss) and the
+DEAP classes (main.py registers a two-objective FitnessMin) do not leak between
+runs. Per run it records parse / initialisation / evolution time, evaluations
+per second, the generation (CP-SAT: solution) and time at which the best
+timetable first had no hard violations, the final penalty and the peak RSS.
+Results are JSON, one file per commit, comparable with --baseline.
+
+    python benchmarks/bench_suite.py --sizes small medium --output bench-$(git rev-parse --short HEAD).json
+    python benchmarks/bench_suite.py --targets generator backend --sizes large --baseline bench-old.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from benchmarks.instances import SIZES, generate, summary, to_generator_input, to_upload_csvs, write_main_csvs
+
+TARGETS = ["generator", "backend", "main", "cpsat"]
+
+# Metrics compared against --baseline: name -> True when higher is better
+COMPARED = {"total_seconds": False, "parse_seconds": False, "evals_per_second": True,
+            "seconds_to_feasibility": False, "best_penalty": False, "peak_rss_mb": False}
+
+
+class Recorder:
+    """Collects ProgressMonitor events with their arrival time."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.arrivals: List[float] = []
+
+    def add(self, event: Dict[str, Any]):
+        self.arrivals.append(time.perf_counter())
+        self.events.append(event)
+
+    def progress(self, generation, best_penalty, avg_penalty, **details):
+        self.add(dict(generation=generation, best_penalty=best_penalty, avg_penalty=avg_penalty, **details))
+
+    def metrics(self) -> Dict[str, Any]:
+        if not self.events:
+            return {}
+        first, last = self.events[0], self.events[-1]
+        # The first event's elapsed_seconds is the initial evaluation: everything before it is setup
+        init = self.arrivals[0] - self.started - first["elapsed_seconds"]
+        evaluations = sum(e["evaluations"] for e in self.events)
+        feasible = next((i for i, e in enumerate(self.events) if e["hard"] == 0), None)
+        return {
+            "init_seconds": round(init, 4),
+            "evolve_seconds": round(last["elapsed_seconds"], 4),
+            "evaluations": evaluations,
+            "evals_per_second": round(evaluations / last["elapsed_seconds"], 1) if last["elapsed_seconds"] else None,
+            "generations": last["generation"],
+            "generations_to_feasibility": self.events[feasible]["generation"] if feasible is not None else None,
+            "seconds_to_feasibility": round(self.arrivals[feasible] - self.started, 4) if feasible is not None else None,
+            "hard": last["hard"],
+        }
+
+
+class _StderrEvents(io.TextIOBase):
+    """sys.stderr stand-in: JSON progress lines go to the recorder, anything else through."""
+
+    def __init__(self, recorder: Recorder, stream):
+        self.recorder = recorder
+        self.stream = stream
+        self.buffer_ = ""
+
+    def write(self, text):
+        self.buffer_ += text
+        while "\n" in self.buffer_:
+            line, self.buffer_ = self.buffer_.split("\n", 1)
+            try:
+                event = json.loads(line)
+            except ValueError:
+                event = None
+            if isinstance(event, dict) and "generation" in event:
+                self.recorder.add(event)
+            else:
+                self.stream.write(line + "\n")
+        return len(text)
+
+
+def _load(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_generator(inst, args) -> Dict[str, Any]:
+    generator = _load("generator", os.path.join(ROOT, "app_full", "back_end", "generator.py"))
+    raw = json.dumps(dict(to_generator_input(inst), representation=args.representation, patience=args.patience,
+                          time_budget=args.time_budget, progress=True))
+
+    start = time.perf_counter()
+    data = json.loads(raw)
+    solver = generator.TimetableSolver(pop_size=args.pop, ngen=args.ngen)
+    solver.problem_for(data)
+    parse = time.perf_counter() - start
+
+    recorder = Recorder()
+    with contextlib.redirect_stderr(_StderrEvents(recorder, sys.stderr)):
+        _, fitness, run_info = solver.solve(data)
+    return dict(recorder.metrics(), parse_seconds=round(parse, 4), best_penalty=fitness,
+                stop_reason=run_info["stop_reason"])
+
+
+def run_backend(inst, args) -> Dict[str, Any]:
+    sys.path.insert(0, os.path.join(ROOT, "backend_api"))
+    from ingest import ingest_csv, build_dicts
+    from timetable_ga import build_problem, run_timetable_ga
+
+    raw = to_upload_csvs(inst)
+    start = time.perf_counter()
+    tables = {kind: ingest_csv(kind, io.BytesIO(content)) for kind, content in raw.items()}
+    COURSES, ROOMS, TEACHERS = build_dicts(tables["courses"], tables["rooms"], tables["teachers"])
+    problem = build_problem(COURSES, ROOMS, TEACHERS)
+    parse = time.perf_counter() - start
+
+    recorder = Recorder()
+    result = run_timetable_ga(COURSES, ROOMS, TEACHERS, pop_size=args.pop, ngen=args.ngen,
+                              representation=args.representation, patience=args.patience,
+                              time_budget=args.time_budget, problem=problem, progress=recorder.progress)
+    return dict(recorder.metrics(), parse_seconds=round(parse, 4), best_penalty=result["fitness_penalty_score"],
+                stop_reason=result["stop_reason"])
+
+
+def run_main(inst, args) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix="bench_main_")
+    write_main_csvs(inst, workdir)
+    os.chdir(workdir)
+    # main.py prints its banner / loading steps on stdout, which carries our JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        main = _load("csv_main", os.path.join(ROOT, "logics", "csv_input_approach", "main.py"))
+        from deap import tools
+        from schedulify.evolution import EarlyStopping, ProgressMonitor, ea_simple
+
+        start = time.perf_counter()
+        data = main.SchedulerData()
+        data.load_data()
+        parse = time.perf_counter() - start
+
+        toolbox = main.toolbox
+        toolbox.register("individual", main.create_individual, data.classes_to_schedule, len(data.slots), data)
+        toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+        toolbox.register("evaluate", main.check_constraints, data=data)
+        toolbox.register("mate", tools.cxTwoPoint)
+        toolbox.register("mutate", main.mutate_individual, indpb=0.1, n_slots=len(data.slots), data=data)
+        toolbox.register("select", tools.selTournament, tournsize=3)
+
+        recorder = Recorder()
+        pop = toolbox.population(n=args.pop)
+        stats = tools.Statistics(lambda ind: ind.fitness.values[0])
+        stats.register("avg", lambda values: sum(values) / len(values))
+        # Fitness is (hard penalty, soft): report hard as a count of PENALTY_HARD
+        monitor = ProgressMonitor(recorder.add, breakdown=lambda ind: (int(ind.fitness.values[0] // main.PENALTY_HARD),
+                                                                       int(ind.fitness.values[1])))
+        stopping = EarlyStopping(target=0, patience=args.patience, time_budget=args.time_budget)
+        ea_simple(pop, toolbox, cxpb=0.7, mutpb=0.3, ngen=args.ngen, stats=stats,
+                  on_generation=monitor, early_stopping=stopping)
+    best = tools.selBest(pop, 1)[0]
+    return dict(recorder.metrics(), parse_seconds=round(parse, 4), best_penalty=best.fitness.values[0],
+                stop_reason=stopping.reason)
+
+
+def run_cpsat(inst, args) -> Dict[str, Any]:
+    from schedulify import Problem, FitnessEngine
+    from schedulify.cpsat import solve_cpsat
+    from schedulify.fitness import HARD_PENALTY
+
+    data = to_generator_input(inst)
+    start = time.perf_counter()
+    problem = Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"],
+                      preferences=data["preferences"])
+    parse = time.perf_counter() - start
+
+    solutions = []
+
+    def progress(n, objective, _):
+        solutions.append((n, objective, time.perf_counter()))
+
+    started = time.perf_counter()
+    genes, info = solve_cpsat(problem, time_limit=args.time_budget or 60.0, workers=args.cpsat_workers,
+                              progress=progress)
+    # Clashes are constraints; capacity is the only hard rule left in the objective
+    feasible = next(((n, t) for n, objective, t in solutions if objective < HARD_PENALTY), None)
+    best = float(FitnessEngine(problem).penalties(genes[None])[0]) if genes is not None else None
+    return {
+        "parse_seconds": round(parse, 4),
+        "evolve_seconds": round(info["wall_time"], 4),
+        "generations": info["solutions"],
+        "generations_to_feasibility": feasible[0] if feasible else None,
+        "seconds_to_feasibility": round(feasible[1] - started, 4) if feasible else None,
+        "best_penalty": best,
+        "best_bound": info["best_bound"],
+        "stop_reason": info["stop_reason"],
+    }
+
+
+RUNNERS = {"generator": run_generator, "backend": run_backend, "main": run_main, "cpsat": run_cpsat}
+
+
+def run_one(target: str, size: str, args) -> Dict[str, Any]:
+    inst = generate(size, args.seed)
+    started = time.perf_counter()
+    metrics = RUNNERS[target](inst, args)
+    metrics.update(target=target, size=size, seed=args.seed, instance=summary(inst),
+                   total_seconds=round(time.perf_counter() - started, 4),
+                   peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1))
+    return metrics
+
+
+def _common_args(args) -> List[str]:
+    out = ["--seed", str(args.seed), "--pop", str(args.pop), "--ngen", str(args.ngen),
+           "--patience", str(args.patience), "--representation", args.representation,
+           "--cpsat-workers", str(args.cpsat_workers)]
+    if args.time_budget is not None:
+        out += ["--time-budget", str(args.time_budget)]
+    return out
+
+
+def spawn(target: str, size: str, args) -> Dict[str, Any]:
+    """Runs one (target, size) in a fresh interpreter and returns its metrics."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--one", target, size] + _common_args(args)
+    try:
+        done = subprocess.run(cmd, stdout=subprocess.PIPE, timeout=args.timeout, text=True)
+    except subprocess.TimeoutExpired:
+        return {"target": target, "size": size, "seed": args.seed, "error": f"timeout after {args.timeout}s"}
+    if done.returncode != 0 or not done.stdout.strip():
+        return {"target": target, "size": size, "seed": args.seed, "error": f"exit code {done.returncode}"}
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Summary table columns: (metric, heading, width, format)
+COLUMNS = [("parse_seconds", "parse s", 9, ".3f"), ("init_seconds", "init s", 9, ".3f"),
+           ("evals_per_second", "evals/s", 11, ".0f"), ("generations_to_feasibility", "gen->feas", 10, "d"),
+           ("best_penalty", "best", 10, ".0f"), ("total_seconds", "total s", 9, ".2f"),
+           ("peak_rss_mb", "RSS MB", 9, ".1f")]
+
+
+def print_table(results: List[Dict[str, Any]]):
+    print(f"{'target':<10}{'size':<8}" + "".join(f"{heading:>{width}}" for _, heading, width, _ in COLUMNS),
+          file=sys.stderr)
+    for r in results:
+        if "error" in r:
+            print(f"{r['target']:<10}{r['size']:<8}  {r['error']}", file=sys.stderr)
+            continue
+        cells = [format(r[metric], f">{width}{spec}") if r.get(metric) is not None else f"{'-':>{width}}"
+                 for metric, _, width, spec in COLUMNS]
+        print(f"{r['target']:<10}{r['size']:<8}" + "".join(cells), file=sys.stderr)
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]):
+    """Prints new / old ratios for the COMPARED metrics of runs present in both files."""
+    old = {(r["target"], r["size"]): r for r in baseline.get("results", []) if "error" not in r}
+    print(f"\nvs baseline {baseline.get('commit') or '?'} (ratio new/old, * = worse by more than 10%)",
+          file=sys.stderr)
+    for r in results:
+        before = old.get((r["target"], r["size"]))
+        if before is None or "error" in r:
+            continue
+        cells = []
+        for metric, higher_is_better in COMPARED.items():
+            a, b = r.get(metric), before.get(metric)
+            if a is None or not b:
+                continue
+            ratio = a / b
+            worse = ratio < 0.9 if higher_is_better else ratio > 1.1
+            cells.append(f"{metric}={ratio:.2f}{'*' if worse else ''}")
+        print(f"{r['target']:<10}{r['size']:<8}{' '.join(cells)}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pop", type=int, default=300)
+    parser.add_argument("--ngen", type=int, default=200)
+    parser.add_argument("--patience", type=int, default=50)
+    parser.add_argument("--time-budget", type=float, default=60.0, help="seconds per run (GA and CP-SAT)")
+    parser.add_argument("--representation", choices=["tuple", "array"], default="array",
+                        help="generator / backend chromosome")
+    parser.add_argument("--cpsat-workers", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=900, help="seconds before a run is killed")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="results JSON of an earlier commit to compare against")
+    parser.add_argument("--one", nargs=2, metavar=("TARGET", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        # Child process: one run, metrics as the last stdout line
+        print(json.dumps(run_one(*args.one, args)))
+        return
+
+    results = []
+    for size in args.sizes:
+        for target in args.targets:
+            print(f"[{target} / {size}]", file=sys.stderr)
+            results.append(spawn(target, size, args))
+    report = {"benchmark": "suite", "commit": git_commit(), "python": platform.python_version(),
+              "machine": platform.machine(), "cpus": os.cpu_count(), "settings": {k: v for k, v in vars(args).items() if k != "one"},
+              "results": results}
+
+    print_table(results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
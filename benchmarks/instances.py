@@ -0,0 +1,218 @@
+"""
+Seeded synthetic university instances for the benchmarks.
+
+``generate(size, seed)`` builds one instance: departments x semesters x
+sections (student groups, split into lab batches of LAB_BATCH_SIZE), courses
+per group with lecture hours and optional practicals, classrooms and
+department labs, teachers with their course lists and a share of teachers
+with preferred slots / rooms. The same seed always gives the same instance.
+
+Each entry point takes its own input format:
+
+    to_generator_input(inst)   JSON request for app_full/back_end/generator.py
+    to_upload_csvs(inst)       courses / rooms / teachers CSV bytes for /upload
+    write_main_csvs(inst, d)   groups / rooms / courses / constraints CSVs for
+                               logics/csv_input_approach/main.py
+
+generator.py and /generate identify a student group by (dept, semester), so
+sections are folded into ``dept`` there ("CSE/B"); practicals only exist for
+main.py.
+
+    python benchmarks/instances.py medium --seed 1 --format upload --out /tmp/medium
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+HOURS = [9, 10, 11, 12, 14, 15, 16, 17]
+TIMESLOTS = [f"{d}_{h:02d}-{h + 1:02d}" for d in DAYS for h in HOURS]
+
+LAB_BATCH_SIZE = 30
+
+# size -> departments, semesters per department, sections per semester, courses per section
+SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"departments": 2, "semesters": 2, "sections": 1, "courses": 4},
+    "medium": {"departments": 4, "semesters": 4, "sections": 1, "courses": 5},
+    "large": {"departments": 8, "semesters": 4, "sections": 2, "courses": 6},
+    "xl": {"departments": 16, "semesters": 4, "sections": 3, "courses": 6},
+}
+
+DEPARTMENT_NAMES = ["CSE", "ECE", "ME", "CE", "EE", "CHE", "BT", "PH", "MA", "CY", "HS", "IT", "MT", "AE", "IP", "TT"]
+SECTIONS = "ABCDEFGH"
+ROOM_STEP = 15
+
+# Share of teachers with preferences, of courses with a practical, of courses with a time constraint
+PREFERENCE_SHARE = 0.3
+PRACTICAL_SHARE = 0.3
+CONSTRAINT_SHARE = 0.05
+
+
+def generate(size: str, seed: int = 0) -> Dict[str, Any]:
+    """The canonical instance for ``size`` (a SIZES key) as plain lists / dicts."""
+    spec = SIZES[size]
+    rng = random.Random(seed)
+    departments = DEPARTMENT_NAMES[:spec["departments"]]
+    semesters = [2 * i + 1 for i in range(spec["semesters"])]
+
+    groups, courses = [], []
+    for dept in departments:
+        for sem in semesters:
+            for section in SECTIONS[:spec["sections"]]:
+                strength = rng.randint(40, 120)
+                group = {"id": f"{dept}_{sem}_{section}", "dept": dept, "semester": sem, "section": section,
+                         "degree": "BTech", "strength": strength,
+                         "batches": math.ceil(strength / LAB_BATCH_SIZE)}
+                groups.append(group)
+                for k in range(spec["courses"]):
+                    courses.append({
+                        "code": f"{dept}{sem}{k + 1:02d}{section}",
+                        "name": f"{dept} course {sem}.{k + 1}",
+                        "dept": dept, "semester": sem, "group": group["id"], "students": strength,
+                        "hours": rng.randint(2, 4),
+                        "practical": rng.random() < PRACTICAL_SHARE,
+                    })
+
+    # Classrooms: room-slots for every lecture hour with ~50% slack. Capacities follow
+    # the lecture sizes (room i fits every lecture but the i / n_rooms largest, rounded
+    # up to ROOM_STEP), so seating never makes an instance infeasible. Two labs per department.
+    sizes = sorted((c["students"] for c in courses for _ in range(c["hours"])), reverse=True)
+    n_rooms = max(2, math.ceil(1.5 * len(sizes) / len(TIMESLOTS)))
+    rooms = [{"code": f"LH-{i + 1}", "capacity": ROOM_STEP * math.ceil(sizes[i * len(sizes) // n_rooms] / ROOM_STEP),
+              "dept": "general", "type": "classroom"} for i in range(n_rooms)]
+    for dept in departments:
+        rooms += [{"code": f"{dept}-LAB{i + 1}", "capacity": LAB_BATCH_SIZE + 10, "dept": dept, "type": "lab"}
+                  for i in range(2)]
+
+    # Teachers: about 15 lecture hours each within their department; every course gets
+    # one teacher, and a second qualified teacher for a third of them
+    teachers = []
+    for dept in departments:
+        dept_courses = [c for c in courses if c["dept"] == dept]
+        n_teachers = max(1, math.ceil(sum(c["hours"] for c in dept_courses) / 15))
+        staff = [{"name": f"PROF_{dept}_{i + 1}", "dept": dept, "courses": []} for i in range(n_teachers)]
+        for i, course in enumerate(dept_courses):
+            staff[i % n_teachers]["courses"].append(course["code"])
+            if n_teachers > 1 and rng.random() < 1 / 3:
+                staff[(i + 1 + rng.randrange(n_teachers - 1)) % n_teachers]["courses"].append(course["code"])
+        teachers += staff
+    for course in courses:
+        course["teachers"] = [t["name"] for t in teachers if course["code"] in t["courses"]]
+
+    classrooms = [r["code"] for r in rooms if r["type"] == "classroom"]
+    preferences = {}
+    for teacher in teachers:
+        if rng.random() < PREFERENCE_SHARE:
+            preferences[teacher["name"]] = {
+                "preferred_rooms": rng.sample(classrooms, min(3, len(classrooms))) if rng.random() < 0.5 else [],
+                "preferred_slots": rng.sample(TIMESLOTS, 20),
+            }
+
+    return {"size": size, "seed": seed, "departments": departments, "groups": groups, "courses": courses,
+            "rooms": rooms, "teachers": teachers, "preferences": preferences, "timeslots": TIMESLOTS}
+
+
+def _group_dept(inst: Dict[str, Any], course: Dict[str, Any]) -> str:
+    # (dept, semester) is the student group in these formats: keep sections apart
+    if SIZES[inst["size"]]["sections"] == 1:
+        return course["dept"]
+    return f"{course['dept']}/{course['group'].rsplit('_', 1)[1]}"
+
+
+def to_generator_input(inst: Dict[str, Any]) -> Dict[str, Any]:
+    """Request dict for generator.py (representation / engine / ... can be added by the caller)."""
+    return {
+        "courses": {c["code"]: {"name": c["name"], "dept": _group_dept(inst, c), "semester": c["semester"],
+                                "students": c["students"], "hours": c["hours"]} for c in inst["courses"]},
+        "teachers": {t["name"]: {"courses": list(t["courses"])} for t in inst["teachers"]},
+        "rooms": {r["code"]: {"capacity": r["capacity"]} for r in inst["rooms"] if r["type"] == "classroom"},
+        "timeslots": list(inst["timeslots"]),
+        "preferences": inst["preferences"],
+    }
+
+
+def _csv(header: List[str], rows: List[List[Any]]) -> bytes:
+    def cell(value):
+        text = str(value)
+        return f'"{text}"' if "," in text else text
+    return ("\n".join([",".join(header)] + [",".join(cell(v) for v in row) for row in rows]) + "\n").encode()
+
+
+def to_upload_csvs(inst: Dict[str, Any]) -> Dict[str, bytes]:
+    """courses / rooms / teachers CSV bytes in the column layout /upload expects."""
+    return {
+        "courses": _csv(["Course Code", "Course Name", "Department", "Semester", "Students", "Hours"],
+                        [[c["code"], c["name"], _group_dept(inst, c), c["semester"], c["students"], c["hours"]]
+                         for c in inst["courses"]]),
+        "rooms": _csv(["Room Code", "Capacity"],
+                      [[r["code"], r["capacity"]] for r in inst["rooms"] if r["type"] == "classroom"]),
+        "teachers": _csv(["Teacher Name", "Courses"],
+                         [[t["name"], ", ".join(t["courses"])] for t in inst["teachers"] if t["courses"]]),
+    }
+
+
+def write_main_csvs(inst: Dict[str, Any], directory: str):
+    """groups.csv / rooms.csv / courses.csv / constraints.csv for csv_input_approach/main.py."""
+    rng = random.Random(inst["seed"])
+    os.makedirs(directory, exist_ok=True)
+    # main.py names a group by degree + semester + group name, so the name carries dept and section
+    names = {g["id"]: f"{g['dept']}{g['section']}" for g in inst["groups"]}
+    files = {
+        "groups.csv": _csv(["group name", "semester", "degree", "strength"],
+                           [[names[g["id"]], g["semester"], g["degree"], g["strength"]] for g in inst["groups"]]),
+        "rooms.csv": _csv(["room no.", "capacity", "department", "room_type"],
+                          [[r["code"], r["capacity"], r["dept"] if r["type"] == "lab" else "General",
+                            "Lab" if r["type"] == "lab" else "Classroom"] for r in inst["rooms"]]),
+        "courses.csv": _csv(["course_code", "name", "department", "semester", "group", "no_of_hours",
+                             "is_there_a_practical", "degree", "practical_room"],
+                            [[c["code"], c["name"], c["dept"], c["semester"], names[c["group"]], c["hours"],
+                              "Yes" if c["practical"] else "No", "BTech", ""] for c in inst["courses"]]),
+        "constraints.csv": _csv(["constraint_level", "entity_name", "group_name", "preferred_time", "preferred_room"],
+                                [["Course", c["code"], names[c["group"]], rng.choice(["Monday", "Tuesday", "10:00"]),
+                                  ""] for c in inst["courses"] if rng.random() < CONSTRAINT_SHARE]),
+    }
+    for name, content in files.items():
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(content)
+
+
+def summary(inst: Dict[str, Any]) -> Dict[str, int]:
+    return {"departments": len(inst["departments"]), "groups": len(inst["groups"]),
+            "courses": len(inst["courses"]), "lectures": sum(c["hours"] for c in inst["courses"]),
+            "practicals": sum(c["practical"] for c in inst["courses"]), "rooms": len(inst["rooms"]),
+            "teachers": len(inst["teachers"])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("size", choices=list(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["generator", "upload", "main"], default="generator")
+    parser.add_argument("--out", help="output directory (upload / main) or file (generator); default stdout")
+    args = parser.parse_args()
+
+    inst = generate(args.size, args.seed)
+    print(json.dumps(summary(inst)), file=sys.stderr)
+    if args.format == "generator":
+        text = json.dumps(to_generator_input(inst))
+        if args.out:
+            with open(args.out, "w") as f:
+                f.write(text)
+        else:
+            print(text)
+    elif args.format == "upload":
+        os.makedirs(args.out or ".", exist_ok=True)
+        for kind, content in to_upload_csvs(inst).items():
+            with open(os.path.join(args.out or ".", f"{kind}.csv"), "wb") as f:
+                f.write(content)
+    else:
+        write_main_csvs(inst, args.out or ".")
+
+
+if __name__ == "__main__":
+    main()
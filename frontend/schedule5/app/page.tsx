@@ -12,6 +12,10 @@ import axios from "axios"
 import BASE_URL  from "../data.js"
 import { toast } from "sonner"
 
+// Polling of a /generate job: once a second, for at most 15 minutes
+const JOB_POLL_MS = 1000
+const MAX_JOB_POLLS = 900
+
 export default function Home() {
   const [teachersFile, setTeachersFile] = useState<File | null>(null)
   const [coursesFile, setCoursesFile] = useState<File | null>(null)
@@ -52,6 +56,27 @@ export default function Home() {
       const respast  = await axios.post(`${BASE_URL}/generate`) ;
 
       console.log(respast) ;
+
+      // /generate only starts a background job: poll it until it finishes
+      if (respast.data.error || !respast.data.job_id) {
+        toast.error(respast.data.error ?? "Timetable generation could not be started.")
+        return
+      }
+      const jobId = respast.data.job_id
+      let job = respast.data
+      let polls = 0
+      while (job.status !== "completed") {
+        if (job.error || job.status === "failed" || job.status === "cancelled") {
+          toast.error(job.error ?? `Timetable generation ${job.status}.`)
+          return
+        }
+        if (polls++ >= MAX_JOB_POLLS) {
+          toast.error("Timetable generation is taking too long; try again later.")
+          return
+        }
+        await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS))
+        job = (await axios.get(`${BASE_URL}/jobs/${jobId}`)).data
+      }
       // const response11 = await axios.get(
       //   `${BASE_URL}/timetable-json`,
        
@@ -1,9 +1,16 @@
 import pandas as pd
 import random
 import numpy as np
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 import math
 import os
+import sys
+from functools import partial
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from schedulify.parallel import ParallelEvaluator
+from schedulify.evolution import EarlyStopping, ea_simple
+from schedulify.cache import DatasetCache, content_key, stream_digest
 
 # ==========================================
 # 1. CONFIGURATION
@@ -18,6 +25,8 @@ LAB_BATCH_SIZE = 30
 PENALTY_HARD = 10000 
 PENALTY_SOFT = 1      
 
+INPUT_FILES = ['groups.csv', 'rooms.csv', 'courses.csv', 'constraints.csv']
+
 TOTAL_HOURS = END_TIME - START_TIME
 SLOT_DURATION_HOURS = TOTAL_HOURS / NUM_SLOTS
 
@@ -39,12 +48,37 @@ class SchedulerData:
         self.room_id_map = {} 
         self.room_indices = {} 
         self.room_id_to_idx = {}
+        self.time_constrained = set()
+        self.time_violations = {}
+        self.valid_rooms = {}
 
     def clean_str(self, s):
         """Standardizes strings to lowercase and stripped."""
         return str(s).strip().lower() if pd.notna(s) else ""
 
-    def load_data(self):
+    def load_data(self, cache=None):
+        """
+        Parses the CSVs in the working directory. With a DatasetCache, a folder whose
+        files (and slot configuration) hash the same as a previous run is restored
+        from the cache instead of being parsed again.
+        """
+        if cache is not None:
+            files = [name for name in INPUT_FILES if os.path.exists(name)]
+            raw = []
+            for name in files:
+                with open(name, 'rb') as f:
+                    raw.append(name.encode() + b"\0" + stream_digest(f))
+            config = f"{WORKING_DAYS}:{START_TIME}:{END_TIME}:{NUM_SLOTS}:{LUNCH_START}:{LAB_BATCH_SIZE}"
+            key = content_key(*raw, namespace=f"scheduler_data:{config}")
+            state = cache.get(key)
+            if state is not None:
+                print(f"\n[cache] Loaded parsed data ({', '.join(files)}) from cache.")
+                self.__dict__.update(state)
+                return
+            self.load_data()
+            cache.put(key, dict(self.__dict__))
+            return
+
         def read_excel_csv(filename):
             return pd.read_csv(filename, encoding='cp1252')
 
@@ -167,9 +201,62 @@ class SchedulerData:
                 df_cons.columns = [c.strip().lower() for c in df_cons.columns]
                 self.constraints = df_cons.to_dict('records')
             except: pass
+        self.compile_constraints()
+        self.index_valid_rooms()
+
+    # --- CONSTRAINT INDEX ---
+    def compile_constraints(self):
+        """
+        Turns the course-level rows of constraints.csv into lookups for check_constraints:
+          time_constrained: courses with a preferred_time (exempt from the lunch rule)
+          time_violations[(course, slots_required)][start_slot]: number of preferred_time
+            constraints that start slot breaks (0 = allowed)
+        """
+        self.time_constrained = set()
+        self.time_violations = {}
+        preferred = {}
+        for constr in self.constraints:
+            level = str(constr.get('constraint_level', ''))
+            course = str(constr.get('entity_name', '')).strip()
+            if level.strip().lower() != 'course' or not pd.notna(constr.get('preferred_time')):
+                continue
+            self.time_constrained.add(course)
+            pref_time = str(constr.get('preferred_time', ''))
+            if level.lower() == 'course' and pref_time.strip() != "":
+                preferred.setdefault(course, []).append(pref_time)
+
+        durations = {c['slots_required'] for c in self.classes_to_schedule}
+        for course, pref_times in preferred.items():
+            for slots_required in durations:
+                self.time_violations[(course, slots_required)] = [
+                    sum(1 for pref_time in pref_times
+                        if pref_time.lower() not in day.lower()
+                        and pref_time not in get_time_str(slot_idx, slots_required))
+                    for slot_idx, (day, _) in enumerate(self.slots)
+                ]
 
     # --- VALID ROOM FINDER ---
+    def room_signature(self, c_info):
+        """Everything get_valid_rooms depends on: (type, dept, needed capacity, forced room)."""
+        g_id = c_info['group']
+        needed = self.groups[g_id]['strength'] if c_info['sub_batch'] == 'All' else self.groups[g_id]['batch_strength']
+        return (c_info['type'], c_info['dept'], needed, c_info['forced_room_idx'])
+
+    def index_valid_rooms(self):
+        """Scans the rooms once per distinct signature among the sessions."""
+        self.valid_rooms = {}
+        for c in self.classes_to_schedule:
+            self.get_valid_rooms(c)
+
     def get_valid_rooms(self, c_info):
+        """Indices of the rooms a session may use, as a cached NumPy array."""
+        key = self.room_signature(c_info)
+        valid = self.valid_rooms.get(key)
+        if valid is None:
+            valid = self.valid_rooms[key] = np.array(self._scan_valid_rooms(c_info), dtype=np.int64)
+        return valid
+
+    def _scan_valid_rooms(self, c_info):
         if c_info['forced_room_idx'] is not None: return [c_info['forced_room_idx']]
             
         c_type = c_info['type']
@@ -203,7 +290,7 @@ def create_individual(classes, n_slots, data):
     for c in classes:
         slot = random.randint(0, n_slots - 1)
         valid = data.get_valid_rooms(c)
-        room = random.choice(valid) if valid else random.randint(0, len(data.rooms)-1)
+        room = int(random.choice(valid)) if len(valid) else random.randint(0, len(data.rooms)-1)
         gene.append((slot, room))
     return creator.Individual(gene)
 
@@ -215,17 +302,21 @@ def mutate_individual(individual, indpb, n_slots, data):
                 new_room = c['forced_room_idx']
             else:
                 valid = data.get_valid_rooms(c)
-                new_room = random.choice(valid) if valid else individual[i][1]
+                new_room = int(random.choice(valid)) if len(valid) else individual[i][1]
             new_slot = random.randint(0, n_slots - 1)
             individual[i] = (new_slot, new_room)
     return individual,
 
 def check_constraints(individual, data, report_mode=False):
+    # Occupancy as bitmasks, one mask per day, one bit per slot: the bounds check keeps every
+    # placed lecture inside the start slot's day, so bit = slot_idx.
+    # group_occ[g_id] = [whole-group mask, {batch: mask}], room_occ[room] = mask
     hard = 0
     soft = 0
     group_occ = {} 
     room_occ = {}
     report_lines = []
+    lunch_bit = 1 << data.lunch_slot_index
     
     for idx, (slot_idx, room_idx) in enumerate(individual):
         c = data.classes_to_schedule[idx]
@@ -236,45 +327,39 @@ def check_constraints(individual, data, report_mode=False):
             if report_mode: report_lines.append(f"Hard: {c['course']} exceeds day bounds.")
             continue 
             
-        time_range = range(slot_idx, slot_idx + c['slots_required'])
-        day = data.slots[slot_idx][0]
+        # Slots slot_idx .. slot_idx + slots_required - 1 of the start slot's day
+        mask = ((1 << c['slots_required']) - 1) << slot_idx
         
-        # User Time Constraint Check
-        has_time_constraint = False
-        for constr in data.constraints:
-             if str(constr.get('constraint_level', '')).strip().lower() == 'course' and \
-                str(constr.get('entity_name', '')).strip() == c['course']:
-                     if pd.notna(constr.get('preferred_time')): has_time_constraint = True
+        # User Time Constraint Check (precompiled in SchedulerData.compile_constraints)
+        has_time_constraint = c['course'] in data.time_constrained
 
         # 2. Lunch
-        if data.lunch_slot_index in time_range and not has_time_constraint:
+        if mask & lunch_bit and not has_time_constraint:
              hard += PENALTY_HARD
 
         # 3. Group Conflicts
         g_id = c['group']
         batch = c['sub_batch']
-        t_keys = [(day, t) for t in time_range]
-        
-        if g_id not in group_occ: group_occ[g_id] = {'All': set(), 'Batches': {}}
+        occ = group_occ.get(g_id)
+        if occ is None: occ = group_occ[g_id] = [0, {}]
+        batches = occ[1]
         
-        for t_key in t_keys:
-            if batch == 'All':
-                if t_key in group_occ[g_id]['All']: hard += PENALTY_HARD
-                for b_set in group_occ[g_id]['Batches'].values():
-                    if t_key in b_set: hard += PENALTY_HARD
-                group_occ[g_id]['All'].add(t_key)
-            else:
-                if t_key in group_occ[g_id]['All']: hard += PENALTY_HARD
-                if batch not in group_occ[g_id]['Batches']: group_occ[g_id]['Batches'][batch] = set()
-                if t_key in group_occ[g_id]['Batches'][batch]: hard += PENALTY_HARD
-                group_occ[g_id]['Batches'][batch].add(t_key)
+        if batch == 'All':
+            # Clashes with the whole group and with every batch already placed there
+            clashes = (mask & occ[0]).bit_count()
+            for b_mask in batches.values():
+                clashes += (mask & b_mask).bit_count()
+            occ[0] |= mask
+        else:
+            b_mask = batches.get(batch, 0)
+            clashes = (mask & occ[0]).bit_count() + (mask & b_mask).bit_count()
+            batches[batch] = b_mask | mask
+        hard += PENALTY_HARD * clashes
 
         # 4. Room Conflicts
-        r_id = room_idx
-        if r_id not in room_occ: room_occ[r_id] = set()
-        for t_key in t_keys:
-            if t_key in room_occ[r_id]: hard += PENALTY_HARD
-            room_occ[r_id].add(t_key)
+        r_mask = room_occ.get(room_idx, 0)
+        hard += PENALTY_HARD * (mask & r_mask).bit_count()
+        room_occ[room_idx] = r_mask | mask
             
         # 5. Lock Verification
         if c['forced_room_idx'] is not None:
@@ -283,13 +368,9 @@ def check_constraints(individual, data, report_mode=False):
                 if report_mode: report_lines.append(f"Hard: {c['course']} not in locked room.")
 
         # Constraints
-        current_time_str = get_time_str(slot_idx, c['slots_required'])
-        for constr in data.constraints:
-            if str(constr.get('constraint_level', '')).lower() == 'course' and str(constr.get('entity_name', '')).strip() == c['course']:
-                pref_time = str(constr.get('preferred_time', ''))
-                if pd.notna(constr.get('preferred_time')) and pref_time.strip() != "":
-                    if pref_time.lower() not in day.lower() and pref_time not in current_time_str:
-                         hard += PENALTY_HARD
+        violations = data.time_violations.get((c['course'], c['slots_required']))
+        if violations is not None:
+            hard += PENALTY_HARD * violations[slot_idx]
 
     if report_mode: return hard, soft, report_lines
     return hard, soft
@@ -304,7 +385,10 @@ def get_time_str(slot_num, slots_req=1):
 # ==========================================
 if __name__ == "__main__":
     data = SchedulerData()
-    data.load_data()
+    # Optional: --cache-dir DIR keeps the parsed CSVs there, keyed by their content hash
+    # (pickles: DIR must be private to this user, see schedulify/cache.py)
+    cache_dir = sys.argv[sys.argv.index('--cache-dir') + 1] if '--cache-dir' in sys.argv else None
+    data.load_data(cache=DatasetCache(directory=cache_dir) if cache_dir else None)
     
     if not data.classes_to_schedule:
         print("No classes loaded.")
@@ -317,6 +401,13 @@ if __name__ == "__main__":
     toolbox.register("mutate", mutate_individual, indpb=0.1, n_slots=len(data.slots), data=data)
     toolbox.register("select", tools.selTournament, tournsize=3)
 
+    # Optional: --workers N evaluates each generation in a process pool.
+    # SchedulerData is sent to every worker once, then only individuals travel.
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 0
+    parallel = ParallelEvaluator(partial(check_constraints, data=data), processes=workers) if workers > 1 else None
+    if parallel:
+        toolbox.register("map", parallel.map)
+
     print("\n[Algorithm] Optimizing (Single Run - 500 Gens)...")
     
     # SINGLE ITERATION CONFIG
@@ -325,12 +416,19 @@ if __name__ == "__main__":
     
     best_overall = None
     
+    # Stop at 0 hard conflicts, after --patience generations without improvement (default 50)
+    # or after --time-budget seconds, instead of always running all GENERATIONS.
+    patience = int(sys.argv[sys.argv.index('--patience') + 1]) if '--patience' in sys.argv else 50
+    time_budget = float(sys.argv[sys.argv.index('--time-budget') + 1]) if '--time-budget' in sys.argv else None
+    stopping = EarlyStopping(target=0, patience=patience, time_budget=time_budget)
+    
     for attempt in range(1, MAX_ATTEMPTS + 1):
         print(f" Attempt {attempt}...", end="\r")
         pop = toolbox.population(n=300)
         
-        # Use simple EA loop or custom? Using algorithms.eaSimple for standard approach
-        pop, log = algorithms.eaSimple(pop, toolbox, cxpb=0.7, mutpb=0.3, ngen=GENERATIONS, verbose=True)
+        pop, log = ea_simple(pop, toolbox, cxpb=0.7, mutpb=0.3, ngen=GENERATIONS,
+                             early_stopping=stopping, verbose=True)
+        print(f"\n[Stopped] {stopping.reason} after {stopping.generation} generations.")
         
         best = tools.selBest(pop, 1)[0]
         score = best.fitness.values[0]
@@ -342,10 +440,14 @@ if __name__ == "__main__":
         else:
             print(f"\n[Finished] Run completed with {int(score/PENALTY_HARD)} hard conflicts.")
 
+    if parallel:
+        parallel.close()
+
     # Export
     # Generate CSVs
     h, s, logs = check_constraints(best_overall, data, report_mode=True)
     with open("Conflicts_Report.txt", "w") as f:
+        f.write(f"Stop reason: {stopping.reason} (generation {stopping.generation})\n")
         if h == 0: f.write("SUCCESS.\n")
         else:
             f.write(f"FAILURE: {int(h/PENALTY_HARD)} Conflicts.\n")
@@ -1,3 +1,5 @@
+import os
+import sys
 import random
 import numpy as np
 from collections import defaultdict
@@ -5,6 +7,10 @@ from collections import defaultdict
 # DEAP: Distributed Evolutionary Algorithms in Python
 from deap import base, creator, tools, algorithms
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from schedulify import Problem, FitnessEngine, register_types
+from schedulify.chromosome import init_population, cx_two_point, mutate_genes
+
 # --- 1. Define Your Data Structures (Fully updated from PDF Schedule) ---
 
 # Departments and the semesters running in each
@@ -254,8 +260,8 @@ def evaluate_timetable(individual):
 
 # --- 3. Configure the Genetic Algorithm with DEAP ---
 
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
+# FitnessMin, Individual and ArrayIndividual (--array), shared with the other entry points
+register_types()
 
 toolbox = base.Toolbox()
 
@@ -300,6 +306,21 @@ def mutate_timetable(individual, indpb):
 
 toolbox.register("mutate", mutate_timetable, indpb=0.1)
 
+def use_array_representation():
+    """
+    Switches the toolbox to compact (n_lectures, 3) int-array individuals
+    (run with --array). Same rules, scored by the NumPy engine; returns the
+    Problem used to decode the result back into (course, teacher, room, slot) tuples.
+    """
+    problem = Problem(COURSES, TEACHERS, ROOMS, TIMESLOTS)
+    engine = FitnessEngine(problem, hard_penalty=1)
+    toolbox.register("population", init_population, creator.ArrayIndividual, problem)
+    toolbox.register("evaluate", engine.evaluate)
+    toolbox.register("map", engine.map)
+    toolbox.register("mate", cx_two_point)
+    toolbox.register("mutate", mutate_genes, problem=problem, indpb=0.1)
+    return problem
+
 # --- 4. Display Functions ---
 
 def display_timetable(timetable, title="CENTRALIZED MASTER TIMETABLE"):
@@ -347,8 +368,10 @@ def main():
     NGEN = 800 # Increased generations
 
     print("Setting up Genetic Algorithm with data from PDF...")
+    problem = use_array_representation() if "--array" in sys.argv else None
     pop = toolbox.population(n=POP_SIZE)
-    hof = tools.HallOfFame(1)
+    # '==' on array individuals is element-wise, so compare them with array_equal
+    hof = tools.HallOfFame(1, similar=np.array_equal) if problem else tools.HallOfFame(1)
     stats = tools.Statistics(lambda ind: ind.fitness.values)
     stats.register("avg", np.mean)
     stats.register("min", np.min)
@@ -359,8 +382,8 @@ def main():
                         stats=stats, halloffame=hof, verbose=True)
 
     if hof:
-        best_timetable = hof[0]
-        fitness_score = best_timetable.fitness.values[0]
+        best_timetable = problem.decode(hof[0]) if problem else hof[0]
+        fitness_score = hof[0].fitness.values[0]
         
         print("\nEvolution finished.")
         print(f"Best Timetable Fitness (Penalty Score): {fitness_score}")
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from ortools.sat.python import cp_model
 # Problem data
 days = ["Mon", "Tue", "Wed", "Thu", "Fri"]
@@ -33,112 +34,93 @@ for si, subj in enumerate(subjects):
 
 hours_per_subject = {s: 4 for s in subjects}
 slots_required = {s: hours_per_subject[s] // 2 for s in subjects}
-# Model
-model = cp_model.CpModel()
+# Room capacity / type and section strength. A (section, room) pair is only
+# modelled if the room is big enough and of the type the subject needs
+# (subjects missing from subject_room_type can use any room).
+section_strength = {sec: 60 for sec in sections}
+room_capacity = {room: 60 for room in rooms}
+room_type = {room: "lecture" for room in rooms}
+subject_room_type = {}
+
+
+def build_model():
+    """
+    Creates only the feasible x[d, t, sec, room, teacher] variables and files
+    each one under its constraint groups while creating it, so every
+    constraint block below is a single pass over its group instead of a
+    re-scan of the full day x time x section x room x teacher product.
+    """
+    model = cp_model.CpModel()
+    slots = {}
+    by_section = defaultdict(list)           # (d, t, sec)       -> vars
+    by_teacher = defaultdict(list)           # (d, t, teacher)   -> vars
+    by_room = defaultdict(list)              # (d, t, room)      -> vars
+    by_subject = defaultdict(list)           # (sec, subj)       -> vars
+    by_subject_day = defaultdict(list)       # (sec, subj, d)    -> vars
+
+    # Prune up front: rooms each (section, subject) may use
+    usable_rooms = {
+        (sec, subj): [room for room in rooms
+                      if room_capacity[room] >= section_strength[sec]
+                      and subject_room_type.get(subj, room_type[room]) == room_type[room]]
+        for sec in sections for subj in subjects
+    }
+
+    for teacher in teacher_list:
+        subj = teachers[teacher]
+        # Only create var if teacher is allowed to teach this section
+        for sec in teacher_sections[teacher]:
+            for room in usable_rooms[sec, subj]:
+                for d in days:
+                    for t in time_slots:
+                        name = f"{d}_{t}_{sec}_{room}_{teacher}_{subj}"
+                        var = model.NewBoolVar(name)
+                        slots[(d, t, sec, room, teacher)] = var
+                        by_section[d, t, sec].append(var)
+                        by_teacher[d, t, teacher].append(var)
+                        by_room[d, t, room].append(var)
+                        by_subject[sec, subj].append(var)
+                        by_subject_day[sec, subj, d].append(var)
+
+    groups = {"section": by_section, "teacher": by_teacher, "room": by_room,
+              "subject": by_subject, "subject_day": by_subject_day}
+    return model, slots, groups
+
 
-# Create variables:
+# Model
 # x[d, t, sec, room, teacher] = 1 if teacher teaches (their subject) to section 'sec'
 # at day d and time t in room.
-slots = {}
-for d in days:
-    for t in time_slots:
-        for sec in sections:
-            for room in rooms:
-                for teacher in teacher_list:
-                    # Only create var if teacher is allowed to teach this section
-                    if sec in teacher_sections[teacher]:
-                        subj = teachers[teacher]
-                        name = f"{d}_{t}_{sec}_{room}_{teacher}_{subj}"
-                        slots[(d, t, sec, room, teacher)] = model.NewBoolVar(name)
+model, slots, groups = build_model()
 
 # Constraints
 
 # 1) Each section can have at most 1 class in a given (day, time)
-for d in days:
-    for t in time_slots:
-        for sec in sections:
-            terms = []
-            for room in rooms:
-                for teacher in teacher_list:
-                    key = (d, t, sec, room, teacher)
-                    if key in slots:
-                        terms.append(slots[key])
-            model.Add(sum(terms) <= 1)
-
 # 2) A teacher can teach at most 1 class at a given (day, time)
-for d in days:
-    for t in time_slots:
-        for teacher in teacher_list:
-            terms = []
-            for sec in sections:
-                # teacher may only teach certain sections, but check presence
-                for room in rooms:
-                    key = (d, t, sec, room, teacher)
-                    if key in slots:
-                        terms.append(slots[key])
-            model.Add(sum(terms) <= 1)
-
 # 3) A room can host at most 1 class at a given (day, time)
-for d in days:
-    for t in time_slots:
-        for room in rooms:
-            terms = []
-            for sec in sections:
-                for teacher in teacher_list:
-                    key = (d, t, sec, room, teacher)
-                    if key in slots:
-                        terms.append(slots[key])
-            model.Add(sum(terms) <= 1)
+for family in ("section", "teacher", "room"):
+    for terms in groups[family].values():
+        model.Add(sum(terms) <= 1)
 
 # 4) Each subject must get the required number of 2-hour slots per section per week
+#    (every section needs each subject, even if no variable survived pruning)
 for sec in sections:
     for subj in subjects:
-        terms = []
-        for d in days:
-            for t in time_slots:
-                for room in rooms:
-                    for teacher in teacher_list:
-                        # only include variables where this teacher teaches subj and can teach this section
-                        if teachers[teacher] == subj:
-                            key = (d, t, sec, room, teacher)
-                            if key in slots:
-                                terms.append(slots[key])
         # equality ensures exact required slots (e.g., 2)
-        model.Add(sum(terms) == slots_required[subj])
+        model.Add(sum(groups["subject"][sec, subj]) == slots_required[subj])
 
 # 5) Prevent same subject twice for same section on same day
-
-for sec in sections:
-    for subj in subjects:
-        for d in days:
-            terms = []
-            for t in time_slots:
-                for room in rooms:
-                    for teacher in teacher_list:
-                        if teachers[teacher] == subj:
-                            key = (d, t, sec, room, teacher)
-                            if key in slots:
-                                terms.append(slots[key])
-            model.Add(sum(terms) <= 1)
+for terms in groups["subject_day"].values():
+    model.Add(sum(terms) <= 1)
 
 # 6) No consecutive classes for a teacher on same day (teacher needs a break)
 #    For each adjacent pair of time slots (t_i, t_{i+1}) ensure teacher not assigned in both.
 for d in days:
     for teacher in teacher_list:
-        for i in range(len(time_slots) - 1):
-            t1 = time_slots[i]
-            t2 = time_slots[i + 1]
-            terms = []
-            for sec in sections:
-                for room in rooms:
-                    k1 = (d, t1, sec, room, teacher)
-                    k2 = (d, t2, sec, room, teacher)
-                    if k1 in slots:
-                        terms.append(slots[k1])
-                    if k2 in slots:
-                        terms.append(slots[k2])
+        for t1, t2 in zip(time_slots, time_slots[1:]):
+            terms = groups["teacher"][d, t1, teacher] + groups["teacher"][d, t2, teacher]
             # at most one of the adjacent slots for this teacher on this day
-            model.Add(sum(terms) <= 1)
+            if terms:
+                model.Add(sum(terms) <= 1)
 
 # Solve
 solver = cp_model.CpSolver()
@@ -150,6 +132,9 @@ status = solver.Solve(model)
 # Output
 if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
     print("Solution found.\n")
+    # (day, time, section) -> (room, teacher) of the class held there
+    assigned = {(d, t, sec): (room, teacher)
+                for (d, t, sec, room, teacher), var in slots.items() if solver.Value(var) == 1}
     for sec in sections:
         print(f"--- Timetable for Section {sec} ---")
         # Header row
@@ -162,18 +147,11 @@ if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         for d in days:
             row = f"{d:<8}"
             for t in time_slots:
-                found = False
                 cell_text = "Free"
-                for room in rooms:
-                    for teacher in teacher_list:
-                        key = (d, t, sec, room, teacher)
-                        if key in slots and solver.Value(slots[key]) == 1:
-                            subj = teachers[teacher]
-                            cell_text = f"{subj} ({teacher}) {room}"
-                            found = True
-                            break
-                    if found:
-                        break
+                if (d, t, sec) in assigned:
+                    room, teacher = assigned[d, t, sec]
+                    subj = teachers[teacher]
+                    cell_text = f"{subj} ({teacher}) {room}"
                 row += f"{cell_text:^25}"
             print(row)
         print("\n")
@@ -0,0 +1,14 @@
+"""
+Shared timetable engine used by the GA entry points
+(app_full/back_end/generator.py, backend_api/1.py and the scripts in logics/python).
+
+Every script describes the problem with the same plain dicts
+(COURSES / TEACHERS / ROOMS / TIMESLOTS / preferences); this package turns
+them into dense integer ids so the hot loops can run on NumPy arrays.
+"""
+
+from .problem import Problem
+from .fitness import FitnessEngine
+from .chromosome import ArrayIndividual, register_types
+
+__all__ = ["Problem", "FitnessEngine", "ArrayIndividual", "register_types"]
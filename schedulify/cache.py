@@ -0,0 +1,120 @@
+"""
+Cache of parsed datasets keyed by the hash of their raw input files.
+
+Re-running generation on the same upload / CSV folder with different GA
+parameters then skips parsing and index building entirely. Entries live in an
+in-memory LRU and, when ``directory`` is set, also as pickle files there (one
+``<key>.pkl`` per dataset) so a new process can pick them up.
+
+Loading a pickle runs whatever code it names, so the directory must only be
+writable by the user running the cache. It is created with mode 0700; an
+existing directory, and every file in it, must belong to that user and not be
+group / world writable, otherwise DatasetCache raises PermissionError
+(directory) or ignores the file (treated as a miss).
+
+    cache = DatasetCache(maxsize=8, directory=".schedulify_cache")
+    key = content_key(open("courses.csv", "rb").read(), ...)
+    data = cache.get_or_build(key, lambda: parse(...))
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Optional
+
+# Bump when the cached structures change shape, so stale pickles are ignored
+CACHE_VERSION = 1
+
+
+def content_key(*parts: bytes, namespace: str = "") -> str:
+    """sha256 over ``parts`` (raw file contents or sub-keys), the namespace and CACHE_VERSION."""
+    digest = hashlib.sha256(f"{namespace}:{CACHE_VERSION}".encode())
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def stream_digest(stream: BinaryIO, chunk_size: int = 1 << 20) -> bytes:
+    """sha256 of a seekable binary stream, read in chunks; the stream is rewound afterwards."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.digest()
+
+
+def _private(st: os.stat_result) -> bool:
+    """Owned by this user (where uids exist) and not writable by group / others."""
+    owner_ok = not hasattr(os, "getuid") or st.st_uid == os.getuid()
+    return owner_ok and not st.st_mode & 0o022
+
+
+class DatasetCache:
+    """In-memory LRU of parsed datasets, optionally backed by a directory of pickles."""
+
+    def __init__(self, maxsize: int = 8, directory: Optional[str] = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not _private(os.stat(directory)):
+                raise PermissionError(f"Dataset cache directory {directory!r} must be owned by the current "
+                                      f"user and not group / world writable (e.g. chmod 700).")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        if self.directory and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "rb") as f:
+                    # Only unpickle files nobody else could have written
+                    value = pickle.load(f) if _private(os.fstat(f.fileno())) else None
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        self._remember(key, value)
+        if self.directory:
+            # Write-then-rename so a concurrent reader never sees a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
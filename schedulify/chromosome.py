@@ -0,0 +1,127 @@
+"""
+Array-backed individuals: the alternative to ``list`` of
+(course_id, teacher, room, timeslot) string tuples.
+
+A timetable is an (n_lectures, 3) int16/int32 array of teacher/room/slot ids;
+the course is fixed by position (``Problem.lecture_list``). Cloning is a single
+memcpy and the fitness engine can stack individuals without encoding them.
+Genes are turned back into string tuples with ``Problem.decode`` at output time.
+
+DEAP setup::
+
+    register_types()  # creator.FitnessMin / Individual / ArrayIndividual, once per process
+    toolbox.register("population", init_population, creator.ArrayIndividual, problem)
+    toolbox.register("mate", cx_two_point)
+    toolbox.register("mutate", mutate_genes, problem=problem, indpb=0.1)
+    hof = tools.HallOfFame(1, similar=np.array_equal)  # '==' is element-wise on arrays
+"""
+
+import copy
+import random
+import numpy as np
+from deap import base, creator
+from typing import Callable, List, Sequence, Tuple
+
+from .problem import Problem, TEACHER, ROOM, SLOT
+
+# Mutation mixes (room, slot, teacher) used by the existing scripts
+ROOM_OR_SLOT = (0.5, 0.5, 0.0)
+ROOM_SLOT_OR_TEACHER = (1 / 3, 1 / 3, 1 / 3)
+
+
+class ArrayIndividual(np.ndarray):
+    """(n_lectures, 3) gene array that can carry a DEAP ``fitness`` attribute."""
+
+    def __new__(cls, genes):
+        return np.array(genes).view(cls)
+
+    def __deepcopy__(self, memo):
+        # toolbox.clone: copy the genes in one block, then the fitness object
+        copy_ = np.ndarray.copy(self)
+        copy_.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return copy_
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), np.asarray(self), self.__dict__))
+
+
+def _rebuild(cls, genes, state):
+    individual = genes.view(cls)
+    individual.__dict__.update(state)
+    return individual
+
+
+def register_types():
+    """
+    Creates the single-objective DEAP classes once per process: FitnessMin,
+    Individual (list of gene tuples) and ArrayIndividual. creator.create does
+    not raise on a second call, it warns and replaces the class, which would
+    happen on every run / pool job and break pickling of individuals made before.
+    """
+    if not hasattr(creator, "FitnessMin"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+    if not hasattr(creator, "ArrayIndividual"):
+        creator.create("ArrayIndividual", ArrayIndividual, fitness=creator.FitnessMin)
+
+
+def _sample_rooms(problem: Problem, courses: np.ndarray, rooms: str) -> np.ndarray:
+    # rooms="any": uniform over all rooms (generator.py / centralized scripts)
+    # rooms="fitting": only rooms whose capacity fits the course (backend_api)
+    if rooms == "fitting":
+        return problem.course_rooms.sample(courses)
+    return np.random.randint(problem.n_rooms, size=np.shape(courses))
+
+
+def random_genes(problem: Problem, n: int, rooms: str = "any") -> np.ndarray:
+    """(n, n_lectures, 3) random genes: qualified teacher, random room and slot per lecture."""
+    courses = np.broadcast_to(problem.lecture_courses, (n, problem.n_lectures))
+    genes = np.empty((n, problem.n_lectures, 3), dtype=problem.gene_dtype)
+    genes[..., TEACHER] = problem.course_teachers.sample(courses)
+    genes[..., ROOM] = _sample_rooms(problem, courses, rooms)
+    genes[..., SLOT] = np.random.randint(problem.n_slots, size=courses.shape)
+    return genes
+
+
+def init_population(container: Callable, problem: Problem, n: int, rooms: str = "any") -> List:
+    """``toolbox.population`` replacement: draws all ``n`` individuals in one go."""
+    return [container(genes) for genes in random_genes(problem, n, rooms)]
+
+
+def cx_two_point(ind1: np.ndarray, ind2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ``tools.cxTwoPoint`` for arrays. Slices of an ndarray are views, so the
+    swapped segments have to be copied first.
+    """
+    size = len(ind1)
+    cxpoint1 = random.randint(1, size)
+    cxpoint2 = random.randint(1, size - 1)
+    if cxpoint2 >= cxpoint1:
+        cxpoint2 += 1
+    else:
+        cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+    ind1[cxpoint1:cxpoint2], ind2[cxpoint1:cxpoint2] = \
+        ind2[cxpoint1:cxpoint2].copy(), ind1[cxpoint1:cxpoint2].copy()
+    return ind1, ind2
+
+
+def mutate_genes(individual: np.ndarray, problem: Problem, indpb: float,
+                 weights: Sequence[float] = ROOM_SLOT_OR_TEACHER, rooms: str = "any") -> Tuple[np.ndarray]:
+    """
+    ``mutate_timetable`` for arrays: each gene mutates with probability ``indpb``,
+    changing its room, slot or teacher with the given (room, slot, teacher) weights.
+    """
+    hit = np.flatnonzero(np.random.random(len(individual)) < indpb)
+    if hit.size:
+        p = np.asarray(weights, dtype=float)
+        kind = np.random.choice(3, size=hit.size, p=p / p.sum())
+        courses = problem.lecture_courses
+
+        moved = hit[kind == 0]
+        individual[moved, ROOM] = _sample_rooms(problem, courses[moved], rooms)
+        moved = hit[kind == 1]
+        individual[moved, SLOT] = np.random.randint(problem.n_slots, size=moved.size)
+        moved = hit[kind == 2]
+        individual[moved, TEACHER] = problem.course_teachers.sample(courses[moved])
+    return individual,
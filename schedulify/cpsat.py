@@ -0,0 +1,160 @@
+"""
+Exact OR-Tools CP-SAT backend for the same Problem the GA evolves.
+
+Per course ``c`` and timeslot ``s`` the model has
+    y[c, s]     the course meets at s (sum over s == hours; at most one lecture per slot)
+    z[c, s, t]  ... taught by teacher t  (one of the course's candidate teachers)
+    w[c, s, r]  ... in room r            (one of the course's capacity-feasible rooms)
+with sum_t z == sum_r w == y. Teacher, room and group clashes are ``<= 1`` per
+slot; capacity and the soft penalties (room / slot preferences, unqualified
+teachers) go into the objective with the GA's weights, so a solution scores
+the same under FitnessEngine. Needs ``ortools`` (not imported by the package).
+"""
+
+import numpy as np
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ortools.sat.python import cp_model
+
+from .fitness import HARD_PENALTY
+from .problem import Problem, TEACHER, ROOM, SLOT
+
+STOP_REASONS = {
+    cp_model.OPTIMAL: "optimal",
+    cp_model.FEASIBLE: "time_budget",
+    cp_model.INFEASIBLE: "infeasible",
+    cp_model.MODEL_INVALID: "model_invalid",
+    cp_model.UNKNOWN: "unknown",
+}
+
+
+class _Progress(cp_model.CpSolverSolutionCallback):
+    """Reports each improving solution; an exception from ``progress`` stops the search."""
+
+    def __init__(self, progress: Callable[[int, float, float], None]):
+        super().__init__()
+        self.progress = progress
+        self.solutions = 0
+        self.error: Optional[BaseException] = None
+
+    def on_solution_callback(self):
+        self.solutions += 1
+        objective = self.ObjectiveValue()
+        try:
+            self.progress(self.solutions, objective, objective)
+        except BaseException as e:
+            self.error = e
+            self.StopSearch()
+
+
+def _add_hint(model, problem: Problem, hint: np.ndarray, y, z, w):
+    """Hints y / z / w for every hinted lecture, and y = 0 elsewhere for fully hinted courses."""
+    starts = np.concatenate(([0], np.cumsum(problem.course_hours)))
+    for c in range(len(problem.course_ids)):
+        lectures = hint[starts[c]:starts[c + 1]].tolist()
+        used = set()
+        for t, r, s in lectures:
+            if s < 0 or s in used or (c, s, t) not in z or (c, s, r) not in w:
+                continue
+            used.add(s)
+            model.AddHint(y[c, s], 1)
+            model.AddHint(z[c, s, t], 1)
+            model.AddHint(w[c, s, r], 1)
+        if len(used) == len(lectures):
+            for s in range(problem.n_slots):
+                if s not in used:
+                    model.AddHint(y[c, s], 0)
+
+
+def solve_cpsat(problem: Problem, time_limit: float = 60.0, workers: int = 8, hard_penalty: int = HARD_PENALTY,
+                progress: Optional[Callable[[int, float, float], None]] = None, hint: Optional[np.ndarray] = None
+                ) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+    """
+    Returns (genes, info): genes is the (L, 3) encoded timetable in lecture order
+    (None when no solution was found) and info is
+    {"stop_reason", "objective", "best_bound", "solutions", "wall_time"}.
+    stop_reason "optimal" / "infeasible" are proofs; "time_budget" means a
+    solution was found but ``time_limit`` ran out before proving optimality.
+    hint: (n_lectures, 3) genes to start the search from (e.g. a previous
+    timetable from warmstart.previous_genes); rows of -1 are left open.
+    """
+    model = cp_model.CpModel()
+    objective = []
+    y, z, w = {}, {}, {}
+    teacher_terms = defaultdict(list)
+    room_terms = defaultdict(list)
+    group_terms = defaultdict(list)
+
+    for c in range(len(problem.course_ids)):
+        teachers = problem.course_teachers[c].tolist()
+        rooms = problem.course_rooms[c].tolist()
+        students = problem.course_students[c]
+        group = problem.course_group[c]
+        for s in range(problem.n_slots):
+            y[c, s] = model.NewBoolVar(f"y_{c}_{s}")
+            group_terms[group, s].append(y[c, s])
+            for t in teachers:
+                z[c, s, t] = model.NewBoolVar(f"z_{c}_{s}_{t}")
+                teacher_terms[t, s].append(z[c, s, t])
+                penalty = int(problem.slot_penalty[t, s]) + int(problem.course_penalty[t, c])
+                if penalty:
+                    objective.append(penalty * z[c, s, t])
+            for r in rooms:
+                w[c, s, r] = model.NewBoolVar(f"w_{c}_{s}_{r}")
+                room_terms[r, s].append(w[c, s, r])
+                if problem.room_capacity[r] < students:
+                    objective.append(hard_penalty * w[c, s, r])
+            model.Add(sum(z[c, s, t] for t in teachers) == y[c, s])
+            model.Add(sum(w[c, s, r] for r in rooms) == y[c, s])
+
+            # Room preference: teacher t in a room it does not prefer
+            for t in teachers:
+                disliked = [w[c, s, r] for r in rooms if problem.room_penalty[t, r]]
+                if disliked:
+                    both = model.NewBoolVar(f"p_{c}_{s}_{t}")
+                    model.Add(both >= z[c, s, t] + sum(disliked) - 1)
+                    objective.append(both)
+        model.Add(sum(y[c, s] for s in range(problem.n_slots)) == int(problem.course_hours[c]))
+
+    for terms in (teacher_terms, room_terms, group_terms):
+        for group in terms.values():
+            if len(group) > 1:
+                model.Add(sum(group) <= 1)
+    if objective:
+        model.Minimize(sum(objective))
+    if hint is not None:
+        _add_hint(model, problem, hint, y, z, w)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = workers
+    callback = _Progress(progress) if progress is not None else None
+    status = solver.Solve(model, callback)
+    if callback is not None and callback.error is not None:
+        raise callback.error
+
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    info = {
+        "stop_reason": STOP_REASONS.get(status, "unknown"),
+        "objective": solver.ObjectiveValue() if solved else None,
+        "best_bound": solver.BestObjectiveBound() if solved else None,
+        "solutions": callback.solutions if callback is not None else int(solved),
+        "wall_time": solver.WallTime(),
+    }
+    if not solved:
+        return None, info
+
+    # Lectures of course c are consecutive in lecture order; fill them slot by slot
+    genes = np.zeros((problem.n_lectures, 3), dtype=np.int32)
+    starts = np.concatenate(([0], np.cumsum(problem.course_hours)))
+    for c in range(len(problem.course_ids)):
+        lecture = starts[c]
+        for s in range(problem.n_slots):
+            if not solver.BooleanValue(y[c, s]):
+                continue
+            genes[lecture, TEACHER] = next(t for t in problem.course_teachers[c] if solver.BooleanValue(z[c, s, t]))
+            genes[lecture, ROOM] = next(r for r in problem.course_rooms[c] if solver.BooleanValue(w[c, s, r]))
+            genes[lecture, SLOT] = s
+            lecture += 1
+    return genes, info
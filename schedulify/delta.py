@@ -0,0 +1,146 @@
+"""
+Incremental (delta) fitness evaluation for array individuals.
+
+Each evaluated individual carries an ``Occupancy`` with its teacher x slot,
+room x slot and group x slot counters, its hard/soft totals and a copy of the
+genes they were computed from. ``toolbox.clone`` copies that state along with
+the genes, so after crossover/mutation only the genes that differ from the
+snapshot are re-scored and the counters are patched in place. Cost per
+evaluation follows the number of changed genes instead of the timetable size.
+
+It is not a default: it scores one individual per call, so the batch
+``FitnessEngine`` is faster on typical instances. benchmarks/bench_delta.py
+(pop 200) measured 0.14-0.5x the engine's evals/s at 248 lectures, 0.5-0.9x at
+1148, and 1.2-1.8x only at 3424 lectures with mutation rates <= 0.01.
+"""
+
+import numpy as np
+from typing import Tuple
+
+from .fitness import HARD_PENALTY, FitnessEngine
+from .problem import Problem, TEACHER, ROOM, SLOT
+
+# Above this share of changed genes a rebuild with bincount is cheaper than patching
+_REBUILD_FRACTION = 0.5
+
+
+def _clashes(counts: np.ndarray) -> int:
+    return int(np.maximum(counts - 1, 0).sum())
+
+
+class IncrementalMismatch(RuntimeError):
+    """Raised with check=True when the patched penalty differs from a full recompute."""
+
+
+class Occupancy:
+    """Counters and totals of one individual at the time of its last evaluation."""
+
+    __slots__ = ("genes", "teacher", "room", "group", "hard", "soft")
+
+    def __init__(self, genes, teacher, room, group, hard, soft):
+        self.genes = genes
+        self.teacher = teacher
+        self.room = room
+        self.group = group
+        self.hard = hard
+        self.soft = soft
+
+    def __deepcopy__(self, memo):
+        return Occupancy(self.genes.copy(), self.teacher.copy(), self.room.copy(),
+                         self.group.copy(), self.hard, self.soft)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class IncrementalEvaluator:
+    """
+    Same penalty as ``FitnessEngine`` (hard * hard_penalty + soft), kept up to
+    date per individual. Works on array individuals (``ArrayIndividual``).
+
+    check=True recomputes every penalty from scratch as well and raises
+    IncrementalMismatch when the incremental result differs (for testing).
+    """
+
+    def __init__(self, problem: Problem, hard_penalty: int = HARD_PENALTY, check: bool = False):
+        self.problem = problem
+        self.hard_penalty = hard_penalty
+        self.check = check
+        self.engine = FitnessEngine(problem, hard_penalty)
+
+    # --- Per-gene terms ---
+    def _keys(self, genes: np.ndarray, lectures: np.ndarray):
+        p = self.problem
+        n_s = p.n_slots
+        slot = genes[:, SLOT]
+        return (genes[:, TEACHER] * n_s + slot,
+                genes[:, ROOM] * n_s + slot,
+                p.lecture_groups[lectures].astype(np.int64) * n_s + slot)
+
+    def _terms(self, genes: np.ndarray, lectures: np.ndarray) -> Tuple[int, int]:
+        """Capacity violations and soft violations contributed by the given genes."""
+        p = self.problem
+        teacher, room, slot = genes[:, TEACHER], genes[:, ROOM], genes[:, SLOT]
+        capacity = int(np.count_nonzero(p.lecture_students[lectures] > p.room_capacity[room]))
+        soft = int(p.room_penalty[teacher, room].sum(dtype=np.int64)
+                   + p.slot_penalty[teacher, slot].sum(dtype=np.int64)
+                   + p.course_penalty[teacher, p.lecture_courses[lectures]].sum(dtype=np.int64))
+        return capacity, soft
+
+    # --- State management ---
+    def build(self, individual: np.ndarray) -> Occupancy:
+        """Full computation of the counters for ``individual``."""
+        p = self.problem
+        genes = np.asarray(individual, dtype=np.int64)
+        lectures = np.arange(len(genes))
+        n_s = p.n_slots
+        t_keys, r_keys, g_keys = self._keys(genes, lectures)
+        teacher = np.bincount(t_keys, minlength=p.n_teachers * n_s)
+        room = np.bincount(r_keys, minlength=p.n_rooms * n_s)
+        group = np.bincount(g_keys, minlength=p.n_groups * n_s)
+        capacity, soft = self._terms(genes, lectures)
+        hard = _clashes(teacher) + _clashes(room) + _clashes(group) + capacity
+        return Occupancy(np.array(individual), teacher, room, group, hard, soft)
+
+    def update(self, state: Occupancy, individual: np.ndarray) -> Occupancy:
+        """Patches ``state`` for the genes of ``individual`` that differ from its snapshot."""
+        changed = np.flatnonzero((np.asarray(individual) != state.genes).any(axis=1))
+        if changed.size == 0:
+            return state
+        if changed.size > _REBUILD_FRACTION * len(individual):
+            return self.build(individual)
+
+        old = state.genes[changed].astype(np.int64)
+        new = np.asarray(individual)[changed].astype(np.int64)
+        hard, soft = state.hard, state.soft
+        for counts, old_keys, new_keys in zip((state.teacher, state.room, state.group),
+                                              self._keys(old, changed), self._keys(new, changed)):
+            touched = np.unique(np.concatenate((old_keys, new_keys)))
+            before = _clashes(counts[touched])
+            np.subtract.at(counts, old_keys, 1)
+            np.add.at(counts, new_keys, 1)
+            hard += _clashes(counts[touched]) - before
+
+        old_capacity, old_soft = self._terms(old, changed)
+        new_capacity, new_soft = self._terms(new, changed)
+        state.hard = hard + new_capacity - old_capacity
+        state.soft = soft + new_soft - old_soft
+        state.genes[changed] = np.asarray(individual)[changed]
+        return state
+
+    # --- DEAP interface ---
+    def evaluate(self, individual) -> Tuple[float]:
+        """(penalty,) for ``individual``, reusing the counters it carries if any."""
+        state = getattr(individual, "occupancy", None)
+        state = self.build(individual) if state is None else self.update(state, individual)
+        individual.occupancy = state
+        penalty = state.hard * self.hard_penalty + state.soft
+        if self.check:
+            expected = self.engine.evaluate(individual)[0]
+            if penalty != expected:
+                raise IncrementalMismatch(f"incremental penalty {penalty} != full recompute {expected}")
+        return (float(penalty),)
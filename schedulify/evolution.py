@@ -0,0 +1,208 @@
+"""
+Evolution loop used by the GA drivers in place of ``algorithms.eaSimple``.
+
+Same generational scheme as DEAP's eaSimple (select -> varAnd -> evaluate
+invalid -> replace), but it reports every generation to an optional
+``on_generation(gen, population, record)`` callback (record = the logbook entry:
+gen, nevals and the stats fields). Raising from the callback (e.g. on
+cancellation) stops the run. An ``EarlyStopping`` ends it on a target penalty,
+a stagnation window or a wall-clock budget instead of always running all
+``ngen`` generations, and a ``ProgressMonitor`` turns the callback into
+per-generation progress events (penalties, hard / soft split, throughput).
+A ``profiling.GenerationProfiler`` passed as ``profiler`` gets the time spent
+evaluating and updating the hall of fame / statistics in every generation.
+``elitism=k`` copies the hall of fame's k best back over the k worst offspring
+each generation, so seeded (warm start / heuristic) individuals are not lost
+and the population's best, which EarlyStopping and ProgressMonitor follow,
+never gets worse.
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from deap import algorithms, tools
+
+from .fitness import HARD_PENALTY
+
+
+class EarlyStopping:
+    """
+    Stop criteria on the best individual's first fitness value (the penalty,
+    minimised by every driver):
+
+    target: stop once the best penalty is <= target (0 = no violations at all).
+    patience: stop after that many generations without the best penalty improving.
+    time_budget: stop once that many seconds have passed since the run started.
+
+    After the run ``reason`` is "target", "stagnation", "time_budget" or "ngen"
+    and ``generation`` the last generation evolved.
+    """
+
+    def __init__(self, target: Optional[float] = None, patience: Optional[int] = None,
+                 time_budget: Optional[float] = None):
+        self.target = target
+        self.patience = patience
+        self.time_budget = time_budget
+        self.start()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.best = math.inf
+        self.stale = 0
+        self.generation = 0
+        self.reason = "ngen"
+
+    def __call__(self, gen: int, population: List) -> bool:
+        """Records generation ``gen``; True when the run should stop."""
+        self.generation = gen
+        best = max(ind.fitness for ind in population).values[0]
+        if best < self.best:
+            self.best, self.stale = best, 0
+        else:
+            self.stale += 1
+
+        if self.target is not None and self.best <= self.target:
+            self.reason = "target"
+        elif self.patience is not None and self.stale >= self.patience:
+            self.reason = "stagnation"
+        elif self.time_budget is not None and time.perf_counter() - self.started >= self.time_budget:
+            self.reason = "time_budget"
+        else:
+            return False
+        return True
+
+    def summary(self) -> dict:
+        return {"stop_reason": self.reason, "generations": self.generation,
+                "elapsed_seconds": round(time.perf_counter() - self.started, 3)}
+
+
+class ProgressMonitor:
+    """
+    ``on_generation`` callback that builds one event per generation,
+
+        {"generation", "best_penalty", "avg_penalty", "hard", "soft",
+         "evaluations", "evals_per_second", "elapsed_seconds"}
+
+    and passes it to ``sink``. hard / soft are the violation counts of the best
+    individual: ``breakdown(individual) -> (hard, soft)`` when given (e.g.
+    FitnessEngine.breakdown), otherwise divmod(penalty, hard_penalty).
+    evals_per_second covers the generation just finished.
+    """
+
+    def __init__(self, sink: Callable[[Dict[str, Any]], None],
+                 breakdown: Optional[Callable[[Any], Tuple[int, int]]] = None, hard_penalty: int = HARD_PENALTY):
+        self.sink = sink
+        self.breakdown = breakdown
+        self.hard_penalty = hard_penalty
+        self.start()
+
+    def start(self):
+        self.started = self.last = time.perf_counter()
+
+    def __call__(self, gen: int, population: List, record: Dict[str, Any]):
+        now = time.perf_counter()
+        best = max(population, key=lambda ind: ind.fitness)
+        penalty = best.fitness.values[0]
+        if self.breakdown is not None:
+            hard, soft = self.breakdown(best)
+        else:
+            hard, soft = divmod(int(penalty), self.hard_penalty)
+        evaluations = int(record.get("nevals", 0))
+        elapsed = now - self.last
+        self.last = now
+        self.sink({
+            "generation": gen,
+            "best_penalty": float(penalty),
+            "avg_penalty": float(record["avg"]) if "avg" in record else None,
+            "hard": int(hard),
+            "soft": int(soft),
+            "evaluations": evaluations,
+            "evals_per_second": round(evaluations / elapsed, 1) if elapsed > 0 else None,
+            "elapsed_seconds": round(now - self.started, 3),
+        })
+
+
+def _evaluate_invalid(population: List, toolbox, profiler=None) -> int:
+    start = time.perf_counter()
+    invalid_ind = [ind for ind in population if not ind.fitness.valid]
+    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+    for ind, fit in zip(invalid_ind, fitnesses):
+        ind.fitness.values = fit
+    if profiler is not None:
+        profiler.record("evaluate", time.perf_counter() - start, len(invalid_ind))
+    return len(invalid_ind)
+
+
+def _keep_elite(offspring: List, toolbox, halloffame, elitism: int):
+    # Worst first: DEAP fitnesses compare higher = better
+    worst = sorted(range(len(offspring)), key=lambda i: offspring[i].fitness)[:elitism]
+    for i, elite in zip(worst, halloffame[:elitism]):
+        offspring[i] = toolbox.clone(elite)
+
+
+def _update(population: List, halloffame, stats, profiler) -> Dict[str, Any]:
+    start = time.perf_counter()
+    if halloffame is not None:
+        halloffame.update(population)
+    hof_done = time.perf_counter()
+    record = stats.compile(population) if stats else {}
+    if profiler is not None:
+        if halloffame is not None:
+            profiler.record("halloffame", hof_done - start)
+        if stats:
+            profiler.record("stats", time.perf_counter() - hof_done)
+    return record
+
+
+def ea_simple(population: List, toolbox, cxpb: float, mutpb: float, ngen: int,
+              stats: Optional[tools.Statistics] = None, halloffame: Optional[tools.HallOfFame] = None,
+              on_generation: Optional[Callable] = None, early_stopping: Optional[EarlyStopping] = None,
+              verbose: bool = False, profiler=None, elitism: int = 0):
+    """
+    Returns (population, logbook) like ``algorithms.eaSimple``. With a
+    ``profiler`` (see profiling.py; instrument the toolbox first) each
+    generation is timed per operator. ``elitism`` (needs ``halloffame``) keeps
+    that many of the best individuals found so far in every generation.
+    """
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+    if early_stopping is not None:
+        early_stopping.start()
+
+    if profiler is not None:
+        profiler.start_generation(0)
+    nevals = _evaluate_invalid(population, toolbox, profiler)
+    record = _update(population, halloffame, stats, profiler)
+    if profiler is not None:
+        profiler.end_generation(0)
+    logbook.record(gen=0, nevals=nevals, **record)
+    if verbose:
+        print(logbook.stream)
+    if on_generation is not None:
+        on_generation(0, population, logbook[-1])
+    if early_stopping is not None and early_stopping(0, population):
+        return population, logbook
+
+    for gen in range(1, ngen + 1):
+        if profiler is not None:
+            profiler.start_generation(gen)
+        offspring = toolbox.select(population, len(population))
+        offspring = algorithms.varAnd(offspring, toolbox, cxpb, mutpb)
+        nevals = _evaluate_invalid(offspring, toolbox, profiler)
+        if elitism and halloffame is not None and len(halloffame):
+            _keep_elite(offspring, toolbox, halloffame, elitism)
+        population[:] = offspring
+        record = _update(population, halloffame, stats, profiler)
+        if profiler is not None:
+            profiler.end_generation(gen)
+
+        logbook.record(gen=gen, nevals=nevals, **record)
+        if verbose:
+            print(logbook.stream)
+        if on_generation is not None:
+            on_generation(gen, population, logbook[-1])
+        if early_stopping is not None and early_stopping(gen, population):
+            break
+
+    return population, logbook
@@ -0,0 +1,96 @@
+import numpy as np
+from typing import Iterable, List, Sequence, Tuple
+
+from .problem import Problem, TEACHER, ROOM, SLOT
+
+HARD_PENALTY = 1000
+
+# Above this many cells the per-row occupancy matrix gets too big for bincount
+# and clashes are counted on sorted keys instead.
+_OCCUPANCY_LIMIT = 1 << 24
+
+
+def count_clashes(keys: np.ndarray, n_keys: int) -> np.ndarray:
+    """
+    Number of repeated keys in each row of ``keys`` (values in [0, n_keys)).
+
+    This is the vectorised form of the ``if timeslot in schedule[x]: hard += 1``
+    loop: every occurrence of an (entity, slot) pair after the first is a clash.
+    """
+    n_rows, n_cols = keys.shape
+    if n_cols == 0:
+        return np.zeros(n_rows, dtype=np.int64)
+    if n_rows * n_keys <= _OCCUPANCY_LIMIT:
+        offsets = np.arange(n_rows, dtype=np.int64)[:, None] * n_keys
+        occupancy = np.bincount((keys + offsets).ravel(), minlength=n_rows * n_keys)
+        return n_cols - np.count_nonzero(occupancy.reshape(n_rows, n_keys), axis=1)
+    ordered = np.sort(keys, axis=1)
+    return np.count_nonzero(ordered[:, 1:] == ordered[:, :-1], axis=1)
+
+
+class FitnessEngine:
+    """
+    Scores timetables against the hard/soft rules of ``evaluate_timetable``:
+
+      H1 teacher clash, H2 room clash, H3 student group (dept+sem) clash,
+      H4 room capacity; soft = preference / qualification penalties.
+
+    Penalty = hard * HARD_PENALTY + soft, as before. Whole populations are
+    scored at once with occupancy counts over the encoded gene arrays.
+    """
+
+    def __init__(self, problem: Problem, hard_penalty: int = HARD_PENALTY):
+        self.problem = problem
+        self.hard_penalty = hard_penalty
+
+    def genes(self, individual) -> np.ndarray:
+        """Encoded (n_lectures, 3) id array for an individual of either representation."""
+        if isinstance(individual, np.ndarray):
+            return individual
+        return self.problem.encode(individual)
+
+    def score(self, genes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        genes: (pop, n_lectures, 3) id array.
+        Returns (hard_violations, soft_violations), one entry per individual.
+        """
+        p = self.problem
+        genes = np.asarray(genes, dtype=np.int64)
+        teacher, room, slot = genes[..., TEACHER], genes[..., ROOM], genes[..., SLOT]
+        n_s = p.n_slots
+
+        hard = count_clashes(teacher * n_s + slot, p.n_teachers * n_s)
+        hard += count_clashes(room * n_s + slot, p.n_rooms * n_s)
+        hard += count_clashes(p.lecture_groups * n_s + slot, p.n_groups * n_s)
+        hard += np.count_nonzero(p.lecture_students > p.room_capacity[room], axis=1)
+
+        soft = p.room_penalty[teacher, room].sum(axis=1, dtype=np.int64)
+        soft += p.slot_penalty[teacher, slot].sum(axis=1, dtype=np.int64)
+        soft += p.course_penalty[teacher, p.lecture_courses].sum(axis=1, dtype=np.int64)
+        return hard, soft
+
+    def penalties(self, individuals: Sequence) -> np.ndarray:
+        """Total penalty for each individual in ``individuals``."""
+        if len(individuals) == 0:
+            return np.zeros(0, dtype=np.int64)
+        hard, soft = self.score(np.stack([self.genes(ind) for ind in individuals]))
+        return hard * self.hard_penalty + soft
+
+    def breakdown(self, individual) -> Tuple[int, int]:
+        """(hard, soft) violation counts of a single individual."""
+        hard, soft = self.score(self.genes(individual)[None])
+        return int(hard[0]), int(soft[0])
+
+    def evaluate(self, individual) -> Tuple[float]:
+        """DEAP-style fitness for a single individual: (penalty,)."""
+        return (float(self.penalties([individual])[0]),)
+
+    def map(self, func, individuals: Iterable) -> List:
+        """
+        Drop-in for ``toolbox.map``: when DEAP asks for ``self.evaluate`` over the
+        invalid individuals, score them as one batch instead of one by one.
+        """
+        # toolbox.register wraps the method in a functools.partial
+        if getattr(func, "func", func) != self.evaluate:
+            return list(map(func, individuals))
+        return [(float(p),) for p in self.penalties(list(individuals))]
@@ -0,0 +1,160 @@
+"""
+Island-model GA: N sub-populations evolve in separate processes and every
+``migration_interval`` generations each island sends copies of its
+``migration_size`` best individuals to the next island on a ring
+(0 -> 1 -> ... -> N-1 -> 0), where they replace the worst ones.
+
+Each island runs the caller's own toolbox (evaluate_timetable, mutate_timetable,
+...) through ``ea_simple``. Islands are forked so the toolbox and its closures
+over COURSES / ROOMS / TEACHERS are inherited rather than pickled; only
+migrants and final results cross process boundaries (Linux / fork only).
+
+With an ``EarlyStopping``, each island checks the criteria on its own
+population and the first island to meet one (target, stagnation, time budget)
+stops every island at its next generation.
+"""
+
+import multiprocessing
+import operator
+import os
+import queue
+import random
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from deap import tools
+
+from .evolution import EarlyStopping, ea_simple
+
+# How long an island waits for its neighbour's migrants before skipping a round
+MIGRATION_TIMEOUT = 600
+
+# Seconds between checks of the stop flag / island exit codes while waiting
+POLL_INTERVAL = 1.0
+
+
+class _IslandStopping:
+    """An island's copy of the run's EarlyStopping, shared through ``stop`` with the other islands."""
+
+    def __init__(self, stopping: Optional[EarlyStopping], stop):
+        self.stopping = stopping
+        self.stop = stop
+        self.generation = 0
+        self.reason = "ngen"
+
+    def start(self):
+        if self.stopping is not None:
+            self.stopping.start()
+
+    def __call__(self, gen: int, population: List) -> bool:
+        self.generation = gen
+        if self.stopping is not None and self.stopping(gen, population):
+            self.reason = self.stopping.reason
+            self.stop.set()
+            return True
+        if self.stop.is_set():
+            self.reason = "other_island"
+            return True
+        return False
+
+
+def _island(index: int, toolbox, pop_size: int, ngen: int, cxpb: float, mutpb: float,
+            migration_interval: int, migration_size: int, inbox, outbox, results,
+            seed: int, similar: Callable, stopping: _IslandStopping, elitism: int):
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+    pop = toolbox.population(n=pop_size)
+    hof = tools.HallOfFame(1, similar=similar)
+    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats.register("avg", np.mean)
+    stats.register("min", np.min)
+
+    def migrate(gen, population, record):
+        if gen == 0 or gen == ngen or gen % migration_interval:
+            return
+        outbox.put([toolbox.clone(ind) for ind in tools.selBest(population, migration_size)])
+        # Wait for the neighbour, unless the run is stopping (it may never send)
+        for _ in range(int(MIGRATION_TIMEOUT / POLL_INTERVAL)):
+            try:
+                immigrants = inbox.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                if stopping.stop.is_set():
+                    return
+        else:
+            return
+        worst_first = sorted(range(len(population)), key=lambda i: population[i].fitness)
+        for i, ind in zip(worst_first, immigrants):
+            population[i] = ind
+
+    _, logbook = ea_simple(pop, toolbox, cxpb=cxpb, mutpb=mutpb, ngen=ngen,
+                           stats=stats, halloffame=hof, on_generation=migrate, early_stopping=stopping,
+                           elitism=elitism)
+    results.put((index, hof[0], [float(v) for v in logbook.select("min")],
+                 [float(v) for v in logbook.select("avg")], stopping.reason, stopping.generation))
+
+
+def _collect(islands: List, results) -> List[Tuple]:
+    """Every island's result; raises if an island process dies without reporting one."""
+    finished = []
+    while len(finished) < len(islands):
+        try:
+            finished.append(results.get(timeout=POLL_INTERVAL))
+        except queue.Empty:
+            # exit code 0 only comes after the result was flushed to the queue
+            reported = {item[0] for item in finished}
+            crashed = {i: p.exitcode for i, p in enumerate(islands)
+                       if i not in reported and p.exitcode not in (None, 0)}
+            if crashed:
+                for island in islands:
+                    if island.is_alive():
+                        island.terminate()
+                details = ", ".join(f"island {i} (exit code {code})" for i, code in crashed.items())
+                raise RuntimeError(f"Island process died before reporting its result: {details}")
+    return finished
+
+
+def run_islands(toolbox, n_islands: int, pop_size: int, ngen: int, cxpb: float = 0.8, mutpb: float = 0.2,
+                migration_interval: int = 20, migration_size: int = 5, seed: Optional[int] = None,
+                similar: Callable = operator.eq, early_stopping: Optional[EarlyStopping] = None,
+                elitism: int = 0) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Evolves ``n_islands`` populations of ``pop_size`` individuals for ``ngen`` generations.
+    Pass ``similar=np.array_equal`` for array individuals.
+
+    Returns (best individual over all islands, per-island reports) where each
+    report is {"island", "best_penalty", "min": [...], "avg": [...], "stop_reason"}
+    with one entry per generation for the convergence curves. ``early_stopping``
+    gets the run's reason (the first island's criterion) and last generation.
+    ``elitism`` is passed to every island's ea_simple (its hall of fame keeps one).
+    Raises RuntimeError if an island process dies.
+    """
+    ctx = multiprocessing.get_context("fork")
+    inboxes = [ctx.Queue() for _ in range(n_islands)]
+    results = ctx.Queue()
+    stop = ctx.Event()
+    base_seed = seed if seed is not None else int.from_bytes(os.urandom(4), "little")
+
+    islands = [
+        ctx.Process(target=_island, args=(i, toolbox, pop_size, ngen, cxpb, mutpb, migration_interval,
+                                          migration_size, inboxes[i], inboxes[(i + 1) % n_islands],
+                                          results, base_seed + i, similar, _IslandStopping(early_stopping, stop), elitism))
+        for i in range(n_islands)
+    ]
+    for island in islands:
+        island.start()
+    # Drain results before joining: a child blocks on exit until its queue is read
+    finished = _collect(islands, results)
+    for island in islands:
+        island.join()
+
+    finished.sort(key=operator.itemgetter(0))
+    reports = [{"island": i, "best_penalty": best.fitness.values[0], "min": mins, "avg": avgs, "stop_reason": reason}
+               for i, best, mins, avgs, reason, _ in finished]
+    if early_stopping is not None:
+        reasons = [reason for *_, reason, _ in finished if reason not in ("ngen", "other_island")]
+        early_stopping.reason = reasons[0] if reasons else "ngen"
+        early_stopping.generation = max(gen for *_, gen in finished)
+    best = max((item[1] for item in finished), key=lambda ind: ind.fitness)
+    return best, reports
@@ -0,0 +1,81 @@
+"""
+Opt-in process-pool fitness evaluation for DEAP's ``toolbox.map``.
+
+The evaluator (a FitnessEngine with its Problem, or any picklable per-individual
+function such as ``partial(check_constraints, data=data)``) is sent to each
+worker once, by the pool initializer. Per generation only the chromosomes
+travel: the invalid individuals are split into one chunk per worker, array
+individuals stacked into a single ndarray, list individuals as plain lists.
+
+    with ParallelEvaluator(engine, processes=8) as parallel:
+        toolbox.register("map", parallel.map)
+        algorithms.eaSimple(...)
+"""
+
+import multiprocessing
+import numpy as np
+from typing import Any, Callable, Iterable, List, Optional
+
+# Evaluator installed in each worker process by _init_worker
+_evaluator: Any = None
+
+
+def _init_worker(evaluator):
+    global _evaluator
+    _evaluator = evaluator
+
+
+def _evaluate_chunk(chunk) -> List:
+    # Batch-capable evaluators (FitnessEngine) score the whole chunk at once
+    if hasattr(_evaluator, "penalties"):
+        return [(float(p),) for p in _evaluator.penalties(chunk)]
+    return [_evaluator(individual) for individual in chunk]
+
+
+class ParallelEvaluator:
+    """
+    ``map`` drop-in that evaluates in a multiprocessing pool.
+
+    evaluator: FitnessEngine, or a callable returning the fitness tuple of one individual.
+    Calls of ``map`` with any other function run serially in the parent.
+    """
+
+    def __init__(self, evaluator: Any, processes: Optional[int] = None, chunks_per_worker: int = 1):
+        self.evaluator = evaluator
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunks_per_worker = chunks_per_worker
+        self._pool = multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(evaluator,))
+
+    def _is_evaluation(self, func: Callable) -> bool:
+        # toolbox.register wraps functions in functools.partial
+        func = getattr(func, "func", func)
+        target = getattr(self.evaluator, "evaluate", self.evaluator)
+        return func == target or func == getattr(target, "func", target)
+
+    def map(self, func: Callable, individuals: Iterable) -> List:
+        individuals = list(individuals)
+        if not self._is_evaluation(func):
+            return list(map(func, individuals))
+        if not individuals:
+            return []
+        n_chunks = min(len(individuals), self.processes * self.chunks_per_worker)
+        bounds = np.linspace(0, len(individuals), n_chunks + 1).astype(int)
+        chunks = [self._pack(individuals[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        return [fit for part in self._pool.map(_evaluate_chunk, chunks) for fit in part]
+
+    @staticmethod
+    def _pack(individuals: List):
+        # Strip the DEAP wrappers: fitness objects are not needed by the workers
+        if isinstance(individuals[0], np.ndarray):
+            return np.stack([np.asarray(ind) for ind in individuals])
+        return [list(ind) for ind in individuals]
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
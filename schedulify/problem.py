@@ -0,0 +1,172 @@
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Column order of an encoded gene. The course is not stored: it is fixed by
+# the gene's position in the lecture list.
+TEACHER, ROOM, SLOT = 0, 1, 2
+
+
+class CandidateIndex:
+    """
+    Candidate ids per course packed CSR-style: course ``c`` may use
+    ``ids[ptr[c]:ptr[c + 1]]``. Sampling for many lectures is one vectorised draw.
+    """
+
+    def __init__(self, candidates: Sequence[Sequence[int]]):
+        sizes = np.array([len(c) for c in candidates], dtype=np.int64)
+        self.ptr = np.concatenate(([0], np.cumsum(sizes)))
+        self.sizes = sizes
+        self.ids = np.array([i for c in candidates for i in c], dtype=np.int32)
+
+    def __getitem__(self, course: int) -> np.ndarray:
+        return self.ids[self.ptr[course]:self.ptr[course + 1]]
+
+    def sample(self, courses: np.ndarray) -> np.ndarray:
+        """One random candidate for each entry of ``courses`` (array of course ids)."""
+        offsets = (np.random.random(np.shape(courses)) * self.sizes[courses]).astype(np.int64)
+        return self.ids[self.ptr[courses] + offsets]
+
+
+class Problem:
+    """
+    Integer-encoded view of the COURSES / TEACHERS / ROOMS / TIMESLOTS dicts.
+
+    Every course, teacher, room, timeslot and student group (dept, semester)
+    is mapped to a dense id, so a timetable becomes an (n_lectures, 3) int array
+    of teacher/room/slot ids instead of a list of string tuples.
+    """
+
+    def __init__(
+        self,
+        courses: Dict[str, Dict[str, Any]],
+        teachers: Dict[str, Dict[str, Any]],
+        rooms: Dict[str, Dict[str, Any]],
+        timeslots: Sequence[str],
+        preferences: Optional[Dict[str, Dict[str, Any]]] = None,
+        penalize_unqualified: bool = False,
+    ):
+        self.courses = courses
+        self.teachers = teachers
+        self.rooms = rooms
+        self.preferences = preferences or {}
+        self.penalize_unqualified = penalize_unqualified
+
+        # --- Dense id mappings ---
+        self.course_ids: List[str] = list(courses)
+        self.teacher_ids: List[str] = list(teachers)
+        self.room_ids: List[str] = list(rooms)
+        self.timeslots: List[str] = list(timeslots)
+        self.course_index = {c: i for i, c in enumerate(self.course_ids)}
+        self.teacher_index = {t: i for i, t in enumerate(self.teacher_ids)}
+        self.room_index = {r: i for i, r in enumerate(self.room_ids)}
+        self.slot_index = {s: i for i, s in enumerate(self.timeslots)}
+
+        groups: Dict[Tuple[Any, Any], int] = {}
+        self.course_group = np.array(
+            [groups.setdefault((c['dept'], c['semester']), len(groups)) for c in courses.values()],
+            dtype=np.int32,
+        )
+        self.group_ids: List[Tuple[Any, Any]] = list(groups)
+        self.course_students = np.array([int(c['students']) for c in courses.values()], dtype=np.int32)
+        self.course_hours = np.array([int(c['hours']) for c in courses.values()], dtype=np.int32)
+        self.room_capacity = np.array([int(r['capacity']) for r in rooms.values()], dtype=np.int32)
+
+        # --- Lectures: one entry per lecture hour, same order as LECTURE_LIST ---
+        self.lecture_courses = np.repeat(np.arange(len(self.course_ids), dtype=np.int32), self.course_hours)
+        self.lecture_list: List[str] = [self.course_ids[c] for c in self.lecture_courses]
+        self.lecture_students = self.course_students[self.lecture_courses]
+        self.lecture_groups = self.course_group[self.lecture_courses]
+
+        # --- Soft-constraint lookup tables (1 = one soft violation) ---
+        n_t, n_r, n_s = self.n_teachers, self.n_rooms, self.n_slots
+        self.room_penalty = np.zeros((n_t, n_r), dtype=np.int8)
+        self.slot_penalty = np.zeros((n_t, n_s), dtype=np.int8)
+        for teacher, prefs in self.preferences.items():
+            if teacher not in self.teacher_index:
+                continue
+            t = self.teacher_index[teacher]
+            if prefs.get('preferred_rooms'):
+                self.room_penalty[t] = 1
+                self.room_penalty[t, self._ids(prefs['preferred_rooms'], self.room_index)] = 0
+            if prefs.get('preferred_slots'):
+                self.slot_penalty[t] = 1
+                self.slot_penalty[t, self._ids(prefs['preferred_slots'], self.slot_index)] = 0
+
+        # Teacher assigned to a course outside their list (backend_api treats this as soft)
+        self.course_penalty = np.zeros((n_t, len(self.course_ids)), dtype=np.int8)
+        if penalize_unqualified:
+            self.course_penalty[:] = 1
+            for teacher, details in teachers.items():
+                self.course_penalty[self.teacher_index[teacher],
+                                    self._ids(details.get('courses', []), self.course_index)] = 0
+
+        # --- Per-course eligibility index (built once, used by every operator) ---
+        # course -> qualified teacher ids (any teacher if nobody lists the course)
+        # course -> rooms whose capacity fits, smallest first (any room if none fits)
+        all_teachers = list(range(n_t))
+        qualified: List[List[int]] = [[] for _ in self.course_ids]
+        for teacher, details in teachers.items():
+            for c in self._ids(details.get('courses', []), self.course_index):
+                qualified[c].append(self.teacher_index[teacher])
+        self.course_teachers = CandidateIndex([q or all_teachers for q in qualified])
+        self.unstaffed_courses: List[str] = [self.course_ids[c] for c, q in enumerate(qualified) if not q]
+
+        by_capacity = np.argsort(self.room_capacity, kind='stable')
+        sorted_capacity = self.room_capacity[by_capacity]
+        first_fit = np.searchsorted(sorted_capacity, self.course_students, side='left')
+        self.course_rooms = CandidateIndex([
+            (by_capacity[start:] if start < n_r else by_capacity).tolist() for start in first_fit
+        ])
+
+        # Same index by name, for the operators working on string tuples
+        self.teachers_by_course: Dict[str, List[str]] = {
+            cid: [self.teacher_ids[t] for t in self.course_teachers[c]] for c, cid in enumerate(self.course_ids)
+        }
+        self.rooms_by_course: Dict[str, List[str]] = {
+            cid: [self.room_ids[r] for r in self.course_rooms[c]] for c, cid in enumerate(self.course_ids)
+        }
+
+    @staticmethod
+    def _ids(names: Iterable[str], index: Dict[str, int]) -> List[int]:
+        return [index[n] for n in names if n in index]
+
+    @property
+    def n_lectures(self) -> int:
+        return len(self.lecture_courses)
+
+    @property
+    def n_teachers(self) -> int:
+        return len(self.teacher_ids)
+
+    @property
+    def n_rooms(self) -> int:
+        return len(self.room_ids)
+
+    @property
+    def n_slots(self) -> int:
+        return len(self.timeslots)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.group_ids)
+
+    @property
+    def gene_dtype(self) -> type:
+        """Smallest int type that holds every teacher/room/slot id."""
+        return np.int16 if max(self.n_teachers, self.n_rooms, self.n_slots) <= np.iinfo(np.int16).max else np.int32
+
+    # --- Conversion between string genes and id arrays ---
+    def encode(self, individual: Sequence[Tuple[str, str, str, str]]) -> np.ndarray:
+        """List of (course_id, teacher, room, timeslot) tuples -> (n_lectures, 3) int32 array."""
+        t_idx, r_idx, s_idx = self.teacher_index, self.room_index, self.slot_index
+        return np.array(
+            [(t_idx[teacher], r_idx[room], s_idx[slot]) for _, teacher, room, slot in individual],
+            dtype=np.int32,
+        ).reshape(-1, 3)
+
+    def decode(self, genes: np.ndarray) -> List[Tuple[str, str, str, str]]:
+        """(n_lectures, 3) id array -> list of (course_id, teacher, room, timeslot) tuples."""
+        return [
+            (course, self.teacher_ids[t], self.room_ids[r], self.timeslots[s])
+            for course, (t, r, s) in zip(self.lecture_list, np.asarray(genes).tolist())
+        ]
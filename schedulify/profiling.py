@@ -0,0 +1,142 @@
+"""
+Per-operator instrumentation for ``ea_simple``.
+
+``GenerationProfiler.instrument(toolbox)`` wraps the toolbox's select / clone /
+mate / mutate so every call is timed; ``ea_simple(..., profiler=...)`` adds the
+evaluation of each generation's invalid individuals ("evaluate", one call per
+individual, timed as a batch since engines score whole populations at once)
+and the hall-of-fame / statistics updates. Time not spent in any of them
+(varAnd's own loop, fitness invalidation, callbacks) is reported as "other".
+
+``capture_generation=k`` also runs generation k under cProfile and tracemalloc
+and keeps the top functions and allocation sites.
+
+    profiler = GenerationProfiler(capture_generation=5)
+    profiler.instrument(toolbox)
+    ea_simple(pop, toolbox, ..., profiler=profiler)
+    profiler.summary()  # {"generations", "seconds", "operators": {name: {...}}, "capture": {...}}
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+# Toolbox operators wrapped by instrument(); evaluate / halloffame / stats are timed by ea_simple
+OPERATORS = ("select", "clone", "mate", "mutate")
+
+# Entries kept from a cProfile / tracemalloc capture
+CAPTURE_TOP = 25
+
+
+class GenerationProfiler:
+    """Cumulative time and call counts per operator over all generations."""
+
+    def __init__(self, capture_generation: Optional[int] = None):
+        self.capture_generation = capture_generation
+        self.totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        self.capture: Optional[Dict[str, Any]] = None
+        self.seconds = 0.0
+        self.n_generations = 0
+        self._current: Optional[Dict[str, List[float]]] = None
+        self._started = 0.0
+        self._cprofile = None
+
+    # --- Recording ---
+    def instrument(self, toolbox, operators: Iterable[str] = OPERATORS):
+        """Replaces the toolbox's operators with timed wrappers (the toolbox should be per run)."""
+        for name in operators:
+            if hasattr(toolbox, name):
+                setattr(toolbox, name, self._wrap(name, getattr(toolbox, name)))
+        return toolbox
+
+    def _wrap(self, name: str, fn):
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return timed
+
+    def record(self, name: str, seconds: float, calls: int = 1):
+        for table in (self.totals, self._current):
+            if table is not None:
+                table[name][0] += seconds
+                table[name][1] += calls
+
+    def start_generation(self, gen: int):
+        self._current = defaultdict(lambda: [0.0, 0])
+        if gen == self.capture_generation:
+            tracemalloc.start()
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+
+    def end_generation(self, gen: int):
+        elapsed = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self.capture = self._captured(gen)
+            self._cprofile = None
+        self.seconds += elapsed
+        self.n_generations += 1
+        other = elapsed - sum(seconds for seconds, _ in self._current.values())
+        self.totals["other"][0] += max(other, 0.0)
+        self._current = None
+
+    def _captured(self, gen: int) -> Dict[str, Any]:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats = pstats.Stats(self._cprofile, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:CAPTURE_TOP]
+        functions = [{"function": f"{path}:{line}({func})", "calls": calls, "tottime": round(tottime, 6),
+                      "cumtime": round(cumtime, 6)}
+                     for (path, line, func), (_, calls, tottime, cumtime, _) in rows]
+        allocations = [{"location": str(stat.traceback), "size_kib": round(stat.size / 1024, 1), "count": stat.count}
+                       for stat in snapshot.statistics("lineno")[:CAPTURE_TOP]]
+        return {"generation": gen, "functions": functions, "allocations": allocations,
+                "peak_traced_kib": round(peak / 1024, 1)}
+
+    # --- Reporting ---
+    def summary(self) -> Dict[str, Any]:
+        """Totals per operator (seconds, calls, share of the loop, ms per generation) and the capture, if any."""
+        return summarize(self.totals, self.n_generations, self.seconds, self.capture)
+
+
+def summarize(totals: Dict[str, List[float]], generations: Optional[int], seconds: float,
+              capture: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    operators = {}
+    for name, (op_seconds, calls) in sorted(totals.items(), key=lambda item: item[1][0], reverse=True):
+        operators[name] = {
+            "seconds": round(op_seconds, 6),
+            "calls": int(calls),
+            "share": round(op_seconds / seconds, 4) if seconds else None,
+            "ms_per_generation": round(1000 * op_seconds / generations, 3) if generations else None,
+        }
+    out = {"generations": generations, "seconds": round(seconds, 6), "operators": operators}
+    if capture is not None:
+        out["capture"] = capture
+    return out
+
+
+def merge_summaries(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """One summary over several runs' summaries (captures are not merged)."""
+    totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+    generations, seconds, runs = 0, 0.0, 0
+    for s in summaries:
+        runs += 1
+        generations += s.get("generations") or 0
+        seconds += s["seconds"]
+        for name, op in s["operators"].items():
+            totals[name][0] += op["seconds"]
+            totals[name][1] += op["calls"]
+    return dict(summarize(totals, generations, seconds), runs=runs)
@@ -0,0 +1,161 @@
+"""
+Targeted repair of an existing timetable after a single change (a teacher
+unavailable in some slots, a room closed) instead of a full GA run.
+
+The change is expressed as blocked teacher x slot / room x slot cells. Every
+lecture that breaks a hard rule (the H1-H4 clashes and capacity of
+``FitnessEngine``, or sitting in a blocked cell) is moved, one at a time, to
+the (teacher, slot, room) with the lowest penalty given everything else that
+stays put: min-conflicts local search. Ties go to the move that changes
+fewest fields, so the result differs from the input as little as possible.
+
+    genes, info = repair(problem, genes, blocked_teachers={t: [s1, s2]}, blocked_rooms={r: None})
+"""
+
+import time
+import numpy as np
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from .fitness import HARD_PENALTY, FitnessEngine
+from .problem import Problem, TEACHER, ROOM, SLOT
+
+# Upper bound on moves, as a multiple of the number of lectures that start out broken
+MAX_MOVES_FACTOR = 10
+
+
+def _blocked(n_entities: int, n_slots: int, blocked: Optional[Mapping[int, Optional[Iterable[int]]]]) -> np.ndarray:
+    cells = np.zeros((n_entities, n_slots), dtype=np.int64)
+    for entity, slots in (blocked or {}).items():
+        if slots is None:
+            cells[entity] = 1
+        else:
+            cells[entity, list(slots)] = 1
+    return cells
+
+
+class _State:
+    """Occupancy counters of a timetable plus the blocked cells."""
+
+    def __init__(self, problem: Problem, genes: np.ndarray, blocked_teachers, blocked_rooms):
+        p = problem
+        self.problem = p
+        self.genes = genes
+        self.teacher = np.zeros((p.n_teachers, p.n_slots), dtype=np.int64)
+        self.room = np.zeros((p.n_rooms, p.n_slots), dtype=np.int64)
+        self.group = np.zeros((p.n_groups, p.n_slots), dtype=np.int64)
+        placed = np.flatnonzero(genes[:, SLOT] >= 0)
+        np.add.at(self.teacher, (genes[placed, TEACHER], genes[placed, SLOT]), 1)
+        np.add.at(self.room, (genes[placed, ROOM], genes[placed, SLOT]), 1)
+        np.add.at(self.group, (p.lecture_groups[placed], genes[placed, SLOT]), 1)
+        self.blocked_teacher = _blocked(p.n_teachers, p.n_slots, blocked_teachers)
+        self.blocked_room = _blocked(p.n_rooms, p.n_slots, blocked_rooms)
+
+    def place(self, lecture: int, gene, sign: int):
+        t, r, s = gene
+        self.teacher[t, s] += sign
+        self.room[r, s] += sign
+        self.group[self.problem.lecture_groups[lecture], s] += sign
+
+    def broken(self) -> np.ndarray:
+        """Lectures that are unplaced, in a blocked cell, over capacity or part of a clash."""
+        p, g = self.problem, self.genes
+        unplaced = g[:, SLOT] < 0
+        t, r, s = (np.where(unplaced, 0, g[:, k]) for k in (TEACHER, ROOM, SLOT))
+        bad = (self.teacher[t, s] > 1) | (self.room[r, s] > 1) | (self.group[p.lecture_groups, s] > 1)
+        bad |= (self.blocked_teacher[t, s] > 0) | (self.blocked_room[r, s] > 0)
+        bad |= p.lecture_students > p.room_capacity[r]
+        return bad | unplaced
+
+    def best_move(self, lecture: int, hard_penalty: int) -> Tuple[int, int, int]:
+        """Cheapest (teacher, room, slot) for ``lecture`` with the others fixed; fewest changed fields on ties."""
+        p = self.problem
+        c = p.lecture_courses[lecture]
+        # Where an unqualified teacher is only a soft violation (course_penalty), any teacher may
+        # take over, so a lecture whose qualified teachers are all blocked can still be moved
+        teachers = np.arange(p.n_teachers) if p.penalize_unqualified else p.course_teachers[c]
+        current = self.genes[lecture]
+
+        # (teachers, slots, rooms) cost cube; the lecture itself is not in the counters
+        hard = (self.teacher[teachers] + self.blocked_teacher[teachers])[:, :, None] \
+            + (self.room + self.blocked_room).T[None] \
+            + self.group[p.lecture_groups[lecture]][None, :, None] \
+            + (p.lecture_students[lecture] > p.room_capacity)[None, None, :]
+        soft = p.slot_penalty[teachers].astype(np.int64)[:, :, None] \
+            + p.room_penalty[teachers].astype(np.int64)[:, None, :] \
+            + p.course_penalty[teachers, c].astype(np.int64)[:, None, None]
+        changed = (teachers != current[TEACHER])[:, None, None].astype(np.int64) \
+            + (np.arange(p.n_slots) != current[SLOT])[None, :, None] \
+            + (np.arange(p.n_rooms) != current[ROOM])[None, None, :]
+        # Penalty first, then the number of changed fields (0-3)
+        score = (hard * hard_penalty + soft) * 4 + changed
+        i, s, r = np.unravel_index(int(np.argmin(score)), score.shape)
+        return int(teachers[i]), int(r), int(s)
+
+
+def repair(problem: Problem, genes: np.ndarray,
+           blocked_teachers: Optional[Mapping[int, Optional[Iterable[int]]]] = None,
+           blocked_rooms: Optional[Mapping[int, Optional[Iterable[int]]]] = None,
+           max_moves: Optional[int] = None, hard_penalty: int = HARD_PENALTY) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Returns (repaired genes, info) for a (n_lectures, 3) gene array; rows of -1
+    (e.g. from warmstart.previous_genes) are lectures still to be placed.
+
+    blocked_teachers / blocked_rooms: teacher / room id -> slot ids it cannot
+    be used in (None = every slot, e.g. a closed room).
+    info: {"moved": lecture indices that changed, "hard_before", "hard_after",
+    "penalty_before", "penalty_after", "moves", "elapsed_ms"}; hard counts
+    include lectures left in blocked cells.
+    """
+    started = time.perf_counter()
+    genes = np.array(genes, dtype=np.int64)
+    original = genes.copy()
+    state = _State(problem, genes, blocked_teachers, blocked_rooms)
+    engine = FitnessEngine(problem, hard_penalty)
+
+    def totals():
+        placed = genes[:, SLOT] >= 0
+        blocked = state.blocked_teacher[genes[placed, TEACHER], genes[placed, SLOT]].sum() \
+            + state.blocked_room[genes[placed, ROOM], genes[placed, SLOT]].sum()
+        if not placed.all():
+            return None, None
+        hard, soft = engine.score(genes[None])
+        return int(hard[0] + blocked), int((hard[0] + blocked) * hard_penalty + soft[0])
+
+    hard_before, penalty_before = totals()
+    broken = state.broken()
+    if max_moves is None:
+        max_moves = MAX_MOVES_FACTOR * max(1, int(broken.sum()))
+
+    moves = 0
+    moved_count = np.zeros(problem.n_lectures, dtype=np.int64)
+    stuck = np.zeros(problem.n_lectures, dtype=bool)
+    while moves < max_moves:
+        candidates = np.flatnonzero(broken & ~stuck)
+        if not candidates.size:
+            break
+        # Least-moved broken lecture first, so two lectures do not swap back and forth
+        lecture = int(candidates[np.argmin(moved_count[candidates])])
+        if genes[lecture, SLOT] >= 0:
+            state.place(lecture, genes[lecture], -1)
+        move = state.best_move(lecture, hard_penalty)
+        if tuple(genes[lecture]) == move:
+            stuck[lecture] = True
+        else:
+            stuck[:] = False
+            moved_count[lecture] += 1
+            moves += 1
+        genes[lecture] = move
+        state.place(lecture, move, +1)
+        broken = state.broken()
+
+    hard_after, penalty_after = totals()
+    info = {
+        "moved": np.flatnonzero((genes != original).any(axis=1)).tolist(),
+        "hard_before": hard_before,
+        "hard_after": hard_after,
+        "penalty_before": penalty_before,
+        "penalty_after": penalty_after,
+        "moves": moves,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    return genes.astype(problem.gene_dtype), info
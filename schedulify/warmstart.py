@@ -0,0 +1,114 @@
+"""
+Warm start: seed a run with a previous timetable instead of a random population.
+
+A stored timetable (generator.py's "timetable", the rows of backend_api's
+DATA["timetable"] or a Timetable document's timetableData) is mapped onto the
+current Problem's lecture order with ``previous_genes``. Lectures that cannot
+be carried over (course / teacher / room / slot no longer exists, teacher no
+longer qualified, more hours than before) or that touch an entity listed in
+``changed`` are marked stale. ``warm_genes`` then builds the initial population:
+the previous timetable with only the stale genes re-drawn, plus perturbed
+variants of it.
+
+    genes = previous_genes(problem, rows, changed_entities(old_dicts, new_dicts))
+    population = [creator.ArrayIndividual(g) for g in warm_genes(problem, genes, 300)]
+"""
+
+import numpy as np
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+from .problem import Problem, TEACHER, ROOM, SLOT
+from .chromosome import random_genes
+
+# Probability that a gene of a perturbed variant is re-drawn (one of room / slot / teacher)
+WARM_START_INDPB = 0.05
+
+# Row keys of the dict format (backend_api /generate rows)
+ROW_KEYS = ("course_code", "teacher", "room", "timeslot")
+
+
+def changed_entities(before: Mapping[str, Mapping[str, Any]],
+                     after: Mapping[str, Mapping[str, Any]]) -> Dict[str, Set[str]]:
+    """
+    Entities added, removed or edited between two inputs, per kind.
+    ``before`` / ``after``: {"courses": COURSES, "teachers": TEACHERS, "rooms": ROOMS}
+    (optionally "preferences", which count as teacher changes).
+    """
+    changed = {}
+    for kind in ("courses", "teachers", "rooms"):
+        old, new = before.get(kind) or {}, after.get(kind) or {}
+        changed[kind] = {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
+    old, new = before.get("preferences") or {}, after.get("preferences") or {}
+    changed["teachers"] |= {t for t in old.keys() | new.keys() if old.get(t) != new.get(t)}
+    return changed
+
+
+def _row(row) -> Sequence[Any]:
+    if isinstance(row, Mapping):
+        return [row.get(k) for k in ROW_KEYS]
+    return row
+
+
+def previous_genes(problem: Problem, rows: Iterable, changed: Optional[Mapping[str, Iterable[str]]] = None,
+                   qualified_only: bool = True) -> np.ndarray:
+    """
+    (n_lectures, 3) int32 genes of the previous timetable in the problem's
+    lecture order; stale lectures are rows of -1.
+
+    rows: (course_id, teacher, room, timeslot) sequences or dicts with the
+    ROW_KEYS. A course's rows fill its lectures in order; extra rows are dropped.
+    changed: {"courses" / "teachers" / "rooms": names} whose lectures are re-drawn.
+    qualified_only=False keeps lectures given to a teacher outside the course's
+    list (a soft violation in backend_api) instead of marking them stale, so the
+    timetable is encoded as-is; only unknown entities are then stale.
+    """
+    changed = {kind: set(names) for kind, names in (changed or {}).items()}
+    changed_courses = changed.get("courses", set())
+    changed_teachers = changed.get("teachers", set())
+    changed_rooms = changed.get("rooms", set())
+
+    by_course: Dict[str, List[Sequence[Any]]] = defaultdict(list)
+    for row in rows:
+        course, teacher, room, slot = _row(row)
+        by_course[course].append((teacher, room, slot))
+
+    genes = np.full((problem.n_lectures, 3), -1, dtype=np.int32)
+    starts = np.concatenate(([0], np.cumsum(problem.course_hours)))
+    for c, course in enumerate(problem.course_ids):
+        if course in changed_courses:
+            continue
+        qualified = set(problem.course_teachers[c].tolist())
+        for lecture, (teacher, room, slot) in zip(range(starts[c], starts[c + 1]), by_course.get(course, ())):
+            t = problem.teacher_index.get(teacher)
+            r = problem.room_index.get(room)
+            s = problem.slot_index.get(slot)
+            if t is None or r is None or s is None or (qualified_only and t not in qualified):
+                continue
+            if teacher in changed_teachers or room in changed_rooms:
+                continue
+            genes[lecture] = (t, r, s)
+    return genes
+
+
+def warm_genes(problem: Problem, genes: np.ndarray, n: int, indpb: float = WARM_START_INDPB,
+               rooms: str = "any") -> np.ndarray:
+    """
+    (n, n_lectures, 3) initial genes around ``genes`` (from previous_genes).
+    Stale rows are re-drawn in every individual like random_genes(rooms=...);
+    individuals 1..n-1 also re-draw the room, slot or teacher of each other
+    gene with probability ``indpb``. Individual 0 keeps every carried-over gene.
+    """
+    fresh = random_genes(problem, n, rooms)
+    stale = (genes < 0).any(axis=1)
+    out = np.repeat(genes.astype(problem.gene_dtype)[None], n, axis=0)
+    out[:, stale] = fresh[:, stale]
+
+    hit = np.random.random((n, problem.n_lectures)) < indpb
+    hit[0] = False
+    hit[:, stale] = False
+    field = np.random.randint(3, size=hit.shape)
+    for f in (TEACHER, ROOM, SLOT):
+        moved = hit & (field == f)
+        out[..., f][moved] = fresh[..., f][moved]
+    return out
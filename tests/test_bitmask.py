@@ -0,0 +1,101 @@
+import importlib.util
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+from deap import creator
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _load_main():
+    # main.py registers its own two-objective DEAP types at import; keep the session's
+    saved = {name: getattr(creator, name) for name in ("FitnessMin", "Individual") if hasattr(creator, name)}
+    spec = importlib.util.spec_from_file_location(
+        "csv_input_main", os.path.join(ROOT, "logics", "csv_input_approach", "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name in ("FitnessMin", "Individual"):
+        if name in saved:
+            setattr(creator, name, saved[name])
+        else:
+            delattr(creator, name)
+    return module
+
+
+main = _load_main()
+
+
+def _baseline_hard(individual, data):
+    """The original set-of-(day, slot) check, without course constraints."""
+    hard = 0
+    group_occ = {}
+    room_occ = {}
+    for idx, (slot_idx, room_idx) in enumerate(individual):
+        c = data.classes_to_schedule[idx]
+        if slot_idx + c['slots_required'] > main.NUM_SLOTS:
+            hard += main.PENALTY_HARD
+            continue
+        time_range = range(slot_idx, slot_idx + c['slots_required'])
+        day = data.slots[slot_idx][0]
+        if data.lunch_slot_index in time_range:
+            hard += main.PENALTY_HARD
+        g_id = c['group']
+        batch = c['sub_batch']
+        t_keys = [(day, t) for t in time_range]
+        if g_id not in group_occ:
+            group_occ[g_id] = {'All': set(), 'Batches': {}}
+        for t_key in t_keys:
+            if batch == 'All':
+                if t_key in group_occ[g_id]['All']: hard += main.PENALTY_HARD
+                for b_set in group_occ[g_id]['Batches'].values():
+                    if t_key in b_set: hard += main.PENALTY_HARD
+                group_occ[g_id]['All'].add(t_key)
+            else:
+                if t_key in group_occ[g_id]['All']: hard += main.PENALTY_HARD
+                if batch not in group_occ[g_id]['Batches']: group_occ[g_id]['Batches'][batch] = set()
+                if t_key in group_occ[g_id]['Batches'][batch]: hard += main.PENALTY_HARD
+                group_occ[g_id]['Batches'][batch].add(t_key)
+        if room_idx not in room_occ:
+            room_occ[room_idx] = set()
+        for t_key in t_keys:
+            if t_key in room_occ[room_idx]: hard += main.PENALTY_HARD
+            room_occ[room_idx].add(t_key)
+        if c['forced_room_idx'] is not None and room_idx != c['forced_room_idx']:
+            hard += main.PENALTY_HARD
+    return hard
+
+
+def _data(rng, n_classes=60, n_groups=4, n_rooms=5):
+    classes = [{"course": f"C{i}", "group": f"G{rng.randrange(n_groups)}",
+                "sub_batch": rng.choice(["All", "All", "B1", "B2"]), "slots_required": rng.choice([1, 1, 2, 3]),
+                "forced_room_idx": rng.choice([None, None, None, rng.randrange(n_rooms)])}
+               for i in range(n_classes)]
+    slots = [(day, i) for day in main.WORKING_DAYS for i in range(main.NUM_SLOTS)]
+    lunch = int((main.LUNCH_START - main.START_TIME) / main.SLOT_DURATION_HOURS)
+    return SimpleNamespace(classes_to_schedule=classes, slots=slots, lunch_slot_index=lunch,
+                           time_constrained=set(), time_violations={}, constraints=[])
+
+
+def test_bitmask_check_matches_set_based_check():
+    rng = random.Random(0)
+    for _ in range(50):
+        data = _data(rng)
+        # Start slots across the whole week: those past the first day fail the bounds check
+        individual = [(rng.randrange(len(data.slots)) if rng.random() < 0.2 else rng.randrange(main.NUM_SLOTS),
+                       rng.randrange(5)) for _ in data.classes_to_schedule]
+        hard, soft = main.check_constraints(individual, data)
+        assert hard == _baseline_hard(individual, data)
+        assert soft == 0
+
+
+def test_bitmask_check_counts_each_overlapping_slot():
+    data = _data(random.Random(1), n_classes=0)
+    data.classes_to_schedule = [
+        {"course": "A", "group": "G", "sub_batch": "All", "slots_required": 3, "forced_room_idx": None},
+        {"course": "B", "group": "G", "sub_batch": "B1", "slots_required": 2, "forced_room_idx": None},
+    ]
+    # B overlaps A in two slots: two group clashes and two room clashes
+    assert main.check_constraints([(0, 0), (1, 0)], data)[0] == 4 * main.PENALTY_HARD
+    assert main.check_constraints([(0, 0), (3, 1)], data)[0] == 0
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.instances import generate, to_generator_input
+from schedulify.chromosome import mutate_genes, random_genes
+from schedulify.problem import Problem
+
+
+def _problem(seed=0):
+    data = to_generator_input(generate("small", seed))
+    return Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"], data["preferences"]), data
+
+
+def test_eligibility_index_matches_the_dicts():
+    problem, data = _problem()
+    fits = sorted(data["rooms"], key=lambda r: data["rooms"][r]["capacity"])
+    for course, details in data["courses"].items():
+        qualified = [t for t, d in data["teachers"].items() if course in d["courses"]] or list(data["teachers"])
+        assert sorted(problem.teachers_by_course[course]) == sorted(qualified)
+        fitting = [r for r in fits if data["rooms"][r]["capacity"] >= details["students"]] or fits
+        assert problem.rooms_by_course[course] == fitting
+
+
+def test_random_and_mutated_genes_stay_eligible():
+    np.random.seed(0)
+    problem, _ = _problem(1)
+    genes = random_genes(problem, 20, rooms="fitting")
+    for individual in genes:
+        mutate_genes(individual, problem, indpb=0.5, rooms="fitting")
+    for individual in genes:
+        for lecture, (t, r, s) in enumerate(individual):
+            c = problem.lecture_courses[lecture]
+            assert t in problem.course_teachers[c]
+            assert r in problem.course_rooms[c]
+            assert 0 <= s < problem.n_slots
+
+
+def test_candidate_sampling_covers_every_candidate():
+    np.random.seed(2)
+    problem, _ = _problem()
+    c = int(np.argmax(problem.course_teachers.sizes))
+    drawn = problem.course_teachers.sample(np.full(2000, c))
+    assert problem.course_teachers.sizes[c] > 1
+    assert set(drawn.tolist()) == set(problem.course_teachers[c].tolist())
@@ -0,0 +1,69 @@
+import copy
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+from deap import creator
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.instances import generate, to_generator_input
+from schedulify import FitnessEngine, Problem, register_types
+from schedulify.chromosome import cx_two_point, init_population, mutate_genes
+from schedulify.delta import IncrementalEvaluator, IncrementalMismatch
+
+
+def _problem():
+    data = to_generator_input(generate("small", 0))
+    return Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"], data["preferences"])
+
+
+@pytest.mark.parametrize("indpb", [0.01, 0.2, 0.9])
+def test_incremental_matches_engine_over_generations(indpb):
+    random.seed(0)
+    np.random.seed(0)
+    register_types()
+    problem = _problem()
+    engine = FitnessEngine(problem)
+    incremental = IncrementalEvaluator(problem, check=True)
+    population = init_population(creator.ArrayIndividual, problem, 10)
+    for ind in population:
+        ind.fitness.values = incremental.evaluate(ind)
+    for _ in range(5):
+        offspring = [copy.deepcopy(ind) for ind in population]
+        for ind1, ind2 in zip(offspring[::2], offspring[1::2]):
+            cx_two_point(ind1, ind2)
+        for ind in offspring:
+            mutate_genes(ind, problem, indpb)
+            # check=True raises IncrementalMismatch on any difference
+            ind.fitness.values = incremental.evaluate(ind)
+            assert ind.fitness.values == engine.evaluate(ind)
+        population = offspring
+
+
+def test_clones_do_not_share_counters():
+    np.random.seed(1)
+    register_types()
+    problem = _problem()
+    incremental = IncrementalEvaluator(problem)
+    parent = init_population(creator.ArrayIndividual, problem, 1)[0]
+    before = incremental.evaluate(parent)
+    child = copy.deepcopy(parent)
+    mutate_genes(child, problem, 0.5)
+    incremental.evaluate(child)
+    assert incremental.evaluate(parent) == before
+    assert child.occupancy.teacher is not parent.occupancy.teacher
+
+
+def test_check_reports_a_stale_state():
+    np.random.seed(2)
+    register_types()
+    problem = _problem()
+    incremental = IncrementalEvaluator(problem, check=True)
+    ind = init_population(creator.ArrayIndividual, problem, 1)[0]
+    incremental.evaluate(ind)
+    ind.occupancy.hard += 1
+    with pytest.raises(IncrementalMismatch):
+        incremental.evaluate(ind)
@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+
+import numpy as np
+from deap import base, creator, tools
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.instances import generate, to_generator_input
+from schedulify import FitnessEngine, Problem, register_types
+from schedulify.chromosome import cx_two_point, mutate_genes
+from schedulify.construct import seeded_genes
+from schedulify.evolution import EarlyStopping, ea_simple
+
+
+def _run(elitism):
+    random.seed(0)
+    np.random.seed(0)
+    register_types()
+    data = to_generator_input(generate("medium", 0))
+    problem = Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"], data["preferences"])
+    engine = FitnessEngine(problem)
+    toolbox = base.Toolbox()
+    toolbox.register("evaluate", engine.evaluate)
+    toolbox.register("map", engine.map)
+    toolbox.register("mate", cx_two_point)
+    toolbox.register("mutate", mutate_genes, problem=problem, indpb=0.1)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+    # A few constructed (near clash-free) individuals among random ones
+    pop = [creator.ArrayIndividual(g) for g in seeded_genes(problem, 40, 0.1, rooms="fitting")]
+    hof = tools.HallOfFame(1, similar=np.array_equal)
+    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats.register("min", np.min)
+    stopping = EarlyStopping(target=None, patience=None)
+    _, logbook = ea_simple(pop, toolbox, cxpb=0.8, mutpb=0.2, ngen=15, stats=stats, halloffame=hof,
+                           early_stopping=stopping, elitism=elitism)
+    return logbook.select("min"), hof[0].fitness.values[0]
+
+
+def test_elitism_keeps_the_best_in_the_population():
+    mins, best = _run(elitism=1)
+    assert all(b <= a for a, b in zip(mins, mins[1:]))
+    assert mins[-1] == best
+
@@ -0,0 +1,88 @@
+import os
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.instances import generate, to_generator_input
+from schedulify.fitness import FitnessEngine, count_clashes
+from schedulify.problem import Problem
+
+
+def _generator_penalty(individual, data):
+    """generator.py's original evaluate_timetable: clashes, capacity, teacher preferences."""
+    courses, rooms, preferences = data["courses"], data["rooms"], data["preferences"]
+    hard = soft = 0
+    teacher_schedule, room_schedule, group_schedule = defaultdict(list), defaultdict(list), defaultdict(list)
+    for course_id, teacher, room, timeslot in individual:
+        c = courses[course_id]
+        if c["students"] > rooms[room]["capacity"]:
+            hard += 1
+        for schedule, key in ((teacher_schedule, teacher), (room_schedule, room),
+                              (group_schedule, (c["dept"], c["semester"]))):
+            if timeslot in schedule[key]:
+                hard += 1
+            schedule[key].append(timeslot)
+        prefs = preferences.get(teacher)
+        if prefs:
+            if prefs.get("preferred_rooms") and room not in prefs["preferred_rooms"]:
+                soft += 1
+            if prefs.get("preferred_slots") and timeslot not in prefs["preferred_slots"]:
+                soft += 1
+    return hard * 1000 + soft
+
+
+def _backend_penalty(individual, data):
+    """backend_api's evaluate_timetable: the same clashes, unqualified teachers as soft."""
+    courses, rooms, teachers = data["courses"], data["rooms"], data["teachers"]
+    hard = soft = 0
+    teacher_schedule, room_schedule, group_schedule = defaultdict(set), defaultdict(set), defaultdict(set)
+    for course_id, teacher, room, timeslot in individual:
+        c = courses[course_id]
+        for schedule, key in ((teacher_schedule, teacher), (room_schedule, room),
+                              (group_schedule, (c["dept"], c["semester"]))):
+            if timeslot in schedule[key]:
+                hard += 1
+            schedule[key].add(timeslot)
+        if room not in rooms or c["students"] > rooms[room]["capacity"]:
+            hard += 1
+        if teacher in teachers and c["name"] and course_id not in teachers[teacher]["courses"]:
+            soft += 1
+    return hard * 1000 + soft
+
+
+def _random_individuals(problem, n, rng):
+    # Any teacher / room / slot, so unqualified teachers and small rooms show up too
+    genes = np.stack([rng.integers(0, size, (n, problem.n_lectures))
+                      for size in (problem.n_teachers, problem.n_rooms, problem.n_slots)], axis=-1)
+    return [problem.decode(g) for g in genes]
+
+
+def test_engine_matches_generator_evaluate_timetable():
+    rng = np.random.default_rng(0)
+    data = to_generator_input(generate("small", 0))
+    problem = Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"], data["preferences"])
+    engine = FitnessEngine(problem)
+    population = _random_individuals(problem, 20, rng)
+    assert [engine.evaluate(ind)[0] for ind in population] == [_generator_penalty(ind, data) for ind in population]
+    assert [fit[0] for fit in engine.map(engine.evaluate, population)] == \
+        [_generator_penalty(ind, data) for ind in population]
+
+
+def test_engine_matches_backend_evaluate_timetable():
+    rng = np.random.default_rng(1)
+    data = to_generator_input(generate("small", 1))
+    problem = Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"],
+                      penalize_unqualified=True)
+    engine = FitnessEngine(problem)
+    for ind in _random_individuals(problem, 20, rng):
+        assert engine.evaluate(ind)[0] == _backend_penalty(ind, data)
+
+
+def test_count_clashes_both_paths():
+    keys = np.array([[0, 1, 1, 2, 2, 2], [3, 3, 3, 3, 0, 1]])
+    assert count_clashes(keys, 4).tolist() == [3, 3]
+    # Past the occupancy limit the sorted-keys path gives the same counts
+    assert count_clashes(keys, 1 << 30).tolist() == [3, 3]
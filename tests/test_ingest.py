@@ -0,0 +1,46 @@
+import io
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backend_api"))
+
+from benchmarks.bench_preprocess import legacy_build, synthetic_csvs
+from benchmarks.instances import generate, to_generator_input, to_upload_csvs
+from ingest import build_dicts, ingest_csv
+
+
+def _build(raw, chunk_rows=50_000):
+    tables = {k: ingest_csv(k, io.BytesIO(raw[k]), chunk_rows=chunk_rows) for k in ("courses", "rooms", "teachers")}
+    return build_dicts(tables["courses"], tables["rooms"], tables["teachers"])
+
+
+def test_streaming_ingest_matches_iterrows_build():
+    raw = synthetic_csvs(300, 2000, 40)
+    expected = legacy_build(raw)
+    assert _build(raw) == expected
+    # Chunk boundaries inside every file give the same dicts
+    assert _build(raw, chunk_rows=7) == expected
+
+
+def test_messy_values_match_iterrows_build():
+    raw = {
+        "courses": (b"course_code,title,dept,sem,enrollment,hrs\n"
+                    b"C1,Intro,CSE,1,30,2\n"
+                    b" C2 ,,,,0,\n"
+                    b"C3,Algebra,MA,3,12.0,3.0\n"
+                    b"C1,Intro again,CSE,2,45,1\n"),
+        "rooms": b"Room Code,Capacity\nR1,40\nR2,\nR1,60\n",
+        "teachers": b'Teacher Name,Courses\nT1,"C1, C2"\nT2,\nT1,C3\nT3," C2 ,,C9"\n',
+    }
+    assert _build(raw) == legacy_build(raw)
+
+
+def test_instance_upload_round_trips():
+    inst = generate("small", 0)
+    data = to_generator_input(inst)
+    courses, rooms, teachers = _build(to_upload_csvs(inst))
+    assert courses == data["courses"]
+    assert rooms == data["rooms"]
+    assert teachers == {t: d for t, d in data["teachers"].items() if d["courses"]}
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.instances import SIZES, TIMESLOTS, generate, to_generator_input
+from schedulify.problem import Problem
+
+
+def test_same_seed_same_instance():
+    assert generate("medium", 3) == generate("medium", 3)
+    assert generate("medium", 3) != generate("medium", 4)
+
+
+@pytest.mark.parametrize("size", ["small", "medium", "large"])
+def test_instances_are_feasible_for_the_generator(size):
+    inst = generate(size, 0)
+    spec = SIZES[size]
+    assert len(inst["groups"]) == spec["departments"] * spec["semesters"] * spec["sections"]
+    assert all(course["teachers"] for course in inst["courses"])
+
+    data = to_generator_input(inst)
+    problem = Problem(data["courses"], data["teachers"], data["rooms"], data["timeslots"], data["preferences"])
+    assert problem.unstaffed_courses == []
+    # Enough room-slots for every lecture hour, and a classroom that seats every lecture
+    assert problem.n_rooms * len(TIMESLOTS) >= problem.n_lectures
+    assert (problem.room_capacity.max() >= problem.lecture_students).all()
+    # Sections stay separate student groups
+    assert problem.n_groups == len(inst["groups"])
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend_api")))
+
+from jobs import JobManager
+
+
+def _generations(n, delay=0.0, progress=None):
+    """Stand-in for run_timetable_ga: one progress call per generation."""
+    for gen in range(n):
+        progress(gen, float(n - gen), float(2 * (n - gen)), evaluations=10)
+        time.sleep(delay)
+    return {"generations": n}
+
+
+def _fail(progress=None):
+    raise ValueError("bad input")
+
+
+def _wait(jobs, job_id, condition, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get(job_id)
+        if job is not None and condition(job):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not get there: {jobs.get(job_id)}")
+
+
+@pytest.fixture
+def jobs():
+    manager = JobManager(max_workers=1, keep_finished=10, ttl=3600)
+    yield manager
+    manager.shutdown()
+
+
+def test_completed_job_keeps_result_and_events(jobs):
+    done, finished = [], []
+    jobs.finish_listeners.append(lambda job_id, snapshot: finished.append(snapshot["status"]))
+    job_id = jobs.submit(_generations, 5, on_done=done.append)
+    job = _wait(jobs, job_id, lambda j: j["finished_at"] is not None)
+    assert job["status"] == "completed"
+    assert job["generation"] == 4 and job["evaluations_total"] == 50
+    assert jobs.result(job_id) == {"generations": 5}
+    assert [e["generation"] for e in jobs.events(job_id)] == [0, 1, 2, 3, 4]
+    assert [e["generation"] for e in jobs.events(job_id, 3)] == [3, 4]
+    assert done == [{"generations": 5}] and finished == ["completed"]
+    assert jobs.active() == []
+
+
+def test_failed_job_reports_the_error(jobs):
+    job_id = jobs.submit(_fail)
+    job = _wait(jobs, job_id, lambda j: j["finished_at"] is not None)
+    assert job["status"] == "failed"
+    assert "ValueError: bad input" in job["error"]
+
+
+def test_cancel_stops_a_running_job(jobs):
+    job_id = jobs.submit(_generations, 1000, 0.01)
+    _wait(jobs, job_id, lambda j: j["status"] == "running" and j["generation"] > 0)
+    assert jobs.cancel(job_id)
+    job = _wait(jobs, job_id, lambda j: j["finished_at"] is not None)
+    assert job["status"] == "cancelled"
+    assert job["generation"] < 999
+    assert jobs.result(job_id) is None
+    assert not jobs.cancel("unknown")
+
+
+def test_cancel_keeps_a_queued_job_from_starting(jobs):
+    running = jobs.submit(_generations, 1000, 0.01)
+    queued = jobs.submit(_generations, 5)
+    assert jobs.cancel(queued)
+    jobs.cancel(running)
+    job = _wait(jobs, queued, lambda j: j["finished_at"] is not None)
+    assert job["status"] == "cancelled"
+    assert job["started_at"] is None
+    assert jobs.events(queued) == []
+
+
+def test_finished_jobs_are_evicted():
+    jobs = JobManager(max_workers=1, keep_finished=1, ttl=3600)
+    try:
+        first = jobs.submit(_generations, 1)
+        _wait(jobs, first, lambda j: j["finished_at"] is not None)
+        second = jobs.submit(_generations, 1)
+        _wait(jobs, second, lambda j: j["finished_at"] is not None)
+        # Only the most recent finished job is kept
+        assert jobs.get(first) is None and jobs.events(first) is None and jobs.result(first) is None
+        assert jobs.get(second)["status"] == "completed"
+
+        jobs.ttl = 0
+        jobs._evict()
+        assert jobs.get(second) is None
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,52 @@
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend_api")))
+
+from metrics import Registry, process_metrics
+
+
+def test_counter_and_gauge_exposition():
+    registry = Registry()
+    jobs = registry.counter("ga_jobs_total", "Jobs by final status.", ["status"])
+    running = registry.gauge("ga_jobs_running", "Jobs running.")
+    jobs.inc(status="completed")
+    jobs.inc(2, status="completed")
+    jobs.inc(status='fail"ed\n')
+    running.set(3)
+    assert registry.render().splitlines() == [
+        "# HELP ga_jobs_total Jobs by final status.",
+        "# TYPE ga_jobs_total counter",
+        'ga_jobs_total{status="completed"} 3',
+        'ga_jobs_total{status="fail\\"ed\\n"} 1',
+        "# HELP ga_jobs_running Jobs running.",
+        "# TYPE ga_jobs_running gauge",
+        "ga_jobs_running 3",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("http_request_duration_seconds", "Latency.", ["route"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value, route="/generate")
+    lines = registry.render().splitlines()[2:]
+    assert lines == [
+        'http_request_duration_seconds_bucket{route="/generate",le="0.1"} 1',
+        'http_request_duration_seconds_bucket{route="/generate",le="1"} 3',
+        'http_request_duration_seconds_bucket{route="/generate",le="+Inf"} 4',
+        'http_request_duration_seconds_sum{route="/generate"} 6.05',
+        'http_request_duration_seconds_count{route="/generate"} 4',
+    ]
+    assert latency.buckets[-1] == math.inf
+
+
+def test_collectors_refresh_process_metrics():
+    registry = Registry()
+    process_metrics(registry)
+    values = {line.split()[0]: float(line.split()[1])
+              for line in registry.render().splitlines() if not line.startswith("#")}
+    assert values["process_cpu_seconds_total"] > 0
+    assert values["process_max_resident_memory_bytes"] > 0
+    assert values["process_start_time_seconds"] > 0
@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from schedulify.problem import Problem
+from schedulify.repair import repair
+from schedulify.warmstart import previous_genes
+
+TIMESLOTS = ["Mon_09-10", "Mon_10-11", "Tue_09-10"]
+
+
+def _problem():
+    courses = {
+        "C1": {"name": "Course 1", "dept": "CSE", "semester": 1, "students": 30, "hours": 1},
+        "C2": {"name": "Course 2", "dept": "ECE", "semester": 1, "students": 30, "hours": 1},
+    }
+    teachers = {"T1": {"courses": ["C1"]}, "T2": {"courses": ["C2"]}}
+    rooms = {"R1": {"capacity": 40}, "R2": {"capacity": 40}, "R3": {"capacity": 40}}
+    # Unqualified teachers are a soft violation, as in backend_api's build_problem
+    return Problem(courses, teachers, rooms, TIMESLOTS, penalize_unqualified=True)
+
+
+# C1 is taught by T2, who is not qualified for it: a soft penalty, not a clash
+ROWS = [("C1", "T2", "R1", "Mon_09-10"), ("C2", "T2", "R2", "Mon_10-11")]
+
+
+def test_unqualified_lecture_is_encoded_as_is():
+    problem = _problem()
+    genes = previous_genes(problem, ROWS, qualified_only=False)
+    assert (genes >= 0).all()
+    assert problem.decode(genes) == ROWS
+    assert (previous_genes(problem, ROWS)[0] == -1).all()
+
+
+def test_repair_keeps_soft_penalty_lecture_in_place():
+    problem = _problem()
+    genes = previous_genes(problem, ROWS, qualified_only=False)
+    repaired, info = repair(problem, genes, blocked_rooms={problem.room_index["R3"]: None})
+    assert info["moved"] == []
+    assert (repaired == genes).all()
+    assert info["hard_before"] == 0
+    assert info["penalty_before"] == 1
+    assert info["penalty_after"] == 1
+
+
+def test_repair_moves_only_the_blocked_lecture():
+    problem = _problem()
+    genes = previous_genes(problem, ROWS, qualified_only=False)
+    repaired, info = repair(problem, genes, blocked_rooms={problem.room_index["R2"]: None})
+    assert info["moved"] == [1]
+    assert info["hard_after"] == 0
+    assert (repaired[0] == genes[0]).all()
+
+
+def test_repair_hands_blocked_lecture_to_unqualified_teacher():
+    # Only T1 may teach C1; with T1 unavailable everywhere the lecture goes to T2 at a soft cost
+    problem = _problem()
+    rows = [("C1", "T1", "R1", "Mon_09-10"), ("C2", "T2", "R2", "Mon_10-11")]
+    genes = previous_genes(problem, rows, qualified_only=False)
+    repaired, info = repair(problem, genes, blocked_teachers={problem.teacher_index["T1"]: None})
+    assert info["hard_before"] == 1
+    assert info["hard_after"] == 0
+    assert info["moved"] == [0]
+    assert repaired[0][0] == problem.teacher_index["T2"]
+    assert info["penalty_after"] == 1